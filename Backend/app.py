@@ -1,56 +1,163 @@
-from flask import Flask
-from flask_cors import CORS
-from pymongo import MongoClient
-from config import Config
-from routes.api import api_bp
-from routes.admin import admin_bp
-from routes.seed import seed_bp
-from models.member import Member
-from models.event import Event
-from services.image_validator import ImageValidator
+from services.startup import profiler
+
+with profiler.phase("import flask"):
+    from flask import Flask, request
+    from flask_cors import CORS
+
+with profiler.phase("import app modules"):
+    from config import Config
+    from routes.api import api_bp
+    from models import member, event
+    from models.member import Member
+    from models.event import Event
+    from services.image_validator import ImageValidator
+    from services.cache import QueryCache
+    from services.snapshots import SnapshotStore
+    from services.db import get_connection
+    from services.metrics import metrics
+    from services.query_profiler import query_profiler
+    from services.executor import query_executor
+    from services.content_sync import content_watcher
+    from services.static_publish import StaticPublisher
+    from services import migrations
 import os
+import threading
 
-def create_app():
-    app = Flask(__name__)
-    app.config.from_object(Config)
-    
-    # Enable CORS for frontend
-    CORS(app, resources={
-        r"/api/*": {
-            "origins": [
-                "http://localhost:5173",
-                "http://localhost:3000",
-                "http://127.0.0.1:5173",
-                "https://acses2k25.vercel.app"
-            ],
-            "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-            "allow_headers": ["Content-Type"],
-            "supports_credentials": True
-        }
-    })
+# Blueprints public API traffic never needs; in PUBLIC_API_ONLY mode they are
+# imported (with their templates) on the first request under these prefixes
+DEFERRED_PREFIXES = ('/admin', '/seed')
+
+# App attributes shared with the deferred admin app so both see the same caches
+SHARED_SERVICES = ('db', 'member_model', 'event_model', 'image_validator', 'snapshots', 'static_publisher')
+
+class DeferredDispatcher:
+    """WSGI middleware that builds the admin/seed app on first request to its prefixes"""
+
+    def __init__(self, public_app, factory, prefixes):
+        self.public_app = public_app
+        self.factory = factory
+        self.prefixes = prefixes
+        self._deferred_app = None
+        self._lock = threading.Lock()
+
+    def __call__(self, environ, start_response):
+        path = environ.get('PATH_INFO', '')
+        if any(path == prefix or path.startswith(prefix + '/') for prefix in self.prefixes):
+            return self.deferred_app()(environ, start_response)
+        return self.public_app(environ, start_response)
+
+    def deferred_app(self):
+        """The admin/seed app, built once even when its first requests arrive together"""
+        if self._deferred_app is None:
+            with self._lock:
+                if self._deferred_app is None:
+                    self._deferred_app = self.factory()
+        return self._deferred_app
+
+def register_admin_blueprints(app):
+    from routes.admin import admin_bp
+    from routes.seed import seed_bp
+    app.register_blueprint(admin_bp)
+    app.register_blueprint(seed_bp)
+
+def create_admin_app(public_app):
+    """Admin/seed app built on demand, sharing models and caches with public_app"""
+    with profiler.phase("deferred admin/seed"):
+        admin_app = Flask(__name__)
+        admin_app.config.update(public_app.config)
+        if admin_app.config['METRICS_ENABLED']:
+            metrics.init_app(admin_app)
+        for name in SHARED_SERVICES:
+            if hasattr(public_app, name):
+                setattr(admin_app, name, getattr(public_app, name))
+        register_admin_blueprints(admin_app)
+    return admin_app
+
+def create_app(public_api_only: bool = None):
+    """Build the Flask app; public_api_only defers admin/seed blueprints until first use"""
+    if public_api_only is None:
+        public_api_only = Config.PUBLIC_API_ONLY
     
-    # MongoDB connection with error handling
-    try:
-        mongo_uri = app.config['MONGO_URI']
-        client = MongoClient(mongo_uri, serverSelectionTimeoutMS=5000)
-        # Test connection
-        client.server_info()
-        db = client.get_default_database()
+    with profiler.phase("create app"):
+        app = Flask(__name__)
+        app.config.from_object(Config)
         
-        # Initialize models
-        app.member_model = Member(db)
-        app.event_model = Event(db)
+        # Enable CORS for frontend
+        CORS(app, resources={
+            r"/api/*": {
+                "origins": app.config['CORS_ORIGINS'],
+                "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+                "allow_headers": ["Content-Type"],
+                "supports_credentials": True
+            }
+        })
         
-        # Initialize services
-        app.image_validator = ImageValidator(app.config)
-    except Exception as e:
-        print(f"MongoDB connection error: {e}")
-        # Continue without DB for health check
+        # Registered first so the timings cover every other request hook
+        if app.config['METRICS_ENABLED']:
+            metrics.init_app(app)
+    
+    # MongoDB connection with error handling; the shared client connects lazily
+    # (after fork under gunicorn) on the first query
+    with profiler.phase("init services"):
+        try:
+            db = get_connection(app.config)
+            app.db = db
+            
+            # Initialize models
+            cache_ttl = app.config['CACHE_TTL_SECONDS']
+            cache_size = app.config['CACHE_MAX_ENTRIES']
+            app.member_model = Member(db, cache=QueryCache(cache_size, cache_ttl),
+                                      role_priority=app.config['MEMBER_ROLE_PRIORITY'])
+            app.event_model = Event(db, cache=QueryCache(cache_size, cache_ttl))
+            
+            # QUERY_PROFILING wraps the read methods to explain slow queries
+            query_profiler.configure(app.config)
+            query_profiler.profile(app.member_model, member.PROFILED_METHODS)
+            query_profiler.profile(app.event_model, event.PROFILED_METHODS)
+            
+            query_executor.configure(app.config)
+            
+            # Admin writes in other workers/instances evict this process's caches;
+            # the watcher thread starts on the first request (after any fork)
+            content_watcher.configure(app.config)
+            content_watcher.register('members', app.member_model)
+            content_watcher.register('events', app.event_model)
+            content_watcher.set_rebuild(migrations.rebuild_read_models)
+            
+            # Indexes/backfills are applied by `python migrate.py`; the version check
+            # waits for the first request so startup makes no round trip
+            if app.config['AUTO_MIGRATE']:
+                migrations.migrate(db)
+            
+            # Initialize services
+            app.image_validator = ImageValidator(app.config)
+            app.snapshots = SnapshotStore(app.config['SNAPSHOT_MAX_ENTRIES'])
+            app.static_publisher = StaticPublisher(app, app.config['STATIC_EXPORT_DIR'])
+        except Exception as e:
+            print(f"MongoDB connection error: {e}")
+            # Continue without DB for health check
     
     # Register blueprints
-    app.register_blueprint(api_bp)
-    app.register_blueprint(admin_bp)
-    app.register_blueprint(seed_bp)
+    with profiler.phase("register blueprints"):
+        app.register_blueprint(api_bp)
+        if public_api_only:
+            app.wsgi_app = DeferredDispatcher(app.wsgi_app, lambda: create_admin_app(app), DEFERRED_PREFIXES)
+        else:
+            register_admin_blueprints(app)
+    
+    first_request = {"seen": False}
+    
+    @app.before_request
+    def on_first_request():
+        if first_request["seen"] or request.endpoint in ('health', 'startup_report', 'slow_queries', 'metrics') or not hasattr(app, 'db'):
+            return
+        first_request["seen"] = True
+        profiler.mark("first request")
+        try:
+            migrations.check_schema(app.db)
+        except Exception as e:
+            print(f"Schema version check failed: {e}")
+        content_watcher.start(app.db)
     
     @app.route('/')
     def index():
@@ -58,7 +165,36 @@ def create_app():
     
     @app.route('/health')
     def health():
-        return {"status": "ok"}
+        result = {"status": "ok"}
+        if hasattr(app, 'db'):
+            result["mongo"] = app.db.stats()
+        result["content_sync"] = content_watcher.stats()
+        return result
+    
+    @app.route('/health/startup')
+    def startup_report():
+        return profiler.report()
+    
+    @app.route('/health/slow-queries')
+    def slow_queries():
+        return {"enabled": query_profiler.enabled, "threshold_ms": query_profiler.threshold_ms,
+                "queries": query_profiler.recent()}
+    
+    @app.route('/metrics')
+    def metrics_endpoint():
+        extra = {}
+        if hasattr(app, 'db'):
+            pool = app.db.stats()["pool"]
+            extra["acses_mongo_pool_connections_open"] = ("gauge", "Open MongoDB connections in this process", pool.get("open", 0))
+            extra["acses_mongo_pool_connections_in_use"] = ("gauge", "Checked-out MongoDB connections", pool.get("in_use", 0))
+        if hasattr(app, 'snapshots'):
+            snapshot_stats = app.snapshots.stats()
+            extra["acses_snapshot_hits_total"] = ("counter", "API snapshot cache hits", snapshot_stats["hits"])
+            extra["acses_snapshot_misses_total"] = ("counter", "API snapshot cache misses", snapshot_stats["misses"])
+        return app.response_class(metrics.render(extra), mimetype='text/plain; version=0.0.4')
+    
+    if app.config['STARTUP_REPORT']:
+        print(profiler.format())
     
     return app
 
@@ -0,0 +1,14 @@
+"""
+ASGI entry point for the async public API tier
+Use with uvicorn: uvicorn asgi:app --workers 2
+Needs the packages in requirements-async.txt; /admin and /seed stay on gunicorn (wsgi:app)
+"""
+
+from config import Config
+from routes.api_async import create_async_app
+
+app = create_async_app({name: getattr(Config, name) for name in dir(Config) if name.isupper()})
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host='0.0.0.0', port=8000)
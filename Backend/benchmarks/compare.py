@@ -0,0 +1,47 @@
+"""
+Compare two benchmark result files and flag regressions
+Run: python -m benchmarks.compare OLD.json NEW.json [--threshold 0.2] [--metric p95_ms]
+Exits with status 1 when any endpoint got slower than the threshold allows.
+"""
+
+import argparse
+import json
+import sys
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark runs")
+    parser.add_argument('old')
+    parser.add_argument('new')
+    parser.add_argument('--threshold', type=float, default=0.2, help='allowed relative slowdown (0.2 = 20%%)')
+    parser.add_argument('--metric', default='p95_ms', help='latency metric to compare')
+    parser.add_argument('--phase', default='warm', choices=['warm', 'cold'])
+    args = parser.parse_args()
+
+    with open(args.old) as f:
+        old = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+
+    print(f"{old['commit']} -> {new['commit']} ({args.phase} {args.metric}, threshold {args.threshold:.0%})")
+    regressions = 0
+    for size, endpoints in new["results"].items():
+        for url, result in endpoints.items():
+            before = old["results"].get(size, {}).get(url)
+            if not before:
+                continue
+            a = before[args.phase][args.metric]
+            b = result[args.phase][args.metric]
+            change = (b - a) / a if a else 0.0
+            flag = ''
+            if change > args.threshold:
+                flag = '  REGRESSION'
+                regressions += 1
+            print(f"  [{size}] {url:<48} {a:>9.3f} -> {b:>9.3f} ms ({change:+.1%}){flag}")
+
+    if regressions:
+        print(f"\n{regressions} regression(s) above {args.threshold:.0%}")
+        sys.exit(1)
+    print("\n[OK] No regressions")
+
+if __name__ == "__main__":
+    main()
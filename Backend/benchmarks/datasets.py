@@ -0,0 +1,100 @@
+"""
+Synthetic members/events shaped like routes/seed.py and seed_codex.py
+"""
+
+import random
+from datetime import datetime, timedelta
+from config import Config
+from models.event import Event
+from services.migrations import rebuild_read_models
+
+IMAGE_HOST = "https://acsespicscloud.vercel.app"
+DEPARTMENTS = ["Creatives", "Events", "Tech", "Operations", "Public Relations", "Marketing"]
+
+# name: (members, events, gallery images per event)
+SIZES = {
+    "small": (100, 50, 10),
+    "medium": (1_000, 1_000, 25),
+    "large": (10_000, 10_000, 50),
+    "xlarge": (100_000, 100_000, 50),
+}
+
+def build_members(count: int, rng: random.Random) -> list:
+    """Founder, faculty and super-core like the real team; everyone else is core"""
+    base = datetime(2024, 1, 1)
+    fixed = [("founder", "Founder")] + [("faculty", "Faculty Coordinator")] * 2 + \
+        [("super-core", role) for role in Config.MEMBER_ROLE_PRIORITY]
+    members = []
+    for i in range(count):
+        member_type, role = fixed[i] if i < len(fixed) else ("core", None)
+        department = rng.choice(DEPARTMENTS) if member_type == "core" else None
+        role = role or department
+        created = base + timedelta(minutes=i)
+        members.append({
+            "name": f"Member {i}",
+            "imageUrl": f"{IMAGE_HOST}/members/Member{i}.png",
+            "role": role,
+            "rolePriority": Config.MEMBER_ROLE_PRIORITY.get(role, Config.DEFAULT_ROLE_PRIORITY),
+            "memberType": member_type,
+            "department": department,
+            "linkedin": f"https://www.linkedin.com/in/member-{i}",
+            "github": f"https://github.com/member-{i}",
+            "email": f"member{i}@example.com",
+            "createdAt": created,
+            "updatedAt": created
+        })
+    return members
+
+def build_events(count: int, gallery_size: int, rng: random.Random) -> list:
+    """Mix of general events and monthly CodeX events with winners and galleries"""
+    base = datetime(2015, 1, 1)
+    events = []
+    for i in range(count):
+        is_codex = i % 4 == 0
+        date = base + timedelta(days=i)
+        title = f"CodeX {date:%B %Y} #{i}" if is_codex else f"Tech Event {i}"
+        folder = f"codex/{i}" if is_codex else f"events/{i}"
+        event = {
+            "title": title,
+            "description": "Synthetic event " * rng.randint(5, 30),
+            "date": date,
+            "month": Event.month_key(date),
+            "event_type": "codex" if is_codex else "general",
+            "title_slug": Event.slugify(title),
+            "cover_image": f"{IMAGE_HOST}/{folder}/cover.jpg",
+            "gallery": [
+                {"image_url": f"{IMAGE_HOST}/{folder}/img{j}.jpg", "caption": f"Photo {j}"}
+                for j in range(gallery_size)
+            ],
+            "event_photos": [f"{IMAGE_HOST}/{folder}/photo{j}.jpg" for j in range(gallery_size // 5)],
+            "winners": [
+                {"name": f"Winner {j}", "photo_url": f"{IMAGE_HOST}/{folder}/w{j}.jpg", "position": str(j + 1)}
+                for j in range(3)
+            ],
+            "created_at": date
+        }
+        if is_codex:
+            event["codex_categories"] = [
+                {
+                    "category_name": f"Category {c + 1}",
+                    "winners": [
+                        {"name": f"Coder {c}-{r}", "photo_url": f"{IMAGE_HOST}/{folder}/c{c}{r}.jpg", "rank": r + 1}
+                        for r in range(3)
+                    ]
+                }
+                for c in range(3)
+            ]
+        events.append(event)
+    return events
+
+def seed(db, size: str, seed_value: int = 42, batch_size: int = 1000):
+    """Replace members/events in db with the synthetic dataset for size and rebuild the read models"""
+    members_count, events_count, gallery_size = SIZES[size]
+    rng = random.Random(seed_value)
+    for name, docs in (("members", build_members(members_count, rng)),
+                       ("events", build_events(events_count, gallery_size, rng))):
+        db[name].drop()
+        for start in range(0, len(docs), batch_size):
+            db[name].insert_many(docs[start:start + batch_size], ordered=False)
+    # Direct inserts bypass the models, whose read models would otherwise stay at the old data
+    rebuild_read_models(db)
@@ -0,0 +1,185 @@
+"""
+Benchmark the public /api endpoints against synthetic datasets
+Run from Backend/:
+    python -m benchmarks.run                                   # in-memory stand-in (needs mongomock)
+    python -m benchmarks.run --uri mongodb://localhost:27017/acses_bench --sizes small,medium,large
+Results are written to benchmarks/results/<commit>-<timestamp>.json;
+compare two runs with `python -m benchmarks.compare OLD.json NEW.json`.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.datasets import SIZES, seed
+from services import migrations
+from services.content_sync import content_watcher
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+def endpoints(db) -> list:
+    """Public endpoints with realistic arguments for the seeded dataset"""
+    event = db.events.find_one({"event_type": "general"}, {"_id": 1})
+    codex = db.events.find_one({"event_type": "codex"}, {"month": 1})
+    urls = [
+        '/api/members',
+        '/api/members?memberType=super-core',
+        '/api/members?memberType=core&department=Tech',
+        '/api/members?limit=20',
+        '/api/members/by-department',
+        '/api/members/directory',
+        '/api/events',
+        '/api/events?view=summary',
+        '/api/events?limit=20',
+        '/api/codex/latest',
+        '/api/codex/all',
+        '/api/codex/all?view=summary',
+        '/api/bootstrap',
+    ]
+    if event:
+        urls.append(f"/api/events/{event['_id']}")
+    if codex:
+        urls.append(f"/api/codex/{codex['month']}")
+    return urls
+
+def percentile(sorted_values: list, pct: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+def summarize(latencies: list, elapsed: float) -> dict:
+    values = sorted(latencies)
+    return {
+        "requests": len(values),
+        "p50_ms": round(percentile(values, 50) * 1000, 3),
+        "p95_ms": round(percentile(values, 95) * 1000, 3),
+        "p99_ms": round(percentile(values, 99) * 1000, 3),
+        "max_ms": round(values[-1] * 1000, 3),
+        "throughput_rps": round(len(values) / elapsed, 1) if elapsed else None
+    }
+
+def clear_caches(app):
+    # Adopt the version seed() published, so the rebuilt read models are served right away
+    content_watcher.sync(app.db)
+    app.member_model.cache.invalidate()
+    app.event_model.cache.invalidate()
+    app.snapshots.clear()
+
+def timed_get(client, url, headers=None) -> float:
+    start = time.perf_counter()
+    response = client.get(url, headers=headers or {})
+    response.get_data()
+    elapsed = time.perf_counter() - start
+    if response.status_code >= 400:
+        raise RuntimeError(f"{url} returned {response.status_code}")
+    return elapsed
+
+def bench_endpoint(app, url: str, requests: int, concurrency: int, cold_requests: int) -> dict:
+    """Cold (caches cleared, hits Mongo) and warm (snapshot hit) latency plus memory for url"""
+    client = app.test_client()
+
+    tracemalloc.start()
+    cold = []
+    for _ in range(cold_requests):
+        clear_caches(app)
+        cold.append(timed_get(client, url))
+    _, cold_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    body_bytes = len(client.get(url).get_data())
+    start = time.perf_counter()
+    if concurrency > 1:
+        with ThreadPoolExecutor(concurrency) as pool:
+            warm = list(pool.map(lambda _: timed_get(app.test_client(), url), range(requests)))
+    else:
+        warm = [timed_get(client, url) for _ in range(requests)]
+    warm_elapsed = time.perf_counter() - start
+
+    return {
+        "response_bytes": body_bytes,
+        "cold": summarize(cold, sum(cold)),
+        "warm": summarize(warm, warm_elapsed),
+        "cold_peak_memory_kb": round(cold_peak / 1024, 1)
+    }
+
+def open_database(uri: str):
+    if uri:
+        from pymongo import MongoClient
+        return MongoClient(uri).get_default_database()
+    try:
+        import mongomock
+    except ImportError:
+        raise SystemExit("No --uri given and mongomock is not installed (pip install mongomock)")
+    return mongomock.MongoClient().acses_bench
+
+def build_app(db):
+    """Public app with its models pointed at db"""
+    from app import create_app
+    app = create_app(public_api_only=True)
+    app.db = db
+    app.member_model.db = db
+    app.event_model.db = db
+    return app
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the public /api endpoints")
+    parser.add_argument('--uri', help='MongoDB URI of a scratch database (default: in-memory mongomock)')
+    parser.add_argument('--sizes', default='small,medium', help=f"comma list of {', '.join(SIZES)}")
+    parser.add_argument('--requests', type=int, default=200, help='warm requests per endpoint')
+    parser.add_argument('--cold-requests', type=int, default=5, help='cache-cleared requests per endpoint')
+    parser.add_argument('--concurrency', type=int, default=1, help='threads issuing warm requests')
+    parser.add_argument('--only', help='substring filter on endpoint URLs')
+    parser.add_argument('--output', help='result file (default: benchmarks/results/<commit>-<time>.json)')
+    args = parser.parse_args()
+
+    db = open_database(args.uri)
+    migrations.migrate(db, log=lambda message: None)
+    app = build_app(db)
+
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": datetime.utcnow().isoformat(),
+        "backend": "mongod" if args.uri else "mongomock",
+        "settings": {"requests": args.requests, "cold_requests": args.cold_requests,
+                     "concurrency": args.concurrency},
+        "results": {}
+    }
+
+    for size in args.sizes.split(','):
+        members, events, gallery = SIZES[size]
+        print(f"\n== {size}: {members} members, {events} events, {gallery} gallery images/event ==")
+        seed(db, size)
+        clear_caches(app)
+        report["results"][size] = {}
+        for url in endpoints(db):
+            if args.only and args.only not in url:
+                continue
+            result = bench_endpoint(app, url, args.requests, args.concurrency, args.cold_requests)
+            report["results"][size][url] = result
+            print(f"  {url:<48} cold p50 {result['cold']['p50_ms']:>9.2f} ms | "
+                  f"warm p50 {result['warm']['p50_ms']:>7.3f} p95 {result['warm']['p95_ms']:>7.3f} "
+                  f"p99 {result['warm']['p99_ms']:>7.3f} ms | {result['warm']['throughput_rps']:>8} rps | "
+                  f"{result['response_bytes'] / 1024:>9.1f} KB")
+
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{commit}-{datetime.utcnow():%Y%m%dT%H%M%S}.json")
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n[OK] Results written to {output}")
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,23 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY', 'dev-secret-change-in-production')
     MONGO_URI = os.environ.get('MONGO_URI', 'mongodb://localhost:27017/acses_db')
     
+    # MongoDB connection pool (one client per worker process)
+    MONGO_MAX_POOL_SIZE = int(os.environ.get('MONGO_MAX_POOL_SIZE', 20))
+    MONGO_MIN_POOL_SIZE = int(os.environ.get('MONGO_MIN_POOL_SIZE', 0))
+    MONGO_MAX_IDLE_TIME_MS = int(os.environ.get('MONGO_MAX_IDLE_TIME_MS', 60000))
+    MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.environ.get('MONGO_SERVER_SELECTION_TIMEOUT_MS', 5000))
+    MONGO_CONNECT_TIMEOUT_MS = int(os.environ.get('MONGO_CONNECT_TIMEOUT_MS', 5000))
+    MONGO_SOCKET_TIMEOUT_MS = int(os.environ.get('MONGO_SOCKET_TIMEOUT_MS', 20000))
+    MONGO_READ_PREFERENCE = os.environ.get('MONGO_READ_PREFERENCE', 'primaryPreferred')
+    
+    # Frontend origins allowed to call /api (WSGI and ASGI tiers)
+    CORS_ORIGINS = [
+        "http://localhost:5173",
+        "http://localhost:3000",
+        "http://127.0.0.1:5173",
+        "https://acses2k25.vercel.app"
+    ]
+    
     # Session config
     PERMANENT_SESSION_LIFETIME = timedelta(hours=24)
     SESSION_COOKIE_HTTPONLY = True
@@ -21,6 +38,71 @@ class Config:
         'events': r'^https://acsespicscloud\.vercel\.app/events/.+/.+\.(jpg|jpeg|png|webp)$',
         'codex': r'^https://acsespicscloud\.vercel\.app/codex/.+/.+\.(jpg|jpeg|png|webp)$'
     }
+    # Validated (url, category) results remembered by ImageValidator
+    IMAGE_VALIDATION_CACHE_SIZE = 4096
+    
+    # Serve /api only at startup; admin/seed blueprints load on their first request
+    PUBLIC_API_ONLY = os.environ.get('PUBLIC_API_ONLY', 'false').lower() == 'true'
+    # Print per-phase startup timings when the app is created
+    STARTUP_REPORT = os.environ.get('STARTUP_REPORT', 'false').lower() == 'true'
+    
+    # Per-request latency histograms (DB / serialization / template time) served at /metrics
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
+    
+    # Explain model reads slower than SLOW_QUERY_MS and log the plan (each query shape
+    # at most once per SLOW_QUERY_EXPLAIN_INTERVAL seconds)
+    QUERY_PROFILING = os.environ.get('QUERY_PROFILING', 'false').lower() == 'true'
+    SLOW_QUERY_MS = int(os.environ.get('SLOW_QUERY_MS', 100))
+    SLOW_QUERY_EXPLAIN_INTERVAL = int(os.environ.get('SLOW_QUERY_EXPLAIN_INTERVAL', 300))
+    
+    # Apply pending migrations on startup (handy locally; production runs `python migrate.py`)
+    AUTO_MIGRATE = os.environ.get('AUTO_MIGRATE', 'false').lower() == 'true'
+    
+    # Read-through cache for public API queries
+    CACHE_TTL_SECONDS = int(os.environ.get('CACHE_TTL_SECONDS', 300))
+    CACHE_MAX_ENTRIES = int(os.environ.get('CACHE_MAX_ENTRIES', 256))
+    SNAPSHOT_MAX_ENTRIES = int(os.environ.get('SNAPSHOT_MAX_ENTRIES', 128))
+    
+    # Cross-process cache invalidation (services/content_sync.py): auto follows MongoDB
+    # change streams and falls back to polling the _meta version document; watch, poll or off
+    CONTENT_SYNC = os.environ.get('CONTENT_SYNC', 'auto').lower()
+    CONTENT_SYNC_POLL_SECONDS = float(os.environ.get('CONTENT_SYNC_POLL_SECONDS', 5))
+    
+    # Compression of API snapshots; each variant is compressed once per content version,
+    # so the highest levels are affordable
+    COMPRESSION_MIN_SIZE = 500
+    COMPRESSION_LEVELS = {'gzip': 9, 'br': 11}
+    
+    # Threads per process for independent reads fanned out within one request
+    # (bootstrap, admin dashboard); keep below MONGO_MAX_POOL_SIZE, 0 runs them in sequence
+    QUERY_EXECUTOR_WORKERS = int(os.environ.get('QUERY_EXECUTOR_WORKERS', 4))
+    
+    # Static export of the public API (python publish_static.py); PUBLISH_ON_WRITE
+    # re-publishes in the background after every successful admin change
+    STATIC_EXPORT_DIR = os.environ.get('STATIC_EXPORT_DIR',
+                                       os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static_api'))
+    PUBLISH_ON_WRITE = os.environ.get('PUBLISH_ON_WRITE', 'false').lower() == 'true'
+    
+    # Documents per insert_many round trip in bulk_create (seeding, imports)
+    BULK_BATCH_SIZE = int(os.environ.get('BULK_BATCH_SIZE', 1000))
+    
+    # Keyset pagination for list endpoints (?limit=&after=)
+    API_DEFAULT_PAGE_SIZE = 20
+    API_MAX_PAGE_SIZE = 100
+    
+    # Number of recent general events included in /api/bootstrap
+    BOOTSTRAP_EVENT_LIMIT = 10
+    
+    # Display order of super-core roles (lower first); any other role sorts last
+    MEMBER_ROLE_PRIORITY = {
+        'Chairperson': 1,
+        'Vice Chairperson': 2,
+        'Secretary': 3,
+        'Joint Secretary': 4,
+        'Finance Head': 5,
+        'Tech Head': 6
+    }
+    DEFAULT_ROLE_PRIORITY = 99
     
     # Admin credentials (use env vars in production)
     ADMIN_USERNAME = os.getenv('ADMIN_USERNAME', 'admin')
@@ -46,6 +46,12 @@ echo "Testing setup..."
 python test_setup.py
 
 if [ $? -eq 0 ]; then
+    # Create indexes and apply data migrations once, outside of app startup
+    echo ""
+    echo "Applying database migrations..."
+    python migrate.py || exit 1
+    python migrate.py verify || echo "WARNING: some query shapes are not index-backed (see above)"
+
     echo ""
     echo "=========================================="
     echo "Deployment Complete!"
@@ -53,10 +59,10 @@ if [ $? -eq 0 ]; then
     echo ""
     echo "To run the application:"
     echo "  Development: python app.py"
-    echo "  Production:  gunicorn -w 4 -b 0.0.0.0:5000 'app:create_app()'"
+    echo "  Production:  gunicorn -w 4 -b 0.0.0.0:5000 wsgi:app"
     echo ""
     echo "To run in background:"
-    echo "  nohup gunicorn -w 4 -b 0.0.0.0:5000 'app:create_app()' > app.log 2>&1 &"
+    echo "  nohup gunicorn -w 4 -b 0.0.0.0:5000 wsgi:app > app.log 2>&1 &"
     echo ""
     echo "Admin Panel: http://your-server:5000/admin"
     echo "API Docs: See README.md"
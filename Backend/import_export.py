@@ -0,0 +1,46 @@
+"""
+Bulk import/export of members and events as JSONL or CSV (streamed, constant memory)
+Run:
+    python import_export.py export members members.jsonl
+    python import_export.py export events events.csv
+    python import_export.py import members new_batch.csv
+The format follows the file extension (.jsonl/.ndjson or .csv); use - for stdin/stdout.
+Imports upsert on _id when present, otherwise on (name, memberType) / (event_type, title, date);
+an updated document only gets the fields the row fills in.
+"""
+
+import sys
+from config import Config
+from services.db import get_connection
+from services.image_validator import ImageValidator
+from services.transfer import format_for, import_records, export_records, export_cursor
+from models.member import Member
+from models.event import Event
+
+def main():
+    if len(sys.argv) != 4 or sys.argv[1] not in ('import', 'export') or sys.argv[2] not in ('members', 'events'):
+        print(__doc__)
+        sys.exit(1)
+    command, kind, path = sys.argv[1:]
+    fmt = format_for(path)
+    db = get_connection(Config.__dict__)
+    model = Member(db) if kind == 'members' else Event(db)
+
+    if command == 'export':
+        out = sys.stdout if path == '-' else open(path, 'w', encoding='utf-8', newline='')
+        with out:
+            for chunk in export_records(export_cursor(model), kind, fmt):
+                out.write(chunk)
+        print(f"[OK] Exported {kind} to {path}", file=sys.stderr)
+    else:
+        stream = sys.stdin if path == '-' else open(path, encoding='utf-8-sig', newline='')
+        with stream:
+            summary = import_records(model, kind, stream, fmt, ImageValidator(Config.__dict__))
+        print(f"[OK] {summary['inserted']} added, {summary['updated']} updated, {summary['skipped']} skipped")
+        for error in summary["errors"]:
+            print(f"  line {error['line']}: {error['error']}")
+        if summary["skipped"]:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Apply database migrations (indexes and data backfills)
+Run once per deploy: python migrate.py
+Other commands:
+    python migrate.py status     # show recorded and latest schema version
+    python migrate.py backfill   # recompute derived fields (e.g. after editing MEMBER_ROLE_PRIORITY)
+    python migrate.py verify     # explain every declared query shape; exit 1 on COLLSCAN/in-memory SORT
+    python migrate.py rebuild    # regenerate the read models (after editing data directly in MongoDB)
+"""
+
+import sys
+from config import Config
+from services.db import get_connection
+from services import migrations
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else 'up'
+    db = get_connection(Config.__dict__)
+
+    if command == 'status':
+        version = migrations.current_version(db)
+        print(f"Schema version: {version} (latest {migrations.LATEST_VERSION})")
+        for number, description, _ in migrations.pending(db):
+            print(f"  pending {number}: {description}")
+    elif command == 'up':
+        version = migrations.migrate(db)
+        print(f"[OK] Schema at version {version}")
+    elif command == 'backfill':
+        migrations.backfill(db)
+        print("[OK] Derived fields backfilled")
+    elif command == 'rebuild':
+        migrations.rebuild_read_models(db)
+        print("[OK] Read models rebuilt")
+    elif command == 'verify':
+        print("Query shapes:")
+        failures = migrations.verify_query_shapes(db)
+        if failures:
+            print(f"[FAIL] {len(failures)} query shape(s) not covered by an index")
+            sys.exit(1)
+        print("[OK] Every query shape is index-backed")
+    else:
+        print(__doc__)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Read-only async (Motor) counterparts of Member and Event for the ASGI tier.
+
+Queries, sorts, projections and cache keys are shared with the sync models,
+so both tiers issue the same index-backed commands and return the same
+documents. Writes stay on the sync models (admin app); the content watcher
+(services/content_sync.py) tells these models about them.
+"""
+
+import time
+from datetime import datetime
+from bson import ObjectId
+from config import Config
+from services.cache import QueryCache, new_version
+from services.content_sync import content_watcher, aload_version
+from models.pagination import fetch_page_async
+from models.projections import to_projection
+from models.member import Member, DIRECTORY_PIPELINE, in_role_order
+from models.event import Event, SORT as EVENT_SORT
+from models.read_models import READ_MODELS, DIRECTORY_ID, find_read_model, assemble
+from services.serialization import DIRECTORY_TYPES
+
+async def load_read_model(db, name: str):
+    """models.read_models.assemble of name, read through Motor"""
+    query, sort = find_read_model(name)
+    return assemble(name, await db[READ_MODELS].find(query).sort(sort).to_list(None))
+
+class AsyncMember:
+    fields_for = staticmethod(Member.fields_for)
+    priority_for = Member.priority_for
+
+    def __init__(self, db, cache: QueryCache = None, role_priority: dict = None):
+        self.db = db
+        self.cache = cache or QueryCache()
+        self.role_priority = role_priority or Config.MEMBER_ROLE_PRIORITY
+        # Content version shared with the sync models, read on first use
+        self.version = None
+        self.modified_at = None
+        self._version_checked = None
+
+    @property
+    def collection(self):
+        return self.db.members
+
+    def refresh(self, version: str):
+        """Adopt content version and drop cached reads (called by the content watcher)"""
+        if self.version is not None:
+            self.modified_at = datetime.utcnow()
+        self.version = version
+        self._version_checked = time.monotonic()
+        self.cache.invalidate()
+
+    async def current_version(self) -> str:
+        """Member.current_version, read through Motor"""
+        if content_watcher.needs_check(self, self._version_checked):
+            try:
+                version = await aload_version(self.db, self.collection.name)
+            except Exception as e:
+                print(f"Content version read failed: {e}")
+                return self.version or new_version()
+            if version != self.version:
+                self.refresh(version)
+            self._version_checked = time.monotonic()
+        return self.version
+
+    async def get_all(self, member_type: str = None, department: str = None, fields: tuple = None):
+        """Get all members, optionally filtered by member_type or department (cached)"""
+        query = Member._query(member_type, department)
+        async def load():
+            cursor = self.collection.find(query, to_projection(fields)).sort(Member._sort(member_type))
+            members = await cursor.to_list(None)
+            return in_role_order(members, self.priority_for) if member_type else members
+        return await self.cache.aget_or_set(("get_all", member_type, department, fields), load)
+
+    async def get_page(self, limit: int, after: str = None, member_type: str = None, department: str = None,
+                       fields: tuple = None):
+        """Get one keyset page of members as (docs, next_cursor) (cached)"""
+        query = Member._query(member_type, department)
+        return await self.cache.aget_or_set(
+            ("get_page", member_type, department, limit, after, fields),
+            lambda: fetch_page_async(self.collection, query, Member._sort(member_type), limit, after,
+                                     to_projection(fields))
+        )
+
+    async def iter_all(self, member_type: str = None, department: str = None, fields: tuple = None,
+                       batch_size: int = 100):
+        """Yield members straight from a Motor cursor, keeping memory bounded"""
+        query = Member._query(member_type, department)
+        cursor = self.collection.find(query, to_projection(fields)).sort(Member._sort(member_type))
+        async for doc in cursor.batch_size(batch_size):
+            yield doc
+
+    async def get_directory(self):
+        """Get the whole member directory in one $facet aggregation (cached)"""
+        async def load():
+            directory = (await self.collection.aggregate(DIRECTORY_PIPELINE).to_list(length=1))[0]
+            for key in DIRECTORY_TYPES:
+                directory[key] = in_role_order(directory[key], self.priority_for)
+            return directory
+        return await self.cache.aget_or_set(("get_directory",), load)
+
+    async def get_read_model(self):
+        """The directory read model, or None unless it is built at the current content version
+        (assembled once per version)"""
+        version = await self.current_version()
+        directory = await self.cache.aget_or_set(("read_model",), lambda: load_read_model(self.db, DIRECTORY_ID))
+        return directory if directory and directory["version"] == version else None
+
+    async def get_by_id(self, member_id: str):
+        """Get single member"""
+        return await self.collection.find_one({"_id": ObjectId(member_id)})
+
+    async def get_by_department(self):
+        """Get core members grouped by department (cached, shared with get_directory)"""
+        return (await self.get_directory())["departments"]
+
+class AsyncEvent:
+    fields_for = staticmethod(Event.fields_for)
+    month_key = staticmethod(Event.month_key)
+
+    def __init__(self, db, cache: QueryCache = None):
+        self.db = db
+        self.cache = cache or QueryCache()
+        # Content version shared with the sync models, read on first use
+        self.version = None
+        self.modified_at = None
+        self._version_checked = None
+
+    @property
+    def collection(self):
+        return self.db.events
+
+    def refresh(self, version: str):
+        """Adopt content version and drop cached reads (called by the content watcher)"""
+        if self.version is not None:
+            self.modified_at = datetime.utcnow()
+        self.version = version
+        self._version_checked = time.monotonic()
+        self.cache.invalidate()
+
+    current_version = AsyncMember.current_version
+
+    async def get_all(self, event_type: str = None, fields: tuple = None):
+        """Get all events, optionally filtered by type (cached)"""
+        query = {"event_type": event_type} if event_type else {}
+        return await self.cache.aget_or_set(
+            ("get_all", event_type, fields),
+            lambda: self.collection.find(query, to_projection(fields)).sort(EVENT_SORT).to_list(None)
+        )
+
+    async def get_page(self, limit: int, after: str = None, event_type: str = None, fields: tuple = None):
+        """Get one keyset page of events as (docs, next_cursor) (cached)"""
+        query = {"event_type": event_type} if event_type else {}
+        return await self.cache.aget_or_set(
+            ("get_page", event_type, limit, after, fields),
+            lambda: fetch_page_async(self.collection, query, EVENT_SORT, limit, after, to_projection(fields))
+        )
+
+    async def iter_all(self, event_type: str = None, fields: tuple = None, batch_size: int = 50):
+        """Yield events straight from a Motor cursor, keeping memory bounded"""
+        query = {"event_type": event_type} if event_type else {}
+        async for doc in self.collection.find(query, to_projection(fields)).sort(EVENT_SORT).batch_size(batch_size):
+            yield doc
+
+    async def get_codex_by_month(self, month: str):
+        """Get CodeX event by YYYY-MM month or trailing title words, newest first (cached)"""
+        key = month.lower()
+        query = Event.codex_month_query(key)
+        return await self.cache.aget_or_set(
+            ("get_codex_by_month", key),
+            lambda: self.collection.find_one(query, sort=[("date", -1)])
+        )
+
+    async def get_read_model(self, name: str):
+        """The events_index/codex_index read model, or None unless it is built at the current
+        content version (assembled once per version)"""
+        version = await self.current_version()
+        index = await self.cache.aget_or_set(("read_model", name), lambda: load_read_model(self.db, name))
+        return index if index and index["version"] == version else None
+
+    async def get_by_id(self, event_id: str):
+        """Get single event"""
+        return await self.collection.find_one({"_id": ObjectId(event_id)})
@@ -0,0 +1,67 @@
+from itertools import islice
+
+def insert_batches(collection, docs, batch_size: int) -> int:
+    """insert_many docs (any iterable) in unordered batches of batch_size; returns the count"""
+    docs = iter(docs)
+    total = 0
+    while True:
+        batch = list(islice(docs, batch_size))
+        if not batch:
+            return total
+        # Unordered: the server may apply the batch in parallel and a bad document
+        # does not stop the rest of the batch
+        collection.insert_many(batch, ordered=False)
+        total += len(batch)
+
+def replace_collection(db, name: str, docs, batch_size: int, indexes: list, keep: dict = None) -> int:
+    """Load docs into a staging collection, then rename it over name in one step
+
+    Readers see either the old or the new contents, never a half-loaded collection.
+    keep copies matching documents from the live collection into staging first
+    (e.g. keep general events while re-seeding CodeX). Returns the number of docs inserted.
+    """
+    from bson import ObjectId
+    from pymongo import IndexModel
+    # Unique per call, so concurrent loads of name never share (or drop) a staging collection
+    staging = f"{name}_staging_{ObjectId()}"
+    try:
+        if keep is not None:
+            db[name].aggregate([{"$match": keep}, {"$out": staging}])
+        total = insert_batches(db[staging], docs, batch_size)
+        # Built before the swap so the new collection is fully indexed when it goes live;
+        # this also creates staging when docs was empty, so the rename always has a source
+        db[staging].create_indexes([IndexModel(keys) for keys in indexes])
+        db[staging].rename(name, dropTarget=True)
+    finally:
+        # Gone after a successful rename; otherwise the half-loaded copy of a failed load
+        db[staging].drop()
+    return total
+
+def split_upsert(doc: dict, given: set) -> tuple:
+    """(set_fields, set_on_insert) of a built document for upsert_batches
+
+    Fields in given overwrite a matched document; the rest (defaults for what the
+    record left out, creation stamps) are only written when the upsert inserts.
+    """
+    fields = {field: value for field, value in doc.items() if field in given}
+    on_insert = {field: value for field, value in doc.items() if field not in given}
+    return fields, on_insert
+
+def upsert_batches(collection, upserts, batch_size: int) -> dict:
+    """bulk_write (match, set_fields, set_on_insert) upserts in unordered batches
+
+    Returns {"inserted": n, "updated": n} summed over every batch.
+    """
+    from pymongo import UpdateOne
+    upserts = iter(upserts)
+    counts = {"inserted": 0, "updated": 0}
+    while True:
+        batch = [
+            UpdateOne(match, {"$set": fields, "$setOnInsert": on_insert}, upsert=True)
+            for match, fields, on_insert in islice(upserts, batch_size)
+        ]
+        if not batch:
+            return counts
+        result = collection.bulk_write(batch, ordered=False)
+        counts["inserted"] += result.upserted_count
+        counts["updated"] += result.modified_count
@@ -1,25 +1,189 @@
+import re
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
+from itertools import groupby
 from bson import ObjectId
+from services.cache import QueryCache, new_version
+from config import Config
+from models.pagination import fetch_page, keyset_filter
+from models.bulk import insert_batches, replace_collection, upsert_batches, split_upsert
+from models.projections import resolve_fields, to_projection
+from services.executor import query_executor
+from services.content_sync import content_watcher, load_version
+from services.serialization import serialize_doc
+from models.read_models import (READ_MODELS, EVENTS_INDEX_ID, CODEX_INDEX_ID, entry, store_bucket, store_buckets,
+                                store_head, find_read_model, assemble)
+
+MONTH_KEY_RE = re.compile(r'^\d{4}-\d{2}$')
+
+EVENT_TYPES = ("general", "codex")
+
+# Listing order; _id breaks date ties so keyset pages are stable
+SORT = [("date", -1), ("_id", -1)]
+
+# Read model (models/read_models.py) of each event_type, bucketed by month
+READ_MODEL_IDS = {"general": EVENTS_INDEX_ID, "codex": CODEX_INDEX_ID}
+BUCKET_FIELDS = {"event_type": 1, "date": 1}
+
+FIELDS = {"title", "description", "date", "month", "event_type", "cover_image", "gallery",
+          "event_photos", "winners", "codex_categories", "created_at", "updated_at"}
+# Named projections for list endpoints; "full" (the default) returns every field
+VIEWS = {
+    "summary": ("title", "date", "month", "event_type", "cover_image")
+}
+
+# Stored field -> create() argument; the columns of import/export files (services/transfer.py)
+RECORD_FIELDS = {"title": "title", "description": "description", "date": "date", "event_type": "event_type",
+                 "cover_image": "cover_image", "gallery": "gallery", "codex_categories": "codex_categories",
+                 "event_photos": "event_photos", "winners": "winners"}
+
+# Read methods wrapped by the slow-query profiler (services/query_profiler.py)
+PROFILED_METHODS = ("get_all", "get_page", "get_codex_by_month", "get_by_id", "get_read_model")
+
+# Every filter/sort combination the read methods issue (values are samples);
+# `python migrate.py verify` explains each one and fails on a COLLSCAN or in-memory SORT
+QUERY_SHAPES = [
+    {"name": "all", "filter": {}, "sort": SORT},
+    {"name": "by event_type", "filter": {"event_type": "general"}, "sort": SORT},
+    {"name": "event_type page after cursor",
+     "filter": {"$and": [{"event_type": "general"}, keyset_filter(SORT, [datetime(2025, 1, 1), ObjectId()])]},
+     "sort": SORT, "limit": 21},
+    {"name": "codex by month", "filter": {"event_type": "codex", "$or": [
+        {"month": "2025-01"},
+        {"month": None, "date": {"$gte": datetime(2025, 1, 1), "$lt": datetime(2025, 2, 1)}}]},
+     "sort": [("date", -1)], "limit": 1},
+    {"name": "codex by title slug", "filter": {"event_type": "codex", "$or": [
+        {"title_slug": {"$regex": "(^|-)november$"}},
+        {"title_slug": None, "title": {"$regex": "november$", "$options": "i"}}]},
+     "sort": [("date", -1)], "limit": 1},
+    {"name": "read-model month bucket",
+     "filter": {"event_type": "general", "date": {"$gte": datetime(2025, 1, 1), "$lt": datetime(2025, 2, 1)}},
+     "sort": SORT},
+]
+
+# Compound index key specs (equality fields, then the sort) matching QUERY_SHAPES;
+# created in bulk by the migration registry (services/migrations.py), never on boot.
+# title_slug trails the listing index so slug regexes are checked on index keys in date order.
+INDEXES = [
+    [("date", -1), ("_id", -1)],
+    [("event_type", 1), ("date", -1), ("_id", -1), ("title_slug", 1)],
+    [("event_type", 1), ("month", 1), ("date", -1)]
+]
 
 class Event:
-    def __init__(self, db):
-        self.collection = db.events
-        self._ensure_indexes()
+    def __init__(self, db, cache: QueryCache = None):
+        self.db = db
+        self.cache = cache or QueryCache()
+        # Content version shared by every process (services/content_sync.py), read on first use
+        self.version = None
+        self.modified_at = None
+        self._version_checked = None
+        self._batch = threading.local()
     
-    def _ensure_indexes(self):
-        """Create indexes for performance"""
-        self.collection.create_index([("date", -1)])
-        self.collection.create_index([("event_type", 1)])
+    @property
+    def collection(self):
+        # Resolved on each access so a forked worker picks up its own client
+        return self.db.events
     
-    def create(self, title: str, description: str, date: datetime, 
-               event_type: str, cover_image: str, gallery: list = None, 
-               codex_categories: list = None, event_photos: list = None, winners: list = None) -> str:
-        """Create new event"""
+    def _invalidate(self, *events):
+        """Bump content version, rebuild the read models at it, drop cached reads and tell other processes after a write
+
+        events (documents before and after the write) limit the rebuild to their buckets;
+        bulk writes pass none and rebuild every bucket.
+        """
+        if getattr(self._batch, "depth", 0):
+            self._batch.changed = True
+            return
+        self.rebuild_read_models([e for e in events if e] if events else None)
+    
+    @contextmanager
+    def batch(self):
+        """Defer the read-model rebuild and version bump of writes in the block (on this thread)
+        to one full rebuild when it ends, e.g. across the chunks of an import"""
+        depth = getattr(self._batch, "depth", 0)
+        self._batch.depth = depth + 1
+        try:
+            yield self
+        finally:
+            self._batch.depth = depth
+            if not depth and getattr(self._batch, "changed", False):
+                self._batch.changed = False
+                self._invalidate()
+    
+    def refresh(self, version: str):
+        """Adopt content version and drop cached reads (also called by the content watcher)"""
+        # Adopting the first version read is not a change
+        if self.version is not None:
+            self.modified_at = datetime.utcnow()
+        self.version = version
+        self._version_checked = time.monotonic()
+        self.cache.invalidate()
+    
+    def current_version(self) -> str:
+        """Content version to serve, re-read from the database unless the content watcher keeps it current"""
+        if content_watcher.needs_check(self, self._version_checked):
+            try:
+                version = load_version(self.db, self.collection.name)
+            except Exception as e:
+                print(f"Content version read failed: {e}")
+                return self.version or new_version()
+            if version != self.version:
+                self.refresh(version)
+            self._version_checked = time.monotonic()
+        return self.version
+    
+    def ensure_indexes(self) -> list:
+        """Create every declared index in one createIndexes command"""
+        from pymongo import IndexModel
+        return self.collection.create_indexes([IndexModel(keys) for keys in INDEXES])
+    
+    @staticmethod
+    def month_key(date) -> str:
+        """Normalized YYYY-MM key for an event date"""
+        return date.strftime('%Y-%m') if hasattr(date, 'strftime') else str(date)[:7]
+    
+    @staticmethod
+    def month_range(key: str) -> dict:
+        """date filter for a YYYY-MM key (ValueError for an invalid month such as 2025-13)"""
+        start = datetime.strptime(key, '%Y-%m')
+        return {"$gte": start, "$lt": datetime(start.year + start.month // 12, start.month % 12 + 1, 1)}
+    
+    @staticmethod
+    def slugify(title: str) -> str:
+        """Lowercase, hyphen-separated slug of a title"""
+        return '-'.join(re.findall(r'[a-z0-9]+', (title or '').lower()))
+    
+    def backfill_lookup_keys(self) -> int:
+        """Populate month/title_slug on events stored before those fields existed"""
+        from pymongo import UpdateOne
+        missing = self.collection.find(
+            {"$or": [{"month": {"$exists": False}}, {"title_slug": {"$exists": False}}]},
+            {"date": 1, "title": 1}
+        )
+        ops = [
+            UpdateOne({"_id": doc["_id"]}, {"$set": {
+                "month": self.month_key(doc.get("date")),
+                "title_slug": self.slugify(doc.get("title"))
+            }})
+            for doc in missing
+        ]
+        if ops:
+            self.collection.bulk_write(ops, ordered=False)
+            self._invalidate()
+        return len(ops)
+    
+    def _build_document(self, title: str, description: str, date: datetime,
+                        event_type: str, cover_image: str, gallery: list = None,
+                        codex_categories: list = None, event_photos: list = None, winners: list = None) -> dict:
         event = {
             "title": title,
             "description": description,
             "date": date,
+            "month": self.month_key(date),
             "event_type": event_type,
+            "title_slug": self.slugify(title),
             "cover_image": cover_image,
             "gallery": gallery or [],
             "event_photos": event_photos or [],
@@ -29,43 +193,240 @@ class Event:
         
         if event_type == 'codex':
             event['codex_categories'] = codex_categories or []
-        
+        return event
+    
+    def create(self, title: str, description: str, date: datetime, 
+               event_type: str, cover_image: str, gallery: list = None, 
+               codex_categories: list = None, event_photos: list = None, winners: list = None) -> str:
+        """Create new event"""
+        event = self._build_document(title, description, date, event_type, cover_image, gallery,
+                                     codex_categories, event_photos, winners)
         result = self.collection.insert_one(event)
+        self._invalidate(event)
         return str(result.inserted_id)
     
+    def bulk_create(self, events, batch_size: int = None, replace: bool = False, keep: dict = None) -> int:
+        """Insert many events (dicts of create() arguments) with batched insert_many
+
+        replace=True loads a staging collection and renames it over events, so the
+        site never shows a half-loaded list; keep carries matching live events over
+        (e.g. {"event_type": {"$ne": "codex"}} when re-seeding CodeX only).
+        Returns the count inserted.
+        """
+        batch_size = batch_size or Config.BULK_BATCH_SIZE
+        docs = (self._build_document(**event) for event in events)
+        if replace:
+            total = replace_collection(self.db, self.collection.name, docs, batch_size, INDEXES, keep)
+        else:
+            total = insert_batches(self.collection, docs, batch_size)
+        self._invalidate()
+        return total
+    
+    def bulk_upsert(self, events, batch_size: int = None) -> dict:
+        """Insert or update events (dicts of create() arguments, optionally with _id) in batched bulk_writes
+
+        Matched on _id when given, otherwise on (event_type, title, date). A matched event only gets
+        the fields its dict carries; defaults (event_type "general") and created_at are only set on insert.
+        codex_categories are kept unless the dict itself gives a non-CodeX event_type, since a
+        dict without one may update a stored CodeX event.
+        Returns {"inserted": n, "updated": n}.
+        """
+        def upserts():
+            for event in events:
+                event = dict(event)
+                event_id = event.pop("_id", None)
+                arguments = {arg: event.get(arg) for arg in RECORD_FIELDS.values()}
+                arguments["event_type"] = arguments["event_type"] or "general"
+                doc = self._build_document(**arguments)
+                if "codex_categories" in event and not event.get("event_type"):
+                    doc["codex_categories"] = arguments["codex_categories"] or []
+                doc["updated_at"] = doc["created_at"]
+                given = {field for field, arg in RECORD_FIELDS.items() if arg in event} | {"updated_at"}
+                if "date" in given:
+                    given.add("month")
+                if "title" in given:
+                    given.add("title_slug")
+                fields, on_insert = split_upsert(doc, given)
+                match = {"_id": ObjectId(event_id)} if event_id else \
+                    {"event_type": doc["event_type"], "title": doc["title"], "date": doc["date"]}
+                yield match, fields, on_insert
+        counts = upsert_batches(self.collection, upserts(), batch_size or Config.BULK_BATCH_SIZE)
+        self._invalidate()
+        return counts
+    
     def update(self, event_id: str, **kwargs) -> bool:
         """Update event fields"""
-        result = self.collection.update_one(
+        if 'date' in kwargs:
+            kwargs['month'] = self.month_key(kwargs['date'])
+        if 'title' in kwargs:
+            kwargs['title_slug'] = self.slugify(kwargs['title'])
+        kwargs['updated_at'] = datetime.utcnow()
+        # The document as it was, so an event moving event_type/month leaves its old bucket
+        before = self.collection.find_one_and_update(
             {"_id": ObjectId(event_id)},
-            {"$set": kwargs}
+            {"$set": kwargs},
+            projection=BUCKET_FIELDS
         )
-        return result.modified_count > 0
+        self._invalidate(before, before and {**before, **kwargs})
+        return before is not None
     
     def add_gallery_image(self, event_id: str, image_url: str, caption: str = "") -> bool:
         """Add image to event gallery"""
-        result = self.collection.update_one(
+        before = self.collection.find_one_and_update(
             {"_id": ObjectId(event_id)},
-            {"$push": {"gallery": {"image_url": image_url, "caption": caption}}}
+            {
+                "$push": {"gallery": {"image_url": image_url, "caption": caption}},
+                "$set": {"updated_at": datetime.utcnow()}
+            },
+            projection=BUCKET_FIELDS
         )
-        return result.modified_count > 0
+        self._invalidate(before)
+        return before is not None
     
     def remove_gallery_image(self, event_id: str, image_url: str) -> bool:
         """Remove image from gallery"""
-        result = self.collection.update_one(
+        before = self.collection.find_one_and_update(
             {"_id": ObjectId(event_id)},
-            {"$pull": {"gallery": {"image_url": image_url}}}
+            {
+                "$pull": {"gallery": {"image_url": image_url}},
+                "$set": {"updated_at": datetime.utcnow()}
+            },
+            projection=BUCKET_FIELDS
         )
-        return result.modified_count > 0
+        self._invalidate(before)
+        return before is not None
     
     def delete(self, event_id: str) -> bool:
         """Delete event"""
-        result = self.collection.delete_one({"_id": ObjectId(event_id)})
-        return result.deleted_count > 0
+        before = self.collection.find_one_and_delete({"_id": ObjectId(event_id)}, projection=BUCKET_FIELDS)
+        self._invalidate(before)
+        return before is not None
+    
+    @staticmethod
+    def fields_for(view: str = None, fields: str = None):
+        """Resolve ?view= / ?fields= into a field tuple for the read methods (None = full)"""
+        return resolve_fields(VIEWS, FIELDS, ("date", "created_at", "updated_at"), view, fields)
+    
+    def get_all(self, event_type: str = None, fields: tuple = None):
+        """Get all events, optionally filtered by type (cached)"""
+        query = {"event_type": event_type} if event_type else {}
+        return self.cache.get_or_set(
+            ("get_all", event_type, fields),
+            lambda: list(self.collection.find(query, to_projection(fields)).sort(SORT))
+        )
     
-    def get_all(self, event_type: str = None):
-        """Get all events, optionally filtered by type"""
+    def get_page(self, limit: int, after: str = None, event_type: str = None, fields: tuple = None):
+        """Get one keyset page of events as (docs, next_cursor) (cached)"""
         query = {"event_type": event_type} if event_type else {}
-        return list(self.collection.find(query).sort("date", -1))
+        return self.cache.get_or_set(
+            ("get_page", event_type, limit, after, fields),
+            lambda: fetch_page(self.collection, query, SORT, limit, after, to_projection(fields))
+        )
+    
+    def iter_all(self, event_type: str = None, fields: tuple = None, batch_size: int = 50):
+        """Yield events straight from a Mongo cursor, keeping memory bounded"""
+        query = {"event_type": event_type} if event_type else {}
+        yield from self.collection.find(query, to_projection(fields)).sort(SORT).batch_size(batch_size)
+    
+    @classmethod
+    def codex_month_query(cls, key: str) -> dict:
+        """Filter for a lowercased /codex/<month> key: YYYY-MM month or trailing title words
+
+        Events stored before month/title_slug existed (until `python migrate.py`
+        backfills them) still match on their date range or raw title, as before.
+        """
+        if MONTH_KEY_RE.match(key):
+            try:
+                dates = cls.month_range(key)
+            except ValueError:
+                # e.g. 2025-13: no event can match
+                return {"event_type": "codex", "month": key}
+            return {"event_type": "codex", "$or": [
+                {"month": key},
+                {"month": None, "date": dates}
+            ]}
+        # Anchored on a slug word boundary; matched on index keys, newest first
+        slug = cls.slugify(key)
+        return {"event_type": "codex", "$or": [
+            {"title_slug": {"$regex": f"(^|-){re.escape(slug)}$"}},
+            {"title_slug": None, "title": {"$regex": f"{re.escape(key)}$", "$options": "i"}}
+        ]}
+    
+    def get_codex_by_month(self, month: str):
+        """Get CodeX event by YYYY-MM month or trailing title words (e.g. 'november'), newest first (cached)"""
+        key = month.lower()
+        query = self.codex_month_query(key)
+        return self.cache.get_or_set(
+            ("get_codex_by_month", key),
+            lambda: self.collection.find_one(query, sort=[("date", -1)])
+        )
+    
+    def _entry(self, event) -> dict:
+        item = serialize_doc(event)
+        if event.get("event_type") == "codex":
+            item["month"] = event.get("month") or self.month_key(event["date"])
+        return entry(event, item)
+    
+    def rebuild_read_models(self, events: list = None):
+        """Regenerate the events_index and codex_index read models (models/read_models.py) and
+        publish a new content version for them, as every write does
+
+        events limits the rebuild to their (event_type, month) buckets; by default every bucket
+        is rebuilt from one pass over the events of each type.
+        """
+        read_models = self.db[READ_MODELS]
+        buckets = events and {(e.get("event_type"), self.month_key(e.get("date"))) for e in events}
+        if buckets and not all(MONTH_KEY_RE.match(month) for _, month in buckets):
+            # An event without a date has no month range to re-read
+            events = None
+        # Taken before reading, so a rebuild that read older data never replaces this one
+        read_version = new_version()
+        try:
+            if events is None:
+                for event_type, name in READ_MODEL_IDS.items():
+                    cursor = self.collection.find({"event_type": event_type}).sort(SORT).batch_size(100)
+                    store_buckets(read_models, name, (
+                        (month, [self._entry(e) for e in group])
+                        for month, group in groupby(cursor, lambda e: self.month_key(e.get("date")))
+                    ), read_version)
+            else:
+                for event_type, month in buckets:
+                    if event_type not in READ_MODEL_IDS:
+                        continue
+                    query = {"event_type": event_type, "date": self.month_range(month)}
+                    cursor = self.collection.find(query).sort(SORT)
+                    store_bucket(read_models, READ_MODEL_IDS[event_type], month, [self._entry(e) for e in cursor],
+                                 read_version)
+            version = new_version()
+            for name in READ_MODEL_IDS.values():
+                store_head(read_models, name, version)
+        except Exception as e:
+            # The heads keep their older version, so the API falls back to live queries
+            print(f"Event read model rebuild failed: {e}")
+            version = new_version()
+        content_watcher.publish(self.db, self.collection.name, version)
+        self.refresh(version)
+        self.modified_at = datetime.utcnow()
+    
+    def get_read_model(self, name: str):
+        """The events_index/codex_index read model, or None unless it is built at the current
+        content version (assembled once per version)"""
+        def load():
+            query, sort = find_read_model(name)
+            return assemble(name, list(self.db[READ_MODELS].find(query).sort(sort)))
+        version = self.current_version()
+        index = self.cache.get_or_set(("read_model", name), load)
+        return index if index and index["version"] == version else None
+    
+    def count_by_type(self) -> dict:
+        """Event count per event_type, one index-only count per type run concurrently (cached)"""
+        def load():
+            counts = query_executor.gather(*(
+                (lambda t=event_type: self.collection.count_documents({"event_type": t}))
+                for event_type in EVENT_TYPES
+            ))
+            return dict(zip(EVENT_TYPES, counts))
+        return self.cache.get_or_set(("count_by_type",), load)
     
     def get_by_id(self, event_id: str):
         """Get single event"""
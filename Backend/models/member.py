@@ -1,23 +1,198 @@
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
+from itertools import groupby
 from bson import ObjectId
+from config import Config
+from services.cache import QueryCache, new_version
+from models.pagination import fetch_page, keyset_filter
+from models.bulk import insert_batches, replace_collection, upsert_batches, split_upsert
+from models.projections import resolve_fields, to_projection
+from services.executor import query_executor
+from services.content_sync import content_watcher, load_version
+from services.serialization import DIRECTORY_TYPES
+from models.read_models import (READ_MODELS, DIRECTORY_ID, entry, store_bucket, store_buckets, store_head,
+                                find_read_model, assemble)
+
+MEMBER_TYPES = ("founder", "faculty", "super-core", "core")
+
+# Listing order; _id breaks createdAt ties so keyset pages are stable
+SORT = [("createdAt", -1), ("_id", -1)]
+# Within one memberType, members come back in display order (e.g. Chairperson first)
+TYPE_SORT = [("rolePriority", 1), ("createdAt", -1), ("_id", -1)]
+# Every member grouped into read-model buckets, (memberType, department), each in TYPE_SORT order
+BUCKET_SORT = [("department", 1), ("memberType", 1)] + TYPE_SORT
+BUCKET_FIELDS = {"memberType": 1, "department": 1}
+
+FIELDS = {"name", "imageUrl", "role", "memberType", "department", "linkedin", "github", "email",
+          "createdAt", "updatedAt"}
+# Named projections for list endpoints; "full" (the default) returns every field
+VIEWS = {
+    "summary": ("name", "imageUrl", "role", "memberType", "department")
+}
+
+# Stored field -> create() argument; the columns of import/export files (services/transfer.py)
+RECORD_FIELDS = {"name": "name", "imageUrl": "image_url", "role": "role", "memberType": "member_type",
+                 "department": "department", "linkedin": "linkedin", "github": "github", "email": "email"}
+
+# Read methods wrapped by the slow-query profiler (services/query_profiler.py)
+PROFILED_METHODS = ("get_all", "get_page", "get_directory", "get_by_id", "get_read_model")
+
+def _listing_key(member) -> tuple:
+    # SORT as a Python key (reversed); missing createdAt sorts last, as in MongoDB
+    return member.get("createdAt") is not None, member.get("createdAt") or datetime.min, member["_id"]
+
+def in_role_order(members: list, priority_for) -> list:
+    """members of one memberType in TYPE_SORT order
+
+    Members stored before rolePriority existed (until `python migrate.py` backfills
+    them) sort first in MongoDB; they are placed by priority_for(role) instead, as
+    the API ordered them before the field. Lists without such members are returned as is.
+    """
+    if all(m.get("rolePriority") is not None for m in members):
+        return members
+    members = sorted(members, key=_listing_key, reverse=True)
+    return sorted(members, key=lambda m: priority_for(m.get("role")) if m.get("rolePriority") is None
+                  else m["rolePriority"])
+
+def _by_type(member_type: str) -> list:
+    return [{"$match": {"memberType": member_type}}]
+
+# Whole directory in one round trip; the leading $sort is served by the
+# (memberType, rolePriority, createdAt, _id) index
+DIRECTORY_PIPELINE = [
+    {"$sort": dict([("memberType", 1)] + TYPE_SORT)},
+    {"$project": {field: 1 for field in FIELDS | {"rolePriority"}}},
+    {"$facet": {
+        "founder": _by_type("founder"),
+        "faculty": _by_type("faculty"),
+        "super-core": _by_type("super-core"),
+        "departments": _by_type("core") + [
+            {"$sort": {"department": 1, "createdAt": 1, "_id": 1}},
+            {"$group": {"_id": "$department", "members": {"$push": "$$ROOT"}}},
+            {"$sort": {"_id": 1}}
+        ]
+    }}
+]
+
+# Every filter/sort combination the read methods issue (values are samples);
+# `python migrate.py verify` explains each one and fails on a COLLSCAN or in-memory SORT
+QUERY_SHAPES = [
+    {"name": "all", "filter": {}, "sort": SORT},
+    {"name": "by memberType", "filter": {"memberType": "core"}, "sort": TYPE_SORT},
+    {"name": "by department", "filter": {"department": "Tech"}, "sort": SORT},
+    {"name": "by memberType and department", "filter": {"memberType": "core", "department": "Tech"},
+     "sort": TYPE_SORT},
+    {"name": "memberType page after cursor",
+     "filter": {"$and": [{"memberType": "core"},
+                         keyset_filter(TYPE_SORT, [99, datetime(2025, 1, 1), ObjectId()])]},
+     "sort": TYPE_SORT, "limit": 21},
+    {"name": "directory", "pipeline": DIRECTORY_PIPELINE},
+    {"name": "read-model buckets", "filter": {}, "sort": BUCKET_SORT},
+]
+
+# Compound index key specs (equality fields, then the sort) matching QUERY_SHAPES;
+# created in bulk by the migration registry (services/migrations.py), never on boot
+INDEXES = [
+    [("createdAt", -1), ("_id", -1)],
+    [("memberType", 1), ("rolePriority", 1), ("createdAt", -1), ("_id", -1)],
+    [("department", 1), ("createdAt", -1), ("_id", -1)],
+    [("department", 1), ("memberType", 1), ("rolePriority", 1), ("createdAt", -1), ("_id", -1)]
+]
 
 class Member:
-    def __init__(self, db):
-        self.collection = db.members
-        self._ensure_indexes()
+    def __init__(self, db, cache: QueryCache = None, role_priority: dict = None):
+        self.db = db
+        self.cache = cache or QueryCache()
+        self.role_priority = role_priority or Config.MEMBER_ROLE_PRIORITY
+        # Content version shared by every process (services/content_sync.py), read on first use
+        self.version = None
+        self.modified_at = None
+        self._version_checked = None
+        self._batch = threading.local()
     
-    def _ensure_indexes(self):
-        """Create indexes for performance"""
-        self.collection.create_index([("memberType", 1)])
-        self.collection.create_index([("department", 1)])
+    @property
+    def collection(self):
+        # Resolved on each access so a forked worker picks up its own client
+        return self.db.members
     
-    def create(self, name: str, image_url: str, role: str, member_type: str, department: str = None,
-               linkedin: str = None, github: str = None, email: str = None) -> str:
-        """Create new member"""
-        member = {
+    def _invalidate(self, *members):
+        """Bump content version, rebuild the read model at it, drop cached reads and tell other processes after a write
+
+        members (documents before and after the write) limit the rebuild to their buckets;
+        bulk writes pass none and rebuild every bucket.
+        """
+        if getattr(self._batch, "depth", 0):
+            self._batch.changed = True
+            return
+        self.rebuild_read_models([m for m in members if m] if members else None)
+    
+    @contextmanager
+    def batch(self):
+        """Defer the read-model rebuild and version bump of writes in the block (on this thread)
+        to one full rebuild when it ends, e.g. across the chunks of an import"""
+        depth = getattr(self._batch, "depth", 0)
+        self._batch.depth = depth + 1
+        try:
+            yield self
+        finally:
+            self._batch.depth = depth
+            if not depth and getattr(self._batch, "changed", False):
+                self._batch.changed = False
+                self._invalidate()
+    
+    def refresh(self, version: str):
+        """Adopt content version and drop cached reads (also called by the content watcher)"""
+        # Adopting the first version read is not a change
+        if self.version is not None:
+            self.modified_at = datetime.utcnow()
+        self.version = version
+        self._version_checked = time.monotonic()
+        self.cache.invalidate()
+    
+    def current_version(self) -> str:
+        """Content version to serve, re-read from the database unless the content watcher keeps it current"""
+        if content_watcher.needs_check(self, self._version_checked):
+            try:
+                version = load_version(self.db, self.collection.name)
+            except Exception as e:
+                print(f"Content version read failed: {e}")
+                return self.version or new_version()
+            if version != self.version:
+                self.refresh(version)
+            self._version_checked = time.monotonic()
+        return self.version
+    
+    def ensure_indexes(self) -> list:
+        """Create every declared index in one createIndexes command"""
+        from pymongo import IndexModel
+        return self.collection.create_indexes([IndexModel(keys) for keys in INDEXES])
+    
+    def priority_for(self, role: str) -> int:
+        """Display priority of a role from the configured role table"""
+        return self.role_priority.get(role, Config.DEFAULT_ROLE_PRIORITY)
+    
+    def backfill_role_priority(self) -> int:
+        """Recompute rolePriority where it is missing or the role table has changed"""
+        from pymongo import UpdateOne
+        ops = [
+            UpdateOne({"_id": doc["_id"]}, {"$set": {"rolePriority": self.priority_for(doc.get("role"))}})
+            for doc in self.collection.find({}, {"role": 1, "rolePriority": 1})
+            if doc.get("rolePriority") != self.priority_for(doc.get("role"))
+        ]
+        if ops:
+            self.collection.bulk_write(ops, ordered=False)
+            self._invalidate()
+        return len(ops)
+    
+    def _build_document(self, name: str, image_url: str, role: str, member_type: str, department: str = None,
+                        linkedin: str = None, github: str = None, email: str = None) -> dict:
+        return {
             "name": name,
             "imageUrl": image_url,
             "role": role,
+            "rolePriority": self.priority_for(role),
             "memberType": member_type,  # founder, faculty, super-core, core
             "department": department,  # Only for core members
             "linkedin": linkedin,
@@ -26,44 +201,195 @@ class Member:
             "createdAt": datetime.utcnow(),
             "updatedAt": datetime.utcnow()
         }
+    
+    def create(self, name: str, image_url: str, role: str, member_type: str, department: str = None,
+               linkedin: str = None, github: str = None, email: str = None) -> str:
+        """Create new member"""
+        member = self._build_document(name, image_url, role, member_type, department, linkedin, github, email)
         result = self.collection.insert_one(member)
+        self._invalidate(member)
         return str(result.inserted_id)
     
+    def bulk_create(self, members, batch_size: int = None, replace: bool = False) -> int:
+        """Insert many members (dicts of create() arguments) with batched insert_many
+
+        replace=True loads a staging collection and renames it over members, so the
+        old team stays visible until the new one is complete. Returns the count inserted.
+        """
+        batch_size = batch_size or Config.BULK_BATCH_SIZE
+        docs = (self._build_document(**member) for member in members)
+        if replace:
+            total = replace_collection(self.db, self.collection.name, docs, batch_size, INDEXES)
+        else:
+            total = insert_batches(self.collection, docs, batch_size)
+        self._invalidate()
+        return total
+    
+    def bulk_upsert(self, members, batch_size: int = None) -> dict:
+        """Insert or update members (dicts of create() arguments, optionally with _id) in batched bulk_writes
+
+        Matched on _id when given, otherwise on (name, memberType). A matched member only gets
+        the fields its dict carries; defaults and createdAt are only set on insert.
+        Returns {"inserted": n, "updated": n}.
+        """
+        def upserts():
+            for member in members:
+                member = dict(member)
+                member_id = member.pop("_id", None)
+                doc = self._build_document(**{arg: member.get(arg) for arg in RECORD_FIELDS.values()})
+                given = {field for field, arg in RECORD_FIELDS.items() if arg in member} | {"updatedAt"}
+                if "role" in given:
+                    given.add("rolePriority")
+                fields, on_insert = split_upsert(doc, given)
+                match = {"_id": ObjectId(member_id)} if member_id else {"name": doc["name"], "memberType": doc["memberType"]}
+                yield match, fields, on_insert
+        counts = upsert_batches(self.collection, upserts(), batch_size or Config.BULK_BATCH_SIZE)
+        self._invalidate()
+        return counts
+    
     def update(self, member_id: str, **kwargs) -> bool:
         """Update member fields"""
+        if 'role' in kwargs:
+            kwargs['rolePriority'] = self.priority_for(kwargs['role'])
         kwargs['updatedAt'] = datetime.utcnow()
-        result = self.collection.update_one(
+        # The document as it was, so a member moving memberType/department leaves its old bucket
+        before = self.collection.find_one_and_update(
             {"_id": ObjectId(member_id)},
-            {"$set": kwargs}
+            {"$set": kwargs},
+            projection=BUCKET_FIELDS
         )
-        return result.modified_count > 0
+        self._invalidate(before, before and {**before, **kwargs})
+        return before is not None
     
     def delete(self, member_id: str) -> bool:
         """Delete member"""
-        result = self.collection.delete_one({"_id": ObjectId(member_id)})
-        return result.deleted_count > 0
+        before = self.collection.find_one_and_delete({"_id": ObjectId(member_id)}, projection=BUCKET_FIELDS)
+        self._invalidate(before)
+        return before is not None
     
-    def get_all(self, member_type: str = None, department: str = None):
-        """Get all members, optionally filtered by member_type or department"""
+    @staticmethod
+    def _query(member_type: str = None, department: str = None) -> dict:
         query = {}
         if member_type:
             query["memberType"] = member_type
         if department:
             query["department"] = department
-        return list(self.collection.find(query).sort("createdAt", -1))
+        return query
+    
+    @staticmethod
+    def _sort(member_type: str = None) -> list:
+        return TYPE_SORT if member_type else SORT
+    
+    @staticmethod
+    def fields_for(view: str = None, fields: str = None):
+        """Resolve ?view= / ?fields= into a field tuple for the read methods (None = full)"""
+        return resolve_fields(VIEWS, FIELDS, ("rolePriority", "createdAt", "updatedAt"), view, fields)
+    
+    def get_all(self, member_type: str = None, department: str = None, fields: tuple = None):
+        """Get all members, optionally filtered by member_type or department (cached)"""
+        query = self._query(member_type, department)
+        def load():
+            members = list(self.collection.find(query, to_projection(fields)).sort(self._sort(member_type)))
+            return in_role_order(members, self.priority_for) if member_type else members
+        return self.cache.get_or_set(("get_all", member_type, department, fields), load)
+    
+    def get_page(self, limit: int, after: str = None, member_type: str = None, department: str = None,
+                 fields: tuple = None):
+        """Get one keyset page of members as (docs, next_cursor) (cached)"""
+        query = self._query(member_type, department)
+        return self.cache.get_or_set(
+            ("get_page", member_type, department, limit, after, fields),
+            lambda: fetch_page(self.collection, query, self._sort(member_type), limit, after,
+                               to_projection(fields))
+        )
+    
+    def iter_all(self, member_type: str = None, department: str = None, fields: tuple = None,
+                 batch_size: int = 100):
+        """Yield members straight from a Mongo cursor, keeping memory bounded"""
+        query = self._query(member_type, department)
+        cursor = self.collection.find(query, to_projection(fields)).sort(self._sort(member_type))
+        yield from cursor.batch_size(batch_size)
+    
+    def get_directory(self):
+        """Get the whole member directory in one $facet aggregation (cached)
+
+        Returns {"founder": [...], "faculty": [...], "super-core": [...],
+        "departments": [{"_id": dept, "members": [...]}]}, each list in display order.
+        """
+        def load():
+            directory = next(self.collection.aggregate(DIRECTORY_PIPELINE))
+            for key in DIRECTORY_TYPES:
+                directory[key] = in_role_order(directory[key], self.priority_for)
+            return directory
+        return self.cache.get_or_set(("get_directory",), load)
+    
+    def _entry(self, member) -> dict:
+        # rolePriority is not part of the JSON; members not backfilled yet are ordered by their
+        # role, as in_role_order does for live reads
+        priority = member.get("rolePriority")
+        return {**entry(member), "priority": self.priority_for(member.get("role")) if priority is None else priority}
+    
+    @staticmethod
+    def _bucket_key(member) -> tuple:
+        return member.get("memberType"), member.get("department")
+    
+    def rebuild_read_models(self, members: list = None):
+        """Regenerate the directory read model (models/read_models.py) and publish a new content
+        version for it, as every write does
+
+        members limits the rebuild to their (memberType, department) buckets; by default every
+        bucket is rebuilt from one pass over the members.
+        """
+        read_models = self.db[READ_MODELS]
+        # Taken before reading, so a rebuild that read older data never replaces this one
+        read_version = new_version()
+        try:
+            if members is None:
+                cursor = self.collection.find().sort(BUCKET_SORT).batch_size(500)
+                store_buckets(read_models, DIRECTORY_ID, (
+                    (f"{member_type}:{department}", [self._entry(m) for m in group])
+                    for (member_type, department), group in groupby(cursor, self._bucket_key)
+                ), read_version)
+            else:
+                for member_type, department in {self._bucket_key(m) for m in members}:
+                    query = {"memberType": member_type, "department": department}
+                    cursor = self.collection.find(query).sort(TYPE_SORT)
+                    store_bucket(read_models, DIRECTORY_ID, f"{member_type}:{department}",
+                                 [self._entry(m) for m in cursor], read_version)
+            version = new_version()
+            store_head(read_models, DIRECTORY_ID, version)
+        except Exception as e:
+            # The head keeps its older version, so the API falls back to live queries
+            print(f"Directory read model rebuild failed: {e}")
+            version = new_version()
+        content_watcher.publish(self.db, self.collection.name, version)
+        self.refresh(version)
+        self.modified_at = datetime.utcnow()
+    
+    def get_read_model(self):
+        """The directory read model, or None unless it is built at the current content version
+        (assembled once per version)"""
+        def load():
+            query, sort = find_read_model(DIRECTORY_ID)
+            return assemble(DIRECTORY_ID, list(self.db[READ_MODELS].find(query).sort(sort)))
+        version = self.current_version()
+        directory = self.cache.get_or_set(("read_model",), load)
+        return directory if directory and directory["version"] == version else None
+    
+    def count_by_type(self) -> dict:
+        """Member count per memberType, one index-only count per type run concurrently (cached)"""
+        def load():
+            counts = query_executor.gather(*(
+                (lambda t=member_type: self.collection.count_documents({"memberType": t}))
+                for member_type in MEMBER_TYPES
+            ))
+            return dict(zip(MEMBER_TYPES, counts))
+        return self.cache.get_or_set(("count_by_type",), load)
     
     def get_by_id(self, member_id: str):
         """Get single member"""
         return self.collection.find_one({"_id": ObjectId(member_id)})
     
     def get_by_department(self):
-        """Get core members grouped by department"""
-        pipeline = [
-            {"$match": {"memberType": "core"}},
-            {"$group": {
-                "_id": "$department",
-                "members": {"$push": "$$ROOT"}
-            }},
-            {"$sort": {"_id": 1}}
-        ]
-        return list(self.collection.aggregate(pipeline))
+        """Get core members grouped by department, oldest first (cached, shared with get_directory)"""
+        return self.get_directory()["departments"]
@@ -0,0 +1,48 @@
+import base64
+from bson import json_util
+
+def encode_cursor(doc: dict, sort: list) -> str:
+    """Opaque cursor holding the sort-key values of the last document on a page"""
+    values = [doc.get(field) for field, _ in sort]
+    return base64.urlsafe_b64encode(json_util.dumps(values).encode()).decode().rstrip('=')
+
+def decode_cursor(token: str, sort: list) -> list:
+    """Decode a cursor from encode_cursor, raising ValueError if it is malformed"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        values = json_util.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {e}")
+    if not isinstance(values, list) or len(values) != len(sort):
+        raise ValueError("Invalid cursor: sort key mismatch")
+    return values
+
+def keyset_filter(sort: list, values: list) -> dict:
+    """Filter matching documents strictly after values in the given sort order"""
+    clauses = []
+    for i, (field, direction) in enumerate(sort):
+        clause = {prev_field: values[j] for j, (prev_field, _) in enumerate(sort[:i])}
+        clause[field] = {"$lt" if direction < 0 else "$gt": values[i]}
+        clauses.append(clause)
+    return {"$or": clauses}
+
+def _page_query(query: dict, sort: list, after: str = None) -> dict:
+    if after:
+        return {"$and": [query, keyset_filter(sort, decode_cursor(after, sort))]}
+    return query
+
+def _split_page(docs: list, sort: list, limit: int):
+    # One extra document was fetched to learn whether another page exists
+    next_cursor = encode_cursor(docs[limit - 1], sort) if len(docs) > limit else None
+    return docs[:limit], next_cursor
+
+def fetch_page(collection, query: dict, sort: list, limit: int, after: str = None, projection: dict = None):
+    """Return (docs, next_cursor) for one keyset page; next_cursor is None on the last page"""
+    docs = list(collection.find(_page_query(query, sort, after), projection).sort(sort).limit(limit + 1))
+    return _split_page(docs, sort, limit)
+
+async def fetch_page_async(collection, query: dict, sort: list, limit: int, after: str = None,
+                           projection: dict = None):
+    """fetch_page for an asyncio (Motor) collection"""
+    cursor = collection.find(_page_query(query, sort, after), projection).sort(sort).limit(limit + 1)
+    return _split_page(await cursor.to_list(length=None), sort, limit)
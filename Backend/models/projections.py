@@ -0,0 +1,21 @@
+def resolve_fields(views: dict, allowed: set, required: tuple, view: str = None, fields: str = None):
+    """Resolve a named view or comma-separated field list into a sorted field tuple
+
+    Returns None for full documents. required fields (sort keys, timestamps) are always
+    kept so paging cursors and Last-Modified keep working. Raises ValueError on unknown names.
+    """
+    if fields:
+        requested = {f.strip() for f in fields.split(',') if f.strip()}
+        unknown = requested - allowed
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        return tuple(sorted(requested | set(required)))
+    if view in (None, '', 'full'):
+        return None
+    if view not in views:
+        raise ValueError(f"Unknown view: {view}")
+    return tuple(sorted(set(views[view]) | set(required)))
+
+def to_projection(fields: tuple):
+    """Mongo projection document for a resolved field tuple (None means every field)"""
+    return {field: 1 for field in fields} if fields else None
@@ -0,0 +1,180 @@
+"""
+Materialized read models: the public API's JSON, precomputed on write.
+
+The `read_models` collection holds what the list endpoints serve, already
+ordered and serialized, split into bucket documents so that none nears the
+16 MB document limit and a write only rebuilds the buckets it touched:
+
+- `directory`: members, one bucket per (memberType, department)
+- `events_index`: general events, one bucket per month
+- `codex_index`: CodeX events, one bucket per month
+
+A head document per read model (`_id` is its name) records the content version
+(services/content_sync.py) its buckets are complete for. Member/Event writes
+rebuild the buckets of the documents they changed, then move the head to the
+version they publish; bulk writes and imports rebuild every bucket once. Heads
+and buckets are only replaced by a build at a newer version, so a slow rebuild
+never overwrites a newer one.
+
+The models assemble the buckets into the listings below once per content
+version, and serve them only while the head is at the current version; the
+routes fall back to live queries otherwise. A write that bypasses the models
+therefore never leaves stale JSON behind: the content watcher, the benchmark
+seeder and `python migrate.py rebuild` regenerate everything. Each entry
+carries the newest timestamp of its document so responses keep their
+Last-Modified header.
+"""
+
+from datetime import datetime
+from services.serialization import serialize_doc, DIRECTORY_TYPES
+
+READ_MODELS = 'read_models'
+DIRECTORY_ID = 'directory'
+EVENTS_INDEX_ID = 'events_index'
+CODEX_INDEX_ID = 'codex_index'
+
+# Serves the head-and-buckets read of one read model, buckets in key order;
+# created by the migration registry (services/migrations.py)
+INDEXES = [
+    [("model", 1), ("key", -1)]
+]
+
+# Timestamps considered for Last-Modified (same as routes.public.last_modified)
+STAMP_FIELDS = ('updatedAt', 'updated_at', 'createdAt', 'created_at')
+
+def doc_stamp(doc):
+    """Newest write timestamp of one document, or None"""
+    stamps = [doc[field] for field in STAMP_FIELDS if hasattr(doc.get(field), 'isoformat')]
+    return max(stamps) if stamps else None
+
+def newest(stamps):
+    stamps = [stamp for stamp in stamps if stamp]
+    return max(stamps) if stamps else None
+
+# --- writers ------------------------------------------------------------------
+
+def _older_than(version: str) -> dict:
+    # Versions are equal-length hex strings, so $lt orders them by time
+    return {"$or": [{"version": {"$exists": False}}, {"version": {"$lt": version}}]}
+
+def store(collection, doc: dict, version: str) -> bool:
+    """Replace doc (a head or bucket) stamped with version, unless a build at a newer version is stored
+
+    Returns True when doc was stored.
+    """
+    from pymongo.errors import DuplicateKeyError
+    try:
+        result = collection.replace_one({"_id": doc["_id"], **_older_than(version)}, {**doc, "version": version},
+                                        upsert=True)
+    except DuplicateKeyError:
+        # The document exists at a newer version
+        return False
+    return bool(result.matched_count or result.upserted_id)
+
+def store_head(collection, model: str, version: str) -> bool:
+    """Mark every bucket of model as current up to content version"""
+    return store(collection, {"_id": model, "model": model}, version)
+
+def entry(doc, item: dict = None) -> dict:
+    """A listed document: its JSON (serialize_doc by default) and Last-Modified timestamp"""
+    return {"item": serialize_doc(doc) if item is None else item, "stamp": doc_stamp(doc)}
+
+def store_bucket(collection, model: str, key: str, entries: list, version: str):
+    """Store the bucket of model under key (entries in listing order), removing it when entries is empty"""
+    bucket_id = f"{model}:{key}"
+    if entries:
+        store(collection, {"_id": bucket_id, "model": model, "key": key, "entries": entries}, version)
+    else:
+        collection.delete_one({"_id": bucket_id, **_older_than(version)})
+
+def store_buckets(collection, model: str, buckets, version: str):
+    """Replace every bucket of model with buckets ((key, entries) pairs), dropping keys no longer present"""
+    kept = [model]
+    for key, entries in buckets:
+        store_bucket(collection, model, key, entries, version)
+        kept.append(f"{model}:{key}")
+    collection.delete_many({"model": model, "_id": {"$nin": kept}, **_older_than(version)})
+
+# --- readers ------------------------------------------------------------------
+
+def find_read_model(model: str) -> tuple:
+    """(filter, sort) of the head and buckets of model, for find() on READ_MODELS"""
+    return {"model": model}, [("key", -1)]
+
+def _listing(entries: list) -> dict:
+    return {"items": [e["item"] for e in entries], "modified": newest(e["stamp"] for e in entries)}
+
+def _listing_order(entry_: dict):
+    # createdAt, _id descending (SORT of models/member.py); members without createdAt last, as in MongoDB
+    item = entry_["item"]
+    return item.get("createdAt") is not None, item.get("createdAt") or datetime.min, item["_id"]
+
+def _role_priority(entry_: dict):
+    # Entries stored before migration 7 have no "priority" but still carry rolePriority in their JSON
+    priority = entry_.get("priority", entry_["item"].get("rolePriority"))
+    return priority is not None, priority or 0
+
+def _directory(buckets: list) -> dict:
+    """Directory listings: every member, per memberType, and core members by department"""
+    entries = sorted((e for bucket in buckets for e in bucket["entries"]), key=_listing_order, reverse=True)
+    by_type, groups = {}, {}
+    for e in entries:
+        by_type.setdefault(e["item"].get("memberType"), []).append(e)
+    # Departments list core members oldest first: listing order reversed
+    for e in reversed(by_type.get("core", [])):
+        groups.setdefault(e["item"].get("department"), []).append(e)
+    # A stable sort on each entry's rolePriority ("priority", or that of its role for members without
+    # one, see models/member.py in_role_order) keeps listing order for ties, i.e. the live TYPE_SORT
+    for type_entries in by_type.values():
+        type_entries.sort(key=_role_priority)
+    departments = [{"department": department, "members": [e["item"] for e in groups[department]]}
+                   for department in sorted(groups, key=lambda d: (d is not None, d or ''))]
+    directory_entries = [e for key in DIRECTORY_TYPES for e in by_type.get(key, [])]
+    core_entries = [e for department_entries in groups.values() for e in department_entries]
+    return {
+        "all": _listing(entries),
+        "by_type": {str(member_type): _listing(type_entries) for member_type, type_entries in by_type.items()},
+        "departments": {"items": departments, "modified": newest(e["stamp"] for e in core_entries)},
+        "directory_modified": newest(e["stamp"] for e in directory_entries + core_entries)
+    }
+
+def _events_index(buckets: list) -> dict:
+    """Events newest first: month buckets in key order, each already in listing order"""
+    entries = [e for bucket in buckets for e in bucket["entries"]]
+    return {"items": [e["item"] for e in entries], "stamps": [e["stamp"] for e in entries]}
+
+def _codex_index(buckets: list) -> dict:
+    """_events_index plus a month -> position map"""
+    index = _events_index(buckets)
+    by_month = {}
+    for position, item in enumerate(index["items"]):
+        by_month.setdefault(item["month"], position)
+    return {**index, "by_month": by_month}
+
+ASSEMBLERS = {DIRECTORY_ID: _directory, EVENTS_INDEX_ID: _events_index, CODEX_INDEX_ID: _codex_index}
+
+def assemble(model: str, docs: list):
+    """Listings of model from its head and buckets (find_read_model order), or None without a head
+
+    The result carries the head's "version"; routes read:
+    - directory: "all", "by_type" ({"items", "modified"} each), "departments", "directory_modified"
+    - events_index: "items" and "stamps"; codex_index also "by_month"
+    """
+    head = next((doc for doc in docs if doc["_id"] == model), None)
+    if head is None:
+        return None
+    buckets = [doc for doc in docs if doc["_id"] != model]
+    return {**ASSEMBLERS[model](buckets), "version": head["version"]}
+
+def directory_payload(directory: dict) -> dict:
+    """/members/directory JSON from the directory read model"""
+    by_type = directory["by_type"]
+    return {
+        "members": {key: by_type[key]["items"] if key in by_type else [] for key in DIRECTORY_TYPES},
+        "departments": directory["departments"]["items"]
+    }
+
+def members_listing(directory: dict, member_type: str = None):
+    """(items, modified) of /members, optionally for one memberType"""
+    listing = directory["by_type"].get(member_type) if member_type else directory["all"]
+    return (listing["items"], listing["modified"]) if listing else ([], None)
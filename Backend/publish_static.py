@@ -0,0 +1,28 @@
+"""
+Render every public API endpoint to content-hashed static JSON files plus manifest.json
+Run:
+    python publish_static.py            # into STATIC_EXPORT_DIR (default ./static_api)
+    python publish_static.py out/dir
+Upload the directory to a CDN/static host: files under api/ never change and can be cached
+forever; manifest.json maps each /api path to its current file and should be revalidated.
+"""
+
+import sys
+# The app built at import time in app.py; endpoints are rendered through its test client
+from app import app
+
+def main():
+    if not hasattr(app, 'static_publisher'):
+        print("[ERROR] Database unavailable, nothing published")
+        sys.exit(1)
+    if len(sys.argv) > 2:
+        print(__doc__)
+        sys.exit(1)
+    if len(sys.argv) == 2:
+        app.static_publisher.out_dir = sys.argv[1]
+    result = app.static_publisher.publish()
+    print(f"[OK] {result['files']} endpoints exported to {app.static_publisher.out_dir} "
+          f"({result['written']} new files, {result['removed']} removed)")
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,24 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash, current_app
+import io
+from flask import (Blueprint, Response, render_template, request, redirect, url_for, flash, current_app,
+                   abort, stream_with_context)
 from services.auth_service import AuthService, admin_required
+from services.transfer import FORMATS, format_for, import_records, export_records, export_cursor
+from services.executor import query_executor
 from datetime import datetime
 
 admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
 
+# Import/export kind -> app model attribute
+TRANSFER_MODELS = {'members': 'member_model', 'events': 'event_model'}
+
+@admin_bp.after_request
+def publish_after_write(response):
+    """Re-export the static API in the background after a successful admin change (PUBLISH_ON_WRITE)"""
+    if (request.method == 'POST' and response.status_code < 400 and request.endpoint != 'admin.login'
+            and current_app.config['PUBLISH_ON_WRITE'] and hasattr(current_app, 'static_publisher')):
+        current_app.static_publisher.schedule()
+    return response
+
 @admin_bp.route('/login', methods=['GET', 'POST'])
 def login():
     if request.method == 'POST':
@@ -24,7 +39,16 @@ def logout():
 @admin_bp.route('/')
 @admin_required
 def dashboard():
-    return render_template('admin/dashboard.html')
+    member_model = current_app.member_model
+    event_model = current_app.event_model
+    # Independent reads, issued concurrently
+    member_counts, event_counts, (recent_events, _) = query_executor.gather(
+        member_model.count_by_type,
+        event_model.count_by_type,
+        lambda: event_model.get_page(5, fields=event_model.fields_for('summary'))
+    )
+    return render_template('admin/dashboard.html', member_counts=member_counts,
+                           event_counts=event_counts, recent_events=recent_events)
 
 # MEMBERS MANAGEMENT
 @admin_bp.route('/members')
@@ -109,6 +133,59 @@ def events():
     all_events = event_model.get_all()
     return render_template('admin/events.html', events=all_events)
 
+def _parse_event_media(event_type: str):
+    """Photos, winners and codex categories from the event form, plus a (label, url, category)
+    check for every image URL in them"""
+    validation_type = 'codex' if event_type == 'codex' else 'events'
+    checks = []
+    
+    # Handle event photos for all events
+    event_photos = []
+    photo_count = int(request.form.get('photo_count', 0))
+    for i in range(photo_count):
+        photo_url = request.form.get(f'event_photo_{i}')
+        if photo_url:
+            checks.append(('event photo', photo_url, validation_type))
+            event_photos.append(photo_url)
+    
+    # Handle winners for all events
+    winners = []
+    winner_count = int(request.form.get('winner_count', 0))
+    for i in range(winner_count):
+        winner_name = request.form.get(f'winner_{i}_name')
+        winner_photo = request.form.get(f'winner_{i}_photo')
+        winner_position = request.form.get(f'winner_{i}_position', f'{i+1}')
+        if winner_name and winner_photo:
+            checks.append(('winner photo', winner_photo, validation_type))
+            winners.append({'name': winner_name, 'photo_url': winner_photo, 'position': winner_position})
+    
+    codex_categories = None
+    if event_type == 'codex':
+        codex_categories = []
+        for i in range(3):  # 3 categories
+            category_name = request.form.get(f'category_{i}_name')
+            if category_name:
+                cat_winners = []
+                for j in range(3):  # 3 winners per category
+                    winner_name = request.form.get(f'category_{i}_winner_{j}_name')
+                    winner_photo = request.form.get(f'category_{i}_winner_{j}_photo')
+                    if winner_name and winner_photo:
+                        checks.append((f'{category_name} winner photo', winner_photo, 'codex'))
+                        cat_winners.append({'name': winner_name, 'photo_url': winner_photo, 'rank': j+1})
+                codex_categories.append({'category_name': category_name, 'winners': cat_winners})
+    
+    return event_photos, winners, codex_categories, checks
+
+def _images_valid(checks) -> bool:
+    """Validate every image URL in one pass and flash each failure, not just the first"""
+    results = current_app.image_validator.validate_many((url, category) for _, url, category in checks)
+    valid = True
+    for (label, url, _), (is_valid, msg) in zip(checks, results):
+        if not is_valid:
+            flash(f'Invalid {label} URL: {msg}', 'error')
+            valid = False
+    return valid
+
 @admin_bp.route('/events/add', methods=['GET', 'POST'])
 @admin_required
 def add_event():
@@ -119,59 +196,12 @@ def add_event():
         event_type = request.form.get('event_type', 'general')
         cover_image = request.form.get('cover_image')
         
-        validator = current_app.image_validator
         validation_type = 'codex' if event_type == 'codex' else 'events'
-        is_valid, msg = validator.validate_url(cover_image, validation_type)
-        if not is_valid:
-            flash(f'Invalid cover image URL: {msg}', 'error')
+        event_photos, winners, codex_categories, checks = _parse_event_media(event_type)
+        if not _images_valid([('cover image', cover_image, validation_type)] + checks):
             return render_template('admin/event_form.html')
         
         date = datetime.fromisoformat(date_str)
-        codex_categories = None
-        event_photos = []
-        winners = []
-        
-        # Handle event photos for all events
-        photo_count = int(request.form.get('photo_count', 0))
-        for i in range(photo_count):
-            photo_url = request.form.get(f'event_photo_{i}')
-            if photo_url:
-                is_valid, msg = validator.validate_url(photo_url, validation_type)
-                if not is_valid:
-                    flash(f'Invalid event photo URL: {msg}', 'error')
-                    return render_template('admin/event_form.html')
-                event_photos.append(photo_url)
-        
-        # Handle winners for all events
-        winner_count = int(request.form.get('winner_count', 0))
-        for i in range(winner_count):
-            winner_name = request.form.get(f'winner_{i}_name')
-            winner_photo = request.form.get(f'winner_{i}_photo')
-            winner_position = request.form.get(f'winner_{i}_position', f'{i+1}')
-            if winner_name and winner_photo:
-                is_valid, msg = validator.validate_url(winner_photo, validation_type)
-                if not is_valid:
-                    flash(f'Invalid winner photo URL: {msg}', 'error')
-                    return render_template('admin/event_form.html')
-                winners.append({'name': winner_name, 'photo_url': winner_photo, 'position': winner_position})
-        
-        if event_type == 'codex':
-            codex_categories = []
-            for i in range(3):  # 3 categories
-                category_name = request.form.get(f'category_{i}_name')
-                if category_name:
-                    cat_winners = []
-                    for j in range(3):  # 3 winners per category
-                        winner_name = request.form.get(f'category_{i}_winner_{j}_name')
-                        winner_photo = request.form.get(f'category_{i}_winner_{j}_photo')
-                        if winner_name and winner_photo:
-                            is_valid, msg = validator.validate_url(winner_photo, 'codex')
-                            if not is_valid:
-                                flash(f'Invalid winner photo URL: {msg}', 'error')
-                                return render_template('admin/event_form.html')
-                            cat_winners.append({'name': winner_name, 'photo_url': winner_photo, 'rank': j+1})
-                    codex_categories.append({'category_name': category_name, 'winners': cat_winners})
-        
         event_model = current_app.event_model
         event_model.create(title, description, date, event_type, cover_image, None, codex_categories, event_photos, winners)
         flash('Event added successfully', 'success')
@@ -193,61 +223,18 @@ def edit_event(event_id):
             'event_type': request.form.get('event_type', 'general')
         }
         
+        validation_type = 'codex' if updates['event_type'] == 'codex' else 'events'
+        event_photos, winners, codex_categories, checks = _parse_event_media(updates['event_type'])
         cover_image = request.form.get('cover_image')
-        validator = current_app.image_validator
         if cover_image != event['cover_image']:
-            validation_type = 'codex' if updates['event_type'] == 'codex' else 'events'
-            is_valid, msg = validator.validate_url(cover_image, validation_type)
-            if not is_valid:
-                flash(f'Invalid cover image URL: {msg}', 'error')
-                return render_template('admin/event_form.html', event=event, edit=True)
+            checks.insert(0, ('cover image', cover_image, validation_type))
             updates['cover_image'] = cover_image
+        if not _images_valid(checks):
+            return render_template('admin/event_form.html', event=event, edit=True)
         
-        # Handle event photos for all events
-        validation_type = 'codex' if updates['event_type'] == 'codex' else 'events'
-        event_photos = []
-        photo_count = int(request.form.get('photo_count', 0))
-        for i in range(photo_count):
-            photo_url = request.form.get(f'event_photo_{i}')
-            if photo_url:
-                is_valid, msg = validator.validate_url(photo_url, validation_type)
-                if not is_valid:
-                    flash(f'Invalid event photo URL: {msg}', 'error')
-                    return render_template('admin/event_form.html', event=event, edit=True)
-                event_photos.append(photo_url)
         updates['event_photos'] = event_photos
-        
-        # Handle winners for all events
-        winners = []
-        winner_count = int(request.form.get('winner_count', 0))
-        for i in range(winner_count):
-            winner_name = request.form.get(f'winner_{i}_name')
-            winner_photo = request.form.get(f'winner_{i}_photo')
-            winner_position = request.form.get(f'winner_{i}_position', f'{i+1}')
-            if winner_name and winner_photo:
-                is_valid, msg = validator.validate_url(winner_photo, validation_type)
-                if not is_valid:
-                    flash(f'Invalid winner photo URL: {msg}', 'error')
-                    return render_template('admin/event_form.html', event=event, edit=True)
-                winners.append({'name': winner_name, 'photo_url': winner_photo, 'position': winner_position})
         updates['winners'] = winners
-        
-        if updates['event_type'] == 'codex':
-            codex_categories = []
-            for i in range(3):
-                category_name = request.form.get(f'category_{i}_name')
-                if category_name:
-                    cat_winners = []
-                    for j in range(3):
-                        winner_name = request.form.get(f'category_{i}_winner_{j}_name')
-                        winner_photo = request.form.get(f'category_{i}_winner_{j}_photo')
-                        if winner_name and winner_photo:
-                            is_valid, msg = validator.validate_url(winner_photo, 'codex')
-                            if not is_valid:
-                                flash(f'Invalid winner photo URL: {msg}', 'error')
-                                return render_template('admin/event_form.html', event=event, edit=True)
-                            cat_winners.append({'name': winner_name, 'photo_url': winner_photo, 'rank': j+1})
-                    codex_categories.append({'category_name': category_name, 'winners': cat_winners})
+        if codex_categories is not None:
             updates['codex_categories'] = codex_categories
         
         event_model.update(event_id, **updates)
@@ -293,3 +280,37 @@ def delete_event(event_id):
     event_model.delete(event_id)
     flash('Event deleted successfully', 'success')
     return redirect(url_for('admin.events'))
+
+# BULK IMPORT / EXPORT
+@admin_bp.route('/export/<kind>.<fmt>')
+@admin_required
+def export_data(kind, fmt):
+    if kind not in TRANSFER_MODELS or fmt not in FORMATS:
+        abort(404)
+    model = getattr(current_app, TRANSFER_MODELS[kind])
+    filename = f"{kind}-{datetime.utcnow():%Y%m%d}.{fmt}"
+    return Response(
+        stream_with_context(export_records(export_cursor(model), kind, fmt)),
+        mimetype='text/csv' if fmt == 'csv' else 'application/x-ndjson',
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
+
+@admin_bp.route('/import/<kind>', methods=['POST'])
+@admin_required
+def import_data(kind):
+    if kind not in TRANSFER_MODELS:
+        abort(404)
+    upload = request.files.get('file')
+    if not upload or not upload.filename:
+        flash('Choose a JSONL or CSV file to import', 'error')
+        return redirect(url_for('admin.dashboard'))
+    
+    # The upload is spooled to disk by Werkzeug and read back one line at a time
+    stream = io.TextIOWrapper(upload.stream, encoding='utf-8-sig', newline='')
+    summary = import_records(getattr(current_app, TRANSFER_MODELS[kind]), kind, stream,
+                             format_for(upload.filename), current_app.image_validator)
+    flash(f"Imported {kind}: {summary['inserted']} added, {summary['updated']} updated, "
+          f"{summary['skipped']} skipped", 'error' if summary['skipped'] else 'success')
+    for error in summary['errors'][:10]:
+        flash(f"Line {error['line']}: {error['error']}", 'error')
+    return redirect(url_for('admin.dashboard'))
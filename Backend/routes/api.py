@@ -1,97 +1,69 @@
-from flask import Blueprint, jsonify, current_app, request
-from bson import ObjectId
+from flask import Blueprint, Response, jsonify, current_app, request, stream_with_context
+from services.snapshots import etag_for, not_modified, negotiate_encoding, ENCODING_SUFFIXES
+from services.metrics import metrics
+from services.serialization import serialize_doc
+from routes.public import ROUTES, Stream, Reply, run
 
 api_bp = Blueprint('api', __name__, url_prefix='/api')
 
-def serialize_doc(doc):
-    """Convert MongoDB document to JSON-serializable dict"""
-    if doc is None:
-        return None
-    doc['_id'] = str(doc['_id'])
-    if 'date' in doc:
-        doc['date'] = doc['date'].isoformat()
-    if 'created_at' in doc:
-        doc['created_at'] = doc['created_at'].isoformat()
-    if 'updated_at' in doc:
-        doc['updated_at'] = doc['updated_at'].isoformat()
-    return doc
+@metrics.timed('serialize')
+def encode_json(data) -> bytes:
+    """Encode data exactly as jsonify would"""
+    return current_app.json.response(data).get_data()
 
-@api_bp.route('/members', methods=['GET'])
-def get_members():
-    """Get all members, optionally filtered by memberType or department"""
-    member_model = current_app.member_model
-    member_type = request.args.get('memberType')
-    department = request.args.get('department')
-    members = member_model.get_all(member_type=member_type, department=department)
-    
-    # Sort super-core by role priority
-    if member_type == 'super-core':
-        role_order = {
-            'Chairperson': 1,
-            'Vice Chairperson': 2,
-            'Secretary': 3,
-            'Joint Secretary': 4,
-            'Finance Head': 5,
-            'Tech Head': 6
-        }
-        members.sort(key=lambda m: role_order.get(m.get('role', ''), 99))
-    
-    return jsonify([serialize_doc(m) for m in members])
+def content_version():
+    """Combined content version of every model the public API reads"""
+    return (current_app.member_model.current_version(), current_app.event_model.current_version())
 
-@api_bp.route('/members/by-department', methods=['GET'])
-def get_members_by_department():
-    """Get core members grouped by department"""
-    member_model = current_app.member_model
-    grouped = member_model.get_by_department()
-    result = []
-    for group in grouped:
-        result.append({
-            "department": group["_id"],
-            "members": [serialize_doc(m) for m in group["members"]]
-        })
-    return jsonify(result)
+def snapshot_response(key, build):
+    """Serve the pre-serialized snapshot for key, building it once per content version
 
-@api_bp.route('/events', methods=['GET'])
-def get_events():
-    """Get all general events"""
-    event_model = current_app.event_model
-    events = event_model.get_all(event_type='general')
-    return jsonify([serialize_doc(e) for e in events])
+    build() returns (data, status, last_modified) and only runs on a snapshot miss.
+    A matching If-None-Match is answered with 304 before any query runs.
+    """
+    version = content_version()
+    encoding = negotiate_encoding(request.accept_encodings)
+    etag = etag_for(key, version)
+    for candidate in (etag + ENCODING_SUFFIXES[encoding], etag) if encoding else (etag,):
+        if candidate in request.if_none_match:
+            return not_modified(candidate)
+    snapshot = current_app.snapshots.get_or_build(key, version, build, encode_json)
+    response = snapshot.to_response(encoding, current_app.config['COMPRESSION_MIN_SIZE'],
+                                    current_app.config['COMPRESSION_LEVELS'])
+    if snapshot.status == 200:
+        response.make_conditional(request)
+    return response
 
-@api_bp.route('/events/<event_id>', methods=['GET'])
-def get_event(event_id):
-    """Get single event with full details"""
-    event_model = current_app.event_model
-    event = event_model.get_by_id(event_id)
-    if not event:
-        return jsonify({"error": "Event not found"}), 404
-    return jsonify(serialize_doc(event))
+def stream_json(docs, transform=serialize_doc) -> Response:
+    """Stream a JSON array, encoding each document as the Mongo cursor yields it"""
+    dumps = current_app.json.dumps
 
-@api_bp.route('/codex/latest', methods=['GET'])
-def get_latest_codex():
-    """Get most recent CodeX event"""
-    event_model = current_app.event_model
-    events = event_model.get_all(event_type='codex')
-    if not events:
-        return jsonify({"error": "No CodeX events found"}), 404
-    return jsonify(serialize_doc(events[0]))
+    def generate():
+        yield '['
+        for i, doc in enumerate(docs):
+            yield (',' if i else '') + dumps(transform(doc), separators=(',', ':'))
+        yield ']\n'
 
-@api_bp.route('/codex/<month>', methods=['GET'])
-def get_codex_by_month(month):
-    """Get CodeX event for specific month"""
-    event_model = current_app.event_model
-    events = event_model.get_all(event_type='codex')
-    for event in events:
-        event_month = event['date'].strftime('%Y-%m') if hasattr(event['date'], 'strftime') else event['date'][:7]
-        if event_month == month or event['title'].lower().endswith(month.lower()):
-            return jsonify(serialize_doc(event))
-    return jsonify({"error": "CodeX event not found"}), 404
+    return Response(stream_with_context(generate()), mimetype='application/json')
 
-@api_bp.route('/codex/all', methods=['GET'])
-def get_all_codex():
-    """Get all CodeX events"""
-    event_model = current_app.event_model
-    events = event_model.get_all(event_type='codex')
-    for event in events:
-        event['month'] = event['date'].strftime('%Y-%m') if hasattr(event['date'], 'strftime') else event['date'][:7]
-    return jsonify([serialize_doc(e) for e in events])
+@api_bp.errorhandler(ValueError)
+def invalid_argument(error):
+    return jsonify({"error": str(error)}), 400
+
+def respond(answer):
+    """Flask response for what a routes.public endpoint returned"""
+    if isinstance(answer, Stream):
+        return stream_json(answer.docs, answer.transform)
+    if isinstance(answer, Reply):
+        return jsonify(answer.data), answer.status
+    return snapshot_response(answer.key, lambda: run(answer.build()))
+
+def view(endpoint):
+    def handle(**path_args):
+        return respond(endpoint(current_app, request.args, **path_args))
+    handle.__name__, handle.__doc__ = endpoint.__name__, endpoint.__doc__
+    return handle
+
+# The endpoints live in routes/public.py, shared with the ASGI tier
+for path, endpoint in ROUTES:
+    api_bp.add_url_rule(path, endpoint.__name__, view(endpoint), methods=['GET'])
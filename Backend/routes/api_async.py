@@ -0,0 +1,214 @@
+"""
+ASGI (asyncio) serving mode for the public /api routes.
+
+Serves the endpoints of routes/public.py, like the Flask blueprint in
+routes/api.py, with the same JSON bytes, ETags and compression, but every
+MongoDB read is awaited on a Motor client, so one worker keeps many slow
+queries in flight instead of holding a thread per request. Run with `uvicorn asgi:app`; the admin/seed apps stay on
+the WSGI server.
+"""
+
+import re
+from io import BytesIO
+from flask import Flask
+from werkzeug.wrappers import Request, Response
+from routes.public import ROUTES as PUBLIC_ROUTES, Stream, Reply, arun
+from services.serialization import serialize_doc
+from services.snapshots import SnapshotStore, etag_for, not_modified, negotiate_encoding, ENCODING_SUFFIXES
+from services.cache import QueryCache
+from services.content_sync import content_watcher
+
+# (compiled path pattern, endpoint) of the routes.public endpoints, matched in order
+ROUTES = [(re.compile('^/api' + re.sub(r'<(\w+)>', r'(?P<\1>[^/]+)', path) + '$'), endpoint)
+          for path, endpoint in PUBLIC_ROUTES]
+
+class AsyncAPI:
+    """ASGI application serving the public API from async models"""
+
+    def __init__(self, config, member_model, event_model, snapshots: SnapshotStore, connection=None,
+                 watcher_db=None):
+        self.config = config
+        self.member_model = member_model
+        self.event_model = event_model
+        self.snapshots = snapshots
+        # AsyncMongoConnection owned by this app, closed on lifespan shutdown
+        self.connection = connection
+        # pymongo database the content watcher follows (None when CONTENT_SYNC is off)
+        self.watcher_db = watcher_db
+        # Flask's JSON provider, so bodies are byte-identical to the WSGI tier's jsonify
+        # (the provider only holds a weak reference, so the app is kept too)
+        self.json_app = Flask(__name__)
+        self.json = self.json_app.json
+
+    # --- ASGI -----------------------------------------------------------------
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+        elif scope['type'] == 'http':
+            request = Request(self.environ(scope))
+            response = await self.dispatch(request)
+            await self.send_response(request, response, send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                if self.watcher_db is not None:
+                    content_watcher.start(self.watcher_db)
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                content_watcher.stop()
+                if self.connection is not None:
+                    self.connection.close()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    @staticmethod
+    def environ(scope) -> dict:
+        """WSGI environ for an ASGI http scope (GET-only API, so no body)"""
+        server = scope.get('server') or ('localhost', 80)
+        environ = {
+            'REQUEST_METHOD': scope['method'],
+            'SCRIPT_NAME': scope.get('root_path', ''),
+            'PATH_INFO': scope['path'],
+            'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+            'SERVER_NAME': server[0],
+            'SERVER_PORT': str(server[1]),
+            'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+            'wsgi.url_scheme': scope.get('scheme', 'http'),
+            'wsgi.input': BytesIO(),
+        }
+        for name, value in scope.get('headers', []):
+            key = name.decode('latin-1').upper().replace('-', '_')
+            value = value.decode('latin-1')
+            if key not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+                key = 'HTTP_' + key
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+        return environ
+
+    async def send_response(self, request, response, send):
+        headers = [(k.lower().encode('latin-1'), v.encode('latin-1')) for k, v in response.headers.items()]
+        await send({'type': 'http.response.start', 'status': response.status_code, 'headers': headers})
+        body = response.response
+        if request.method == 'HEAD':
+            await send({'type': 'http.response.body', 'body': b''})
+        elif hasattr(body, '__aiter__'):
+            async for chunk in body:
+                await send({'type': 'http.response.body', 'body': chunk.encode(), 'more_body': True})
+            await send({'type': 'http.response.body', 'body': b''})
+        else:
+            await send({'type': 'http.response.body', 'body': response.get_data()})
+
+    # --- dispatch -------------------------------------------------------------
+
+    async def dispatch(self, request) -> Response:
+        if request.path == '/health':
+            return self.json_response({"status": "ok"})
+        for pattern, endpoint in ROUTES:
+            match = pattern.match(request.path)
+            if match:
+                break
+        else:
+            return self.json_response({"error": "Not found"}, 404)
+        if request.method == 'OPTIONS':
+            return self.cors(request, Response(status=200), preflight=True)
+        if request.method not in ('GET', 'HEAD'):
+            return self.json_response({"error": "Method not allowed"}, 405)
+        try:
+            response = await self.respond(request, endpoint(self, request.args, **match.groupdict()))
+        except ValueError as e:
+            response = self.json_response({"error": str(e)}, 400)
+        return self.cors(request, response)
+
+    async def respond(self, request, answer) -> Response:
+        """Response for what a routes.public endpoint returned"""
+        if isinstance(answer, Stream):
+            return self.stream_json(answer.docs, answer.transform)
+        if isinstance(answer, Reply):
+            return self.json_response(answer.data, answer.status)
+        return await self.snapshot_response(request, answer.key, lambda: arun(answer.build()))
+
+    def cors(self, request, response, preflight: bool = False) -> Response:
+        """Allow the configured frontend origins, as flask-cors does for the WSGI tier"""
+        origin = request.headers.get('Origin')
+        if origin and origin in self.config['CORS_ORIGINS']:
+            response.headers['Access-Control-Allow-Origin'] = origin
+            response.headers['Access-Control-Allow-Credentials'] = 'true'
+            response.vary.add('Origin')
+            if preflight:
+                response.headers['Access-Control-Allow-Methods'] = 'GET, HEAD, OPTIONS'
+                response.headers['Access-Control-Allow-Headers'] = 'Content-Type'
+        return response
+
+    # --- helpers ---------------------------------------------------------------
+
+    def encode_json(self, data) -> bytes:
+        return self.json.response(data).get_data()
+
+    def json_response(self, data, status: int = 200) -> Response:
+        return Response(self.encode_json(data), status=status, mimetype='application/json')
+
+    async def content_version(self):
+        return (await self.member_model.current_version(), await self.event_model.current_version())
+
+    async def snapshot_response(self, request, key, build) -> Response:
+        """routes.api.snapshot_response with an async build()"""
+        version = await self.content_version()
+        encoding = negotiate_encoding(request.accept_encodings)
+        etag = etag_for(key, version)
+        for candidate in (etag + ENCODING_SUFFIXES[encoding], etag) if encoding else (etag,):
+            if candidate in request.if_none_match:
+                return not_modified(candidate)
+        snapshot = await self.snapshots.aget_or_build(key, version, build, self.encode_json)
+        response = snapshot.to_response(encoding, self.config['COMPRESSION_MIN_SIZE'],
+                                        self.config['COMPRESSION_LEVELS'])
+        if snapshot.status == 200:
+            response.make_conditional(request)
+        return response
+
+    def stream_json(self, docs, transform=serialize_doc) -> Response:
+        """Stream a JSON array, encoding each document as the Motor cursor yields it"""
+        dumps = self.json.dumps
+
+        async def generate():
+            yield '['
+            first = True
+            async for doc in docs:
+                yield ('' if first else ',') + dumps(transform(doc), separators=(',', ':'))
+                first = False
+            yield ']\n'
+
+        response = Response(mimetype='application/json')
+        response.response = generate()
+        return response
+
+def create_async_app(config, db=None, sync_db=None) -> AsyncAPI:
+    """Build the ASGI app from a config mapping; db defaults to a lazy Motor connection
+
+    sync_db (default: the shared pymongo connection) is what the content
+    watcher follows for admin writes made in the WSGI processes.
+    """
+    from services.async_db import AsyncMongoConnection
+    from models.async_reads import AsyncMember, AsyncEvent
+    from services import migrations
+    connection = None
+    if db is None:
+        db = connection = AsyncMongoConnection.from_config(config)
+    cache_ttl = config['CACHE_TTL_SECONDS']
+    cache_size = config['CACHE_MAX_ENTRIES']
+    member_model = AsyncMember(db, QueryCache(cache_size, cache_ttl), config['MEMBER_ROLE_PRIORITY'])
+    event_model = AsyncEvent(db, QueryCache(cache_size, cache_ttl))
+    content_watcher.configure(config)
+    if content_watcher.enabled:
+        content_watcher.register('members', member_model)
+        content_watcher.register('events', event_model)
+        content_watcher.set_rebuild(migrations.rebuild_read_models)
+        if sync_db is None:
+            from services.db import get_connection
+            sync_db = get_connection(config)
+    else:
+        # The models re-read the shared content version instead
+        sync_db = None
+    snapshots = SnapshotStore(config['SNAPSHOT_MAX_ENTRIES'])
+    return AsyncAPI(config, member_model, event_model, snapshots, connection, sync_db)
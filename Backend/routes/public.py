@@ -0,0 +1,310 @@
+"""
+The public /api endpoints, shared by the Flask blueprint (routes/api.py) and
+the ASGI tier (routes/api_async.py).
+
+Each endpoint takes the app (anything with member_model, event_model and
+config), the query arguments and its path arguments, and returns what to
+answer with:
+
+- `Cached(key, build)`: the snapshot for key; build() is a generator that
+  yields model reads and returns (data, status, last_modified)
+- `Stream(docs, transform)`: a JSON array streamed from a model cursor
+- `Reply(data, status)`: a JSON body sent as is
+
+A yielded read is a zero-argument callable, or a tuple of them to run
+concurrently; `run` calls them on the sync models and `arun` awaits them on
+the async ones, so both tiers share the keys, argument parsing and fallbacks
+below and only differ in how a query is issued.
+"""
+
+import asyncio
+from datetime import datetime
+from bson import ObjectId
+from services.executor import query_executor
+from services.serialization import serialize_doc, serialize_directory, directory_members
+from models.read_models import EVENTS_INDEX_ID, CODEX_INDEX_ID, newest, directory_payload, members_listing
+from models.event import MONTH_KEY_RE
+
+class Cached:
+    def __init__(self, key: tuple, build):
+        self.key = key
+        self.build = build
+
+class Stream:
+    def __init__(self, docs, transform=serialize_doc):
+        self.docs = docs
+        self.transform = transform
+
+class Reply:
+    def __init__(self, data, status: int = 200):
+        self.data = data
+        self.status = status
+
+def run(steps):
+    """Result of a build() generator, calling the sync reads it yields"""
+    result = None
+    try:
+        while True:
+            reads = steps.send(result)
+            result = query_executor.gather(*reads) if isinstance(reads, tuple) else reads()
+    except StopIteration as done:
+        return done.value
+
+async def arun(steps):
+    """Result of a build() generator, awaiting the async reads it yields"""
+    result = None
+    try:
+        while True:
+            reads = steps.send(result)
+            if isinstance(reads, tuple):
+                result = await asyncio.gather(*(read() for read in reads))
+            else:
+                result = await reads()
+    except StopIteration as done:
+        return done.value
+
+# --- helpers ------------------------------------------------------------------
+
+def last_modified(docs, model):
+    """Newest write timestamp across docs and the model's own last write"""
+    stamps = [model.modified_at] if model.modified_at else []
+    for doc in docs:
+        for field in ('updatedAt', 'updated_at', 'createdAt', 'created_at'):
+            if isinstance(doc.get(field), datetime):
+                stamps.append(doc[field])
+    return max(stamps) if stamps else None
+
+def read_model_modified(stamp, model):
+    """Last-Modified for read-model data: its stored timestamp or the model's own last write"""
+    return newest([stamp, model.modified_at])
+
+def page_args(args, config):
+    """Parse ?limit=&after= keyset paging args, (None, None) when the client wants the full list"""
+    after = args.get('after')
+    limit = args.get('limit', type=int)
+    if limit is None and after is None:
+        return None, None
+    limit = limit or config['API_DEFAULT_PAGE_SIZE']
+    return min(max(limit, 1), config['API_MAX_PAGE_SIZE']), after
+
+def wants_stream(args) -> bool:
+    """True when the client asked for ?stream=1"""
+    return args.get('stream', '').lower() in ('1', 'true')
+
+def page_body(docs, next_cursor, transform=serialize_doc) -> dict:
+    """Envelope returned when the client paginates with limit/after"""
+    return {"items": [transform(d) for d in docs], "next_cursor": next_cursor}
+
+# --- endpoints ----------------------------------------------------------------
+
+def get_members(app, args):
+    """Get all members, optionally filtered by memberType or department"""
+    member_type = args.get('memberType')
+    department = args.get('department')
+    member_model = app.member_model
+    fields = member_model.fields_for(args.get('view'), args.get('fields'))
+    limit, after = page_args(args, app.config)
+    if wants_stream(args):
+        return Stream(member_model.iter_all(member_type=member_type, department=department, fields=fields))
+
+    def build():
+        if limit:
+            members, next_cursor = yield lambda: member_model.get_page(limit, after, member_type=member_type,
+                                                                       department=department, fields=fields)
+            return page_body(members, next_cursor), 200, last_modified(members, member_model)
+
+        directory = None if department or fields else (yield member_model.get_read_model)
+        if directory:
+            members, modified = members_listing(directory, member_type)
+            return members, 200, read_model_modified(modified, member_model)
+
+        # Filtered by memberType, members already come back in role display order
+        members = yield lambda: member_model.get_all(member_type=member_type, department=department, fields=fields)
+        return [serialize_doc(m) for m in members], 200, last_modified(members, member_model)
+
+    return Cached(('members', member_type, department, limit, after, fields), build)
+
+def get_members_by_department(app, args):
+    """Get core members grouped by department"""
+    member_model = app.member_model
+
+    def build():
+        directory = yield member_model.get_read_model
+        if directory:
+            departments = directory["departments"]
+            return departments["items"], 200, read_model_modified(departments["modified"], member_model)
+
+        grouped = yield member_model.get_by_department
+        result = [{"department": group["_id"], "members": [serialize_doc(m) for m in group["members"]]}
+                  for group in grouped]
+        members = [m for group in grouped for m in group["members"]]
+        return result, 200, last_modified(members, member_model)
+
+    return Cached(('members_by_department',), build)
+
+def get_member_directory(app, args):
+    """Founders, faculty, super-core (role ordered) and core members by department in one payload"""
+    member_model = app.member_model
+
+    def build():
+        directory = yield member_model.get_read_model
+        if directory:
+            return directory_payload(directory), 200, read_model_modified(directory["directory_modified"],
+                                                                          member_model)
+
+        directory = yield member_model.get_directory
+        return serialize_directory(directory), 200, last_modified(directory_members(directory), member_model)
+
+    return Cached(('members_directory',), build)
+
+def get_events(app, args):
+    """Get all general events"""
+    event_model = app.event_model
+    fields = event_model.fields_for(args.get('view'), args.get('fields'))
+    limit, after = page_args(args, app.config)
+    if wants_stream(args):
+        return Stream(event_model.iter_all(event_type='general', fields=fields))
+
+    def build():
+        if limit:
+            events, next_cursor = yield lambda: event_model.get_page(limit, after, event_type='general',
+                                                                     fields=fields)
+            return page_body(events, next_cursor), 200, last_modified(events, event_model)
+        index = None if fields else (yield lambda: event_model.get_read_model(EVENTS_INDEX_ID))
+        if index:
+            return index["items"], 200, read_model_modified(newest(index["stamps"]), event_model)
+        events = yield lambda: event_model.get_all(event_type='general', fields=fields)
+        return [serialize_doc(e) for e in events], 200, last_modified(events, event_model)
+
+    return Cached(('events', limit, after, fields), build)
+
+def get_event(app, args, event_id):
+    """Get single event with full details"""
+    if not ObjectId.is_valid(event_id):
+        return Reply({"error": "Event not found"}, 404)
+    event_model = app.event_model
+
+    def build():
+        event = yield lambda: event_model.get_by_id(event_id)
+        if not event:
+            return {"error": "Event not found"}, 404, None
+        return serialize_doc(event), 200, last_modified([event], event_model)
+
+    return Cached(('event', event_id), build)
+
+def get_latest_codex(app, args):
+    """Get most recent CodeX event"""
+    event_model = app.event_model
+
+    def build():
+        index = yield lambda: event_model.get_read_model(CODEX_INDEX_ID)
+        if index:
+            if not index["items"]:
+                return {"error": "No CodeX events found"}, 404, None
+            return index["items"][0], 200, read_model_modified(index["stamps"][0], event_model)
+
+        events = yield lambda: event_model.get_all(event_type='codex')
+        if not events:
+            return {"error": "No CodeX events found"}, 404, None
+        return serialize_doc(events[0]), 200, last_modified(events[:1], event_model)
+
+    return Cached(('codex_latest',), build)
+
+def get_codex_by_month(app, args, month):
+    """Get CodeX event for specific month"""
+    event_model = app.event_model
+
+    def build():
+        # YYYY-MM keys come from the codex_index; title-word lookups query the events
+        index = (yield lambda: event_model.get_read_model(CODEX_INDEX_ID)) if MONTH_KEY_RE.match(month) else None
+        if index:
+            position = index["by_month"].get(month)
+            if position is None:
+                return {"error": "CodeX event not found"}, 404, None
+            return index["items"][position], 200, read_model_modified(index["stamps"][position], event_model)
+
+        event = yield lambda: event_model.get_codex_by_month(month)
+        if not event:
+            return {"error": "CodeX event not found"}, 404, None
+        return serialize_doc(event), 200, last_modified([event], event_model)
+
+    return Cached(('codex_month', month), build)
+
+def get_all_codex(app, args):
+    """Get all CodeX events"""
+    event_model = app.event_model
+    fields = event_model.fields_for(args.get('view'), args.get('fields'))
+    limit, after = page_args(args, app.config)
+
+    def serialize_codex(event):
+        doc = serialize_doc(event)
+        doc['month'] = event.get('month') or event_model.month_key(event['date'])
+        return doc
+
+    if wants_stream(args):
+        return Stream(event_model.iter_all(event_type='codex', fields=fields), serialize_codex)
+
+    def build():
+        if limit:
+            events, next_cursor = yield lambda: event_model.get_page(limit, after, event_type='codex',
+                                                                     fields=fields)
+            return page_body(events, next_cursor, serialize_codex), 200, last_modified(events, event_model)
+        index = None if fields else (yield lambda: event_model.get_read_model(CODEX_INDEX_ID))
+        if index:
+            return index["items"], 200, read_model_modified(newest(index["stamps"]), event_model)
+        events = yield lambda: event_model.get_all(event_type='codex', fields=fields)
+        return [serialize_codex(e) for e in events], 200, last_modified(events, event_model)
+
+    return Cached(('codex_all', limit, after, fields), build)
+
+def get_bootstrap(app, args):
+    """Everything the landing/team/events pages need in one cacheable payload"""
+    member_model = app.member_model
+    event_model = app.event_model
+    event_limit = app.config['BOOTSTRAP_EVENT_LIMIT']
+
+    def build():
+        # Three indexed reads of the materialized read models (assembled once per content version)
+        directory, events_index, codex_index = yield (
+            member_model.get_read_model,
+            lambda: event_model.get_read_model(EVENTS_INDEX_ID),
+            lambda: event_model.get_read_model(CODEX_INDEX_ID)
+        )
+        if directory and events_index and codex_index:
+            payload = directory_payload(directory)
+            payload["events"] = events_index["items"][:event_limit]
+            payload["latest_codex"] = codex_index["items"][0] if codex_index["items"] else None
+            stamps = [read_model_modified(directory["directory_modified"], member_model),
+                      read_model_modified(newest(events_index["stamps"][:event_limit] + codex_index["stamps"][:1]),
+                                          event_model)]
+            return payload, 200, newest(stamps)
+
+        # Independent reads, issued concurrently
+        directory, (events, _), (latest_codex, _) = yield (
+            member_model.get_directory,
+            lambda: event_model.get_page(event_limit, event_type='general'),
+            lambda: event_model.get_page(1, event_type='codex')
+        )
+
+        payload = serialize_directory(directory)
+        payload["events"] = [serialize_doc(e) for e in events]
+        payload["latest_codex"] = serialize_doc(latest_codex[0]) if latest_codex else None
+        stamps = [stamp for stamp in (last_modified(directory_members(directory), member_model),
+                                      last_modified(events + latest_codex, event_model)) if stamp]
+        return payload, 200, max(stamps) if stamps else None
+
+    return Cached(('bootstrap',), build)
+
+# (path under /api, endpoint), in the order the ASGI tier matches them: fixed
+# paths before <param> ones
+ROUTES = [
+    ('/members', get_members),
+    ('/members/by-department', get_members_by_department),
+    ('/members/directory', get_member_directory),
+    ('/events', get_events),
+    ('/events/<event_id>', get_event),
+    ('/codex/latest', get_latest_codex),
+    ('/codex/all', get_all_codex),
+    ('/codex/<month>', get_codex_by_month),
+    ('/bootstrap', get_bootstrap),
+]
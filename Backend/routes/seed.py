@@ -108,59 +108,34 @@ def seed_database():
         member_model = current_app.member_model
         event_model = current_app.event_model
         
-        # Clear existing data
-        member_model.collection.delete_many({})
-        event_model.collection.delete_many({})
+        # One insert_many per collection into staging, then an atomic rename over the
+        # live collection, so the site never shows a half-seeded team
+        members = [
+            dict(name=founder["name"], image_url=founder["imageUrl"], role=founder["role"], member_type="founder")
+        ]
+        members += [dict(name=m["name"], image_url=m["imageUrl"], role=m["role"], member_type="faculty")
+                    for m in faculty]
+        members += [dict(name=m["name"], image_url=m["imageUrl"], role=m["role"], member_type="super-core")
+                    for m in super_core]
+        for department, department_members in core_team.items():
+            members += [dict(name=m["name"], image_url=m["imageUrl"], role=department, member_type="core",
+                             department=department)
+                        for m in department_members]
+        total_members = member_model.bulk_create(members, replace=True)
         
-        total_members = 0
-        
-        # Insert Founder
-        member_model.create(
-            founder["name"], founder["imageUrl"], founder["role"],
-            "founder", None, None, None, None
-        )
-        total_members += 1
-        
-        # Insert Faculty
-        for member in faculty:
-            member_model.create(
-                member["name"], member["imageUrl"], member["role"], 
-                "faculty", None, None, None, None
-            )
-            total_members += 1
-        
-        # Insert Super Core
-        for member in super_core:
-            member_model.create(
-                member["name"], member["imageUrl"], member["role"],
-                "super-core", None, None, None, None
-            )
-            total_members += 1
-        
-        # Insert Core Team
-        for department, members in core_team.items():
-            for member in members:
-                member_model.create(
-                    member["name"], member["imageUrl"], department,
-                    "core", department, None, None, None
-                )
-                total_members += 1
-        
-        # Insert Events
-        total_events = 0
-        for event in events:
-            event_model.create(
-                event["title"],
-                event["description"],
-                event["date"],
-                event["event_type"],
-                event["cover_image"],
-                None,
-                event.get("codex_categories"),
-                event.get("event_photos", []),
-                event.get("winners", [])
+        total_events = event_model.bulk_create([
+            dict(
+                title=event["title"],
+                description=event["description"],
+                date=event["date"],
+                event_type=event["event_type"],
+                cover_image=event["cover_image"],
+                codex_categories=event.get("codex_categories"),
+                event_photos=event.get("event_photos", []),
+                winners=event.get("winners", [])
             )
-            total_events += 1
+            for event in events
+        ], replace=True)
         
         return jsonify({
             "success": True,
@@ -1,15 +1,13 @@
 from pymongo import MongoClient
 from datetime import datetime
 import os
+from models.event import Event
 
 # Connect to MongoDB
 MONGO_URI = os.getenv('MONGO_URI', 'mongodb://localhost:27017/acses_db')
 client = MongoClient(MONGO_URI)
 db = client['acses_db']
-events_collection = db.events
-
-# Clear existing CodeX events
-events_collection.delete_many({"event_type": "codex"})
+event_model = Event(db)
 
 codex_events = [
     {
@@ -49,8 +47,7 @@ codex_events = [
             "https://acsespicscloud.vercel.app/codex/nov/photo1.jpg",
             "https://acsespicscloud.vercel.app/codex/nov/photo2.jpg",
             "https://acsespicscloud.vercel.app/codex/nov/photo3.jpg"
-        ],
-        "created_at": datetime.utcnow()
+        ]
     },
     {
         "title": "CODEX OCTOBER",
@@ -89,14 +86,13 @@ codex_events = [
             "https://acsespicscloud.vercel.app/codex/oct/photo1.jpg",
             "https://acsespicscloud.vercel.app/codex/oct/photo2.jpg",
             "https://acsespicscloud.vercel.app/codex/oct/photo3.jpg"
-        ],
-        "created_at": datetime.utcnow()
+        ]
     }
 ]
 
-# Insert CodeX events
-result = events_collection.insert_many(codex_events)
-print(f"Seeded {len(result.inserted_ids)} CodeX events")
+# Replaces the existing CodeX events in one swap; general events are carried over
+inserted = event_model.bulk_create(codex_events, replace=True, keep={"event_type": {"$ne": "codex"}})
+print(f"Seeded {inserted} CodeX events")
 print("  - CODEX NOVEMBER (9 winners across 3 categories)")
 print("  - CODEX OCTOBER (9 winners across 3 categories)")
 print("\nNote: Update image URLs in the admin panel once photos are uploaded to Vercel")
@@ -4,9 +4,9 @@ Run: python seed_data.py
 """
 
 from pymongo import MongoClient
-from datetime import datetime
 import os
 from dotenv import load_dotenv
+from models.member import Member
 
 load_dotenv()
 
@@ -65,68 +65,28 @@ core_team = {
 def seed_database():
     client = MongoClient(MONGO_URI)
     db = client.get_default_database()
-    members_collection = db.members
+    member_model = Member(db)
     
-    # Clear existing members
-    members_collection.delete_many({})
-    print("Cleared existing members")
+    members = [dict(name=m["name"], image_url=m["imageUrl"], role=m["role"], member_type="faculty")
+               for m in faculty]
+    members += [dict(name=m["name"], image_url=m["imageUrl"], role=m["role"], member_type="super-core")
+                for m in super_core]
+    total_core = 0
+    for department, department_members in core_team.items():
+        members += [dict(name=m["name"], image_url=m["imageUrl"], role=department, member_type="core",
+                         department=department)
+                    for m in department_members]
+        total_core += len(department_members)
     
-    # Insert Faculty
-    for member in faculty:
-        doc = {
-            "name": member["name"],
-            "imageUrl": member["imageUrl"],
-            "role": member["role"],
-            "memberType": "faculty",
-            "department": None,
-            "linkedin": None,
-            "github": None,
-            "email": None,
-            "createdAt": datetime.utcnow(),
-            "updatedAt": datetime.utcnow()
-        }
-        members_collection.insert_one(doc)
+    # Loaded into a staging collection and renamed over members in one step
+    total = member_model.bulk_create(members, replace=True)
+    print("Replaced existing members")
     print(f"[OK] Inserted {len(faculty)} faculty coordinators")
-    
-    # Insert Super Core
-    for member in super_core:
-        doc = {
-            "name": member["name"],
-            "imageUrl": member["imageUrl"],
-            "role": member["role"],
-            "memberType": "super-core",
-            "department": None,
-            "linkedin": None,
-            "github": None,
-            "email": None,
-            "createdAt": datetime.utcnow(),
-            "updatedAt": datetime.utcnow()
-        }
-        members_collection.insert_one(doc)
     print(f"[OK] Inserted {len(super_core)} super core members")
-    
-    # Insert Core Team
-    total_core = 0
-    for department, members in core_team.items():
-        for member in members:
-            doc = {
-                "name": member["name"],
-                "imageUrl": member["imageUrl"],
-                "role": department,
-                "memberType": "core",
-                "department": department,
-                "linkedin": None,
-                "github": None,
-                "email": None,
-                "createdAt": datetime.utcnow(),
-                "updatedAt": datetime.utcnow()
-            }
-            members_collection.insert_one(doc)
-            total_core += 1
     print(f"[OK] Inserted {total_core} core members across {len(core_team)} departments")
     
     print("\n[SUCCESS] Database seeded successfully!")
-    print(f"Total members: {len(faculty) + len(super_core) + total_core}")
+    print(f"Total members: {total}")
     
     client.close()
 
@@ -0,0 +1,64 @@
+import os
+
+class AsyncMongoConnection:
+    """Per-process Motor (asyncio) client for the ASGI tier, created lazily on first use
+
+    Mirrors services/db.py's MongoConnection: attribute access is forwarded to
+    the default database and a forked worker opens its own client. The client
+    binds to the event loop that first uses it, so it is created inside the
+    server's loop rather than at import time.
+    """
+
+    def __init__(self, uri: str, **options):
+        self.uri = uri
+        self.options = options
+        self._client = None
+        self._pid = None
+
+    @classmethod
+    def from_config(cls, config) -> 'AsyncMongoConnection':
+        return cls(
+            config['MONGO_URI'],
+            maxPoolSize=config['MONGO_MAX_POOL_SIZE'],
+            minPoolSize=config['MONGO_MIN_POOL_SIZE'],
+            maxIdleTimeMS=config['MONGO_MAX_IDLE_TIME_MS'],
+            serverSelectionTimeoutMS=config['MONGO_SERVER_SELECTION_TIMEOUT_MS'],
+            connectTimeoutMS=config['MONGO_CONNECT_TIMEOUT_MS'],
+            socketTimeoutMS=config['MONGO_SOCKET_TIMEOUT_MS'],
+            readPreference=config['MONGO_READ_PREFERENCE']
+        )
+
+    @property
+    def client(self):
+        """AsyncIOMotorClient owned by the current process"""
+        pid = os.getpid()
+        if self._client is None or self._pid != pid:
+            try:
+                from motor.motor_asyncio import AsyncIOMotorClient
+            except ImportError as e:
+                raise RuntimeError("The async API tier needs motor: pip install -r requirements-async.txt") from e
+            self._client = AsyncIOMotorClient(self.uri, **self.options)
+            self._pid = pid
+        return self._client
+
+    @property
+    def database(self):
+        return self.client.get_default_database()
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.database, name)
+
+    def __getitem__(self, name):
+        return self.database[name]
+
+    async def ping(self) -> bool:
+        """Round trip to the server; raises on failure"""
+        await self.client.admin.command('ping')
+        return True
+
+    def close(self):
+        if self._client is not None:
+            self._client.close()
+            self._client = None
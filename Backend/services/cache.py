@@ -0,0 +1,132 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+def new_version() -> str:
+    """Content version token, unique across writes and process restarts"""
+    return f"{time.time_ns():x}"
+
+class QueryCache:
+    """Thread-safe LRU cache with per-entry TTL for model read results
+
+    Misses are single-flight: while one caller runs the loader for a key,
+    concurrent callers for the same key wait for its result instead of
+    issuing the same query. A load that was running when the cache was
+    invalidated returns its result to its callers but does not cache it,
+    since it may have read the data from before the write.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 300):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # key -> Lock held while a thread loads it / asyncio task loading it
+        self._loading = {}
+        self._loading_async = {}
+        # Bumped by invalidate(); loads only cache results of the generation they started in
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        """Return cached value for key, or default if missing/expired"""
+        return self._lookup(key, default, count=True)
+
+    def _lookup(self, key, default, count: bool):
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING and entry[0] < time.monotonic():
+                del self._entries[key]
+                entry = _MISSING
+            if entry is _MISSING:
+                self.misses += count
+                return default
+            self._entries.move_to_end(key)
+            self.hits += count
+            return entry[1]
+
+    def set(self, key, value, generation: int = None):
+        """Store value, evicting the least recently used entry when full
+
+        With generation, value is only stored if the cache was not invalidated since.
+        """
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_set(self, key, loader):
+        """Return cached value for key, calling loader() to fill it on a miss
+
+        Concurrent misses for the same key wait for the first caller's loader().
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        with self._lock:
+            key_lock = self._loading.setdefault(key, threading.Lock())
+        with key_lock:
+            # Filled by the thread that held the lock while this one waited
+            value = self._lookup(key, _MISSING, count=False)
+            if value is _MISSING:
+                generation = self._generation
+                try:
+                    value = loader()
+                    self.set(key, value, generation)
+                finally:
+                    with self._lock:
+                        if self._loading.get(key) is key_lock:
+                            del self._loading[key]
+        return value
+
+    async def aget_or_set(self, key, loader):
+        """Async get_or_set: loader() returns an awaitable (e.g. a Motor query)
+
+        Concurrent misses for the same key await the first caller's load.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        task = self._loading_async.get(key)
+        if task is None:
+            task = self._loading_async[key] = asyncio.ensure_future(self._aload(key, loader))
+        # Shielded so one cancelled request does not cancel the load the others await
+        return await asyncio.shield(task)
+
+    async def _aload(self, key, loader):
+        generation = self._generation
+        try:
+            value = await loader()
+            self.set(key, value, generation)
+            return value
+        finally:
+            if self._loading_async.get(key) is asyncio.current_task():
+                del self._loading_async[key]
+
+    def invalidate(self, key=None):
+        """Drop a single key, or every entry when key is None
+
+        Loads already running are neither cached nor waited on by later callers.
+        """
+        with self._lock:
+            self._generation += 1
+            if key is None:
+                self._entries.clear()
+                self._loading.clear()
+                self._loading_async.clear()
+            else:
+                self._entries.pop(key, None)
+                self._loading.pop(key, None)
+                self._loading_async.pop(key, None)
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,13 @@
+from pymongo.monitoring import CommandListener
+from services.metrics import metrics
+
+class CommandTimer(CommandListener):
+    """Adds each MongoDB command's duration to the current request's DB time"""
+
+    def started(self, event): pass
+
+    def succeeded(self, event):
+        metrics.record_command(event.duration_micros / 1_000_000)
+
+    def failed(self, event):
+        metrics.record_command(event.duration_micros / 1_000_000)
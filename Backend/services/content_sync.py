@@ -0,0 +1,290 @@
+"""
+Cross-process cache coherence for the member/event models.
+
+The content version of each collection lives in one document in `_meta`, so
+every worker and instance serves the same ETags. Every write through a model
+publishes its new version there. Each process runs a background watcher that
+follows MongoDB change streams on members, events and that document, and hands
+every change to the registered models, which adopt the version and drop their
+cached reads. Where change streams are unavailable (standalone mongod,
+mongomock) the watcher polls the version document instead; with no watcher
+running, models re-read it at most every CONTENT_SYNC_POLL_SECONDS.
+
+A write that bypasses the models gets the version of its change event; the
+process that records it also rebuilds the read models (models/read_models.py),
+which are only served at the version they were built for.
+"""
+
+import os
+import threading
+import time
+from datetime import datetime
+from config import Config
+from services.cache import new_version
+
+# Same collection as the migration registry's schema document
+META_COLLECTION = '_meta'
+CONTENT_DOC_ID = 'content'
+
+MODES = ('auto', 'watch', 'poll', 'off')
+
+def version_from_change(change) -> str:
+    """Content version for a change event, identical in every process that sees it
+
+    Nanosecond-scaled like new_version(), so both kinds of version compare in write order.
+    """
+    cluster_time = change['clusterTime']
+    return f"{cluster_time.time * 10 ** 9 + cluster_time.inc:x}"
+
+def _version_filter(name: str, version: str, initial: bool) -> dict:
+    # Versions are equal-length hex strings, so $lt orders them by time
+    newer = {name: {"$exists": False}} if initial else \
+        {"$or": [{name: {"$exists": False}}, {name: {"$lt": version}}]}
+    return {"_id": CONTENT_DOC_ID, **newer}
+
+def record_version(db, name: str, version: str, initial: bool = False) -> bool:
+    """Store version for collection name unless a newer one (with initial, any one) is stored
+
+    Returns True when version was stored.
+    """
+    from pymongo.errors import DuplicateKeyError
+    try:
+        result = db[META_COLLECTION].update_one(_version_filter(name, version, initial),
+                                                {"$set": {name: version}}, upsert=True)
+    except DuplicateKeyError:
+        # The document exists and already holds a newer version
+        return False
+    return bool(result.modified_count or result.upserted_id)
+
+def load_version(db, name: str) -> str:
+    """Stored content version of collection name; the first reader of a fresh database stores one"""
+    doc = db[META_COLLECTION].find_one({"_id": CONTENT_DOC_ID}, {name: 1}) or {}
+    if not doc.get(name):
+        record_version(db, name, new_version(), initial=True)
+        doc = db[META_COLLECTION].find_one({"_id": CONTENT_DOC_ID}, {name: 1})
+    return doc[name]
+
+async def aload_version(db, name: str) -> str:
+    """load_version on a Motor database"""
+    from pymongo.errors import DuplicateKeyError
+    doc = await db[META_COLLECTION].find_one({"_id": CONTENT_DOC_ID}, {name: 1}) or {}
+    if not doc.get(name):
+        try:
+            await db[META_COLLECTION].update_one(_version_filter(name, None, True),
+                                                 {"$set": {name: new_version()}}, upsert=True)
+        except DuplicateKeyError:
+            pass
+        doc = await db[META_COLLECTION].find_one({"_id": CONTENT_DOC_ID}, {name: 1})
+    return doc[name]
+
+class ContentWatcher:
+    """Background thread keeping registered models' versions and caches in sync
+
+    mode: 'auto' follows change streams and falls back to polling, 'watch'
+    only follows change streams, 'poll' only polls, 'off' runs no thread
+    (versions are still published, and models re-read them every
+    poll_seconds).
+    """
+
+    def __init__(self, mode: str = 'off', poll_seconds: float = 5, log=print):
+        self.mode = mode
+        self.poll_seconds = poll_seconds
+        self.log = log
+        self.models = {}           # collection name -> [model, ...]
+        self.active = None         # 'change_stream' or 'polling' once running
+        self.applied = 0
+        self.last_change = None
+        # collection name -> version of changes made outside the models, published once the stream is idle
+        self._unpublished = {}
+        self._rebuild = None
+        self._thread = None
+        self._pid = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def configure(self, config):
+        if config['CONTENT_SYNC'] not in MODES:
+            raise ValueError(f"CONTENT_SYNC must be one of {', '.join(MODES)}")
+        self.mode = config['CONTENT_SYNC']
+        self.poll_seconds = config['CONTENT_SYNC_POLL_SECONDS']
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != 'off'
+
+    @property
+    def running(self) -> bool:
+        """True while this process's watcher thread is following changes"""
+        return (self.active is not None and self._thread is not None and self._thread.is_alive()
+                and self._pid == os.getpid())
+
+    def register(self, name: str, model):
+        """Keep model (anything with .version and .refresh(version)) in sync with collection name"""
+        self.models.setdefault(name, []).append(model)
+
+    def set_rebuild(self, rebuild):
+        """rebuild(db, names) regenerates the read models of the named collections after writes
+        that bypassed the models (services/migrations.rebuild_read_models)"""
+        self._rebuild = rebuild
+
+    # --- writers --------------------------------------------------------------
+
+    def publish(self, db, name: str, version: str) -> bool:
+        """Record version as the current one for collection name (called after each model write)
+
+        A newer version already recorded is kept. Returns True when version was recorded.
+        """
+        try:
+            return record_version(db, name, version)
+        except Exception as e:
+            # The write itself succeeded; other processes catch up on the next publish
+            self.log(f"Content version publish failed: {e}")
+            return False
+
+    # --- readers --------------------------------------------------------------
+
+    def needs_check(self, model, checked_at) -> bool:
+        """Whether model should re-read its version: never read, or read over poll_seconds
+        ago while no watcher thread in this process keeps it current"""
+        if checked_at is None:
+            return True
+        if self.running and any(model is m for models in self.models.values() for m in models):
+            return False
+        return time.monotonic() - checked_at >= self.poll_seconds
+
+    def apply(self, name: str, version: str):
+        """Hand version to every model registered for name that is not already on it"""
+        for model in self.models.get(name, ()):
+            if model.version != version:
+                model.refresh(version)
+                self.applied += 1
+                self.last_change = datetime.utcnow()
+
+    def sync(self, db):
+        """Adopt the published version of every registered collection"""
+        doc = db[META_COLLECTION].find_one({"_id": CONTENT_DOC_ID}) or {}
+        for name in self.models:
+            if doc.get(name):
+                self.apply(name, doc[name])
+
+    def on_change(self, change):
+        """Apply one change stream event"""
+        namespace = change.get('ns') or {}
+        if namespace.get('coll') == META_COLLECTION:
+            doc = change.get('fullDocument') or {}
+            if doc.get('_id') == CONTENT_DOC_ID:
+                for name in self.models:
+                    if doc.get(name):
+                        self.apply(name, doc[name])
+            return
+        # Writes that bypass the models (shell, Compass, bulk renames) still evict
+        version = version_from_change(change)
+        for name in {namespace.get('coll'), (change.get('to') or {}).get('coll')} & set(self.models):
+            self.apply(name, version)
+            self._unpublished[name] = version
+
+    def publish_changes(self, db):
+        """Record the versions of changes applied by on_change, so processes started later agree
+
+        Model writes record a newer version right after their change, which is kept. Whichever
+        process records a bypassing write's version rebuilds the read models it left behind.
+        """
+        rebuild = []
+        while self._unpublished:
+            name, version = self._unpublished.popitem()
+            if self.publish(db, name, version):
+                rebuild.append(name)
+        if rebuild and self._rebuild:
+            try:
+                self._rebuild(db, rebuild)
+            except Exception as e:
+                # The API keeps serving live queries until the next write or `migrate.py rebuild`
+                self.log(f"Read model rebuild failed: {e}")
+
+    # --- background thread ----------------------------------------------------
+
+    def start(self, db):
+        """Start the watcher thread for this process (no-op if off or already running)"""
+        if not self.enabled or not self.models:
+            return
+        with self._lock:
+            pid = os.getpid()
+            if self._thread is not None and self._thread.is_alive() and self._pid == pid:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, args=(db,), name='content-watcher', daemon=True)
+            self._pid = pid
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self, db):
+        self._resync(db)
+        if self.mode in ('auto', 'watch'):
+            try:
+                self._watch(db)
+                return
+            except Exception as e:
+                if self.mode == 'watch':
+                    self.log(f"Change stream unavailable, content sync stopped: {e}")
+                    self.active = None
+                    return
+                self.log(f"Change stream unavailable ({e}); polling content versions every "
+                         f"{self.poll_seconds}s")
+        self._poll(db)
+
+    def _watch(self, db):
+        """Follow change streams; raises if they cannot be opened at all"""
+        from pymongo.errors import OperationFailure, PyMongoError
+        pipeline = [{"$match": {"ns.coll": {"$in": list(self.models) + [META_COLLECTION]}}}]
+        resume_token = None
+        opened = False
+        while not self._stop.is_set():
+            try:
+                with db.watch(pipeline, full_document='updateLookup', resume_after=resume_token,
+                              max_await_time_ms=1000) as stream:
+                    opened = True
+                    self.active = 'change_stream'
+                    while not self._stop.is_set():
+                        change = stream.try_next()
+                        resume_token = stream.resume_token
+                        if change is not None:
+                            self.on_change(change)
+                        elif self._unpublished:
+                            # Once per burst of changes rather than per document
+                            self.publish_changes(db)
+            except OperationFailure as e:
+                if not opened:
+                    raise
+                # Resume point lost (e.g. oplog rolled over): reopen from now and resync
+                self.log(f"Change stream could not resume ({e}); resyncing content versions")
+                resume_token = None
+                self._resync(db)
+            except PyMongoError as e:
+                if not opened:
+                    raise
+                self.log(f"Change stream interrupted ({e}); reconnecting")
+                self._stop.wait(self.poll_seconds)
+
+    def _resync(self, db):
+        try:
+            self.sync(db)
+        except Exception as e:
+            self.log(f"Content version sync failed: {e}")
+
+    def _poll(self, db):
+        self.active = 'polling'
+        while not self._stop.wait(self.poll_seconds):
+            self._resync(db)
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "active": self.active,
+            "applied": self.applied,
+            "last_change": self.last_change.isoformat() if self.last_change else None
+        }
+
+# Models publish through it (scripts included); create_app/create_async_app start it per process
+content_watcher = ContentWatcher(Config.CONTENT_SYNC, Config.CONTENT_SYNC_POLL_SECONDS)
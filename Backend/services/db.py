@@ -0,0 +1,97 @@
+import os
+import threading
+
+class MongoConnection:
+    """Process-wide, fork-safe MongoClient created lazily on first use
+
+    Attribute access is forwarded to the default database, so models can use
+    ``connection.members`` exactly like a pymongo Database. A forked worker
+    notices the pid change and opens its own client instead of reusing the
+    parent's sockets.
+    """
+
+    def __init__(self, uri: str, monitor_commands: bool = False, profile_queries: bool = False, **options):
+        self.uri = uri
+        self.monitor_commands = monitor_commands
+        self.profile_queries = profile_queries
+        self.options = options
+        self._client = None
+        self._pid = None
+        self._pool_stats = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config) -> 'MongoConnection':
+        return cls(
+            config['MONGO_URI'],
+            monitor_commands=config['METRICS_ENABLED'],
+            profile_queries=config['QUERY_PROFILING'],
+            maxPoolSize=config['MONGO_MAX_POOL_SIZE'],
+            minPoolSize=config['MONGO_MIN_POOL_SIZE'],
+            maxIdleTimeMS=config['MONGO_MAX_IDLE_TIME_MS'],
+            serverSelectionTimeoutMS=config['MONGO_SERVER_SELECTION_TIMEOUT_MS'],
+            connectTimeoutMS=config['MONGO_CONNECT_TIMEOUT_MS'],
+            socketTimeoutMS=config['MONGO_SOCKET_TIMEOUT_MS'],
+            readPreference=config['MONGO_READ_PREFERENCE']
+        )
+
+    @property
+    def client(self):
+        """MongoClient owned by the current process"""
+        pid = os.getpid()
+        if self._client is None or self._pid != pid:
+            with self._lock:
+                if self._client is None or self._pid != pid:
+                    # Imported here so processes that never query (and cold starts) skip pymongo
+                    from pymongo import MongoClient
+                    from services.pool_stats import PoolStats
+                    self._pool_stats = PoolStats()
+                    listeners = [self._pool_stats]
+                    if self.monitor_commands:
+                        from services.command_timer import CommandTimer
+                        listeners.append(CommandTimer())
+                    if self.profile_queries:
+                        from services.query_capture import QueryCapture
+                        listeners.append(QueryCapture())
+                    # connect=False defers the first socket until the first operation
+                    self._client = MongoClient(self.uri, connect=False,
+                                               event_listeners=listeners, **self.options)
+                    self._pid = pid
+        return self._client
+
+    @property
+    def database(self):
+        return self.client.get_default_database()
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.database, name)
+
+    def __getitem__(self, name):
+        return self.database[name]
+
+    def ping(self) -> bool:
+        """Round trip to the server; raises on failure"""
+        self.client.admin.command('ping')
+        return True
+
+    def stats(self) -> dict:
+        """Pool counters and settings for this process (no server round trip)"""
+        return {
+            "pid": self._pid,
+            "connected": self._client is not None and self._pid == os.getpid(),
+            "max_pool_size": self.options.get('maxPoolSize'),
+            "pool": self._pool_stats.snapshot() if self._pool_stats else {}
+        }
+
+_connections = {}
+_connections_lock = threading.Lock()
+
+def get_connection(config) -> MongoConnection:
+    """Shared MongoConnection for config['MONGO_URI'], reused by every app in the process"""
+    uri = config['MONGO_URI']
+    with _connections_lock:
+        if uri not in _connections:
+            _connections[uri] = MongoConnection.from_config(config)
+        return _connections[uri]
@@ -0,0 +1,69 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from services.metrics import metrics
+
+class QueryExecutor:
+    """Runs independent model reads concurrently on a small thread pool
+
+    pymongo releases the GIL while it waits on the server, so N reads issued
+    through the shared MongoClient take about as long as the slowest one. The
+    pool is created on first use and re-created after a fork, like the
+    MongoClient itself. With max_workers=0 every call runs inline, and so
+    does a gather issued from a pool thread (e.g. a cached loader that fans
+    out itself): blocking a worker on work queued behind it would deadlock
+    the bounded pool.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max_workers
+        self._pool = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def configure(self, config):
+        self.max_workers = config['QUERY_EXECUTOR_WORKERS']
+
+    @property
+    def pool(self) -> ThreadPoolExecutor:
+        pid = os.getpid()
+        if self._pool is None or self._pid != pid:
+            with self._lock:
+                if self._pool is None or self._pid != pid:
+                    self._pool = ThreadPoolExecutor(self.max_workers, thread_name_prefix='query',
+                                                    initializer=self._mark_worker)
+                    self._pid = pid
+        return self._pool
+
+    def _mark_worker(self):
+        self._local.worker = True
+
+    def gather(self, *calls) -> list:
+        """Call each zero-argument callable concurrently; results in call order
+
+        The last call runs on the calling thread while the others run on the
+        pool. The first exception raised (in call order) propagates.
+        """
+        if self.max_workers < 1 or len(calls) < 2 or getattr(self._local, 'worker', False):
+            return [call() for call in calls]
+        request = metrics.current()
+
+        def run(call):
+            metrics.attach(request)
+            try:
+                return call()
+            finally:
+                metrics.attach(None)
+
+        futures = [self.pool.submit(run, call) for call in calls[:-1]]
+        last = calls[-1]()
+        return [future.result() for future in futures] + [last]
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+# Configured by create_app; shared by every request handler in the process
+query_executor = QueryExecutor()
@@ -1,16 +1,16 @@
 import re
-from typing import Literal
+from typing import Iterable, Literal
+from services.cache import QueryCache
 
 class ImageValidator:
     def __init__(self, config):
-        self.patterns = config['IMAGE_URL_PATTERNS']
         self.domain = config['ALLOWED_IMAGE_DOMAIN']
+        # Compiled once instead of re-parsing the pattern strings on every call
+        self.patterns = {category: re.compile(pattern) for category, pattern in config['IMAGE_URL_PATTERNS'].items()}
+        # Validation is pure, so results never expire; the LRU only bounds memory
+        self._memo = QueryCache(config['IMAGE_VALIDATION_CACHE_SIZE'], float('inf'))
     
-    def validate_url(self, url: str, category: Literal['members', 'events', 'codex']) -> tuple[bool, str]:
-        """Validate image URL against allowed patterns"""
-        if not url or not isinstance(url, str):
-            return False, "URL is required"
-        
+    def _check(self, url: str, category: str) -> tuple[bool, str]:
         if not url.startswith('https://'):
             return False, "URL must use HTTPS"
         
@@ -18,7 +18,22 @@ class ImageValidator:
             return False, f"URL must be hosted on {self.domain}"
         
         pattern = self.patterns.get(category)
-        if not pattern or not re.match(pattern, url):
+        if not pattern or not pattern.match(url):
             return False, f"URL doesn't match required pattern for {category}"
         
         return True, "Valid"
+    
+    def validate_url(self, url: str, category: Literal['members', 'events', 'codex']) -> tuple[bool, str]:
+        """Validate image URL against allowed patterns (memoized per URL and category)"""
+        if not url or not isinstance(url, str):
+            return False, "URL is required"
+        return self._memo.get_or_set((url, category), lambda: self._check(url, category))
+    
+    def validate_many(self, items: Iterable[tuple[str, str]]) -> list[tuple[bool, str]]:
+        """Validate (url, category) pairs in one pass; returns (is_valid, message) for each, in order,
+        so callers can report every failure at once"""
+        return [self.validate_url(url, category) for url, category in items]
+    
+    def stats(self) -> dict:
+        """Memo hit/miss counters"""
+        return self._memo.stats()
@@ -0,0 +1,197 @@
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+
+# Upper bounds (seconds) of the latency histogram buckets
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Parts of a request timed separately from the total
+COMPONENTS = ('db', 'serialize', 'template')
+
+# Endpoints left out of the histograms (scrapes and probes)
+UNTRACKED_ENDPOINTS = ('metrics', 'health', 'startup_report', 'slow_queries', 'static')
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _labels(names, values) -> str:
+    return ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+
+class Histogram:
+    """Prometheus-style histogram: per-bucket counts plus sum and count"""
+    __slots__ = ('counts', 'sum', 'count')
+
+    def __init__(self, size: int):
+        self.counts = [0] * (size + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+class RequestMetrics:
+    """Per-endpoint latency histograms with DB, serialization and template time split out
+
+    Component times are accumulated in a thread-local while a request runs: the
+    pymongo command listener adds DB time, `timed('serialize')` wraps the JSON
+    helpers and Flask's template signals add render time. Queries fanned out to
+    worker threads (services/executor.py) attach to the request that started them;
+    their DB time is summed, so it can exceed the request's wall time. Each request
+    carries its own lock, as those threads add to its timings concurrently.
+    """
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = tuple(buckets)
+        self.histograms = {}       # (metric, endpoint, method) -> Histogram
+        self.requests = {}         # (endpoint, method, status) -> count
+        self.commands = {}         # (endpoint, method) -> Mongo commands issued
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    # --- per-request accumulation -------------------------------------------
+
+    def begin(self):
+        self._local.request = {"timings": dict.fromkeys(COMPONENTS, 0.0), "commands": 0,
+                               "start": time.perf_counter(), "lock": threading.Lock()}
+
+    def current(self):
+        """State of the request running on this thread, for attach() in worker threads"""
+        return getattr(self._local, 'request', None)
+
+    def attach(self, request):
+        """Count this thread's DB/serialize time toward request (None detaches)"""
+        self._local.request = request
+
+    def add(self, component: str, seconds: float):
+        """Add seconds to component for the request running on this thread (no-op outside one)"""
+        request = getattr(self._local, 'request', None)
+        if request is not None:
+            with request["lock"]:
+                request["timings"][component] += seconds
+
+    def record_command(self, seconds: float):
+        """Called by the Mongo command listener for every finished command"""
+        request = getattr(self._local, 'request', None)
+        if request is not None:
+            with request["lock"]:
+                request["timings"]['db'] += seconds
+                request["commands"] += 1
+
+    def end(self, endpoint: str, method: str, status: int):
+        request = getattr(self._local, 'request', None)
+        if request is None:
+            return
+        total = time.perf_counter() - request["start"]
+        with request["lock"]:
+            timings, commands = dict(request["timings"]), request["commands"]
+        self._local.request = None
+        with self._lock:
+            self._observe('request', endpoint, method, total)
+            for component, seconds in timings.items():
+                self._observe(component, endpoint, method, seconds)
+            key = (endpoint, method, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            key = (endpoint, method)
+            self.commands[key] = self.commands.get(key, 0) + commands
+
+    def _observe(self, metric, endpoint, method, seconds):
+        key = (metric, endpoint, method)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram(len(self.buckets))
+        histogram.counts[bisect_left(self.buckets, seconds)] += 1
+        histogram.sum += seconds
+        histogram.count += 1
+
+    def timed(self, component: str):
+        """Decorator adding the wrapped function's run time to component"""
+        def decorator(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.add(component, time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    # --- Flask integration ----------------------------------------------------
+
+    def init_app(self, app):
+        """Install request hooks and template signals on app"""
+        from flask import request, before_render_template, template_rendered
+
+        @app.before_request
+        def start_request_timer():
+            if request.endpoint not in UNTRACKED_ENDPOINTS:
+                self.begin()
+
+        @app.after_request
+        def stop_request_timer(response):
+            self.end(request.endpoint or 'unmatched', request.method, response.status_code)
+            return response
+
+        def template_started(sender, **extra):
+            self._local.template_start = time.perf_counter()
+
+        def template_finished(sender, **extra):
+            start = getattr(self._local, 'template_start', None)
+            if start is not None:
+                self.add('template', time.perf_counter() - start)
+                self._local.template_start = None
+
+        before_render_template.connect(template_started, app, weak=False)
+        template_rendered.connect(template_finished, app, weak=False)
+
+    # --- exposition -----------------------------------------------------------
+
+    def render(self, extra: dict = None) -> str:
+        """Prometheus text exposition format (version 0.0.4)
+
+        extra maps metric name -> (type, help, value) for process-level values such as pool stats.
+        """
+        with self._lock:
+            histograms = {key: (list(h.counts), h.sum, h.count) for key, h in self.histograms.items()}
+            requests = dict(self.requests)
+            commands = dict(self.commands)
+
+        lines = []
+        descriptions = {
+            'request': ('acses_http_request_duration_seconds', 'Total request latency'),
+            'db': ('acses_http_request_db_seconds', 'Time spent in MongoDB commands per request'),
+            'serialize': ('acses_http_request_serialize_seconds', 'Time spent serializing documents and encoding JSON per request'),
+            'template': ('acses_http_request_template_seconds', 'Time spent rendering templates per request'),
+        }
+        names = ('endpoint', 'method')
+        for metric, (name, help_text) in descriptions.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for (m, endpoint, method), (counts, total, count) in sorted(histograms.items()):
+                if m != metric:
+                    continue
+                labels = _labels(names, (endpoint, method))
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {count}')
+                lines.append(f'{name}_sum{{{labels}}} {total:.6f}')
+                lines.append(f'{name}_count{{{labels}}} {count}')
+
+        lines.append("# HELP acses_http_requests_total Requests by endpoint, method and status")
+        lines.append("# TYPE acses_http_requests_total counter")
+        for key, count in sorted(requests.items()):
+            lines.append(f"acses_http_requests_total{{{_labels(('endpoint', 'method', 'status'), key)}}} {count}")
+
+        lines.append("# HELP acses_mongo_commands_total MongoDB commands issued by endpoint")
+        lines.append("# TYPE acses_mongo_commands_total counter")
+        for key, count in sorted(commands.items()):
+            lines.append(f"acses_mongo_commands_total{{{_labels(names, key)}}} {count}")
+
+        for name, (metric_type, help_text, value) in (extra or {}).items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+# Shared by the public and deferred admin apps and the Mongo command listener
+metrics = RequestMetrics()
@@ -0,0 +1,148 @@
+"""
+Versioned index/migration registry.
+
+Migrations run once, from `python migrate.py` (or the deploy step), and record
+the applied version in the `_meta` collection. App startup only reads that
+version (once per process) so cold starts never pay for index management.
+"""
+
+from datetime import datetime
+from models import member, event, read_models
+from models.member import Member
+from models.event import Event
+
+META_COLLECTION = '_meta'
+SCHEMA_DOC_ID = 'schema'
+
+def _create_indexes(db):
+    Member(db).ensure_indexes()
+    Event(db).ensure_indexes()
+
+def _backfill_event_lookup_keys(db):
+    Event(db).backfill_lookup_keys()
+
+def _backfill_role_priority(db):
+    Member(db).backfill_role_priority()
+
+# Single-field/partial indexes superseded by the compound query-shape indexes
+SUPERSEDED_INDEXES = {
+    "members": ["memberType_1", "department_1", "memberType_1_rolePriority_1_createdAt_-1"],
+    "events": ["date_-1", "event_type_1", "event_type_1_title_slug_1"],
+}
+
+def _replace_single_field_indexes(db):
+    _create_indexes(db)
+    for collection, names in SUPERSEDED_INDEXES.items():
+        existing = db[collection].index_information()
+        for name in names:
+            if name in existing:
+                db[collection].drop_index(name)
+
+def rebuild_read_models(db, names=("members", "events")):
+    """Regenerate the directory/events_index/codex_index read models of the named collections"""
+    for model in (Member(db), Event(db)):
+        if model.collection.name in names:
+            model.rebuild_read_models()
+
+def _bucket_read_models(db):
+    from pymongo import IndexModel
+    db[read_models.READ_MODELS].create_indexes([IndexModel(keys) for keys in read_models.INDEXES])
+    rebuild_read_models(db)
+
+# (version, description, fn(db)); append only, never renumber
+MIGRATIONS = [
+    (1, "Create member and event indexes", _create_indexes),
+    (2, "Backfill event month/title_slug", _backfill_event_lookup_keys),
+    (3, "Backfill member rolePriority", _backfill_role_priority),
+    (4, "Replace single-field indexes with compound query-shape indexes", _replace_single_field_indexes),
+    (5, "Build materialized read models", rebuild_read_models),
+    (6, "Split read models into indexed per-month/per-group buckets", _bucket_read_models),
+    (7, "Rebuild read models without internal lookup fields", rebuild_read_models),
+]
+
+# Query shapes declared by each model, checked by verify_query_shapes()
+QUERY_SHAPES = {
+    "members": member.QUERY_SHAPES,
+    "events": event.QUERY_SHAPES,
+}
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+# Per-process memo of the last version check, so boot does at most one read
+_checked_version = None
+
+def current_version(db) -> int:
+    """Schema version recorded in the database (0 if never migrated)"""
+    doc = db[META_COLLECTION].find_one({"_id": SCHEMA_DOC_ID}, {"version": 1})
+    return doc["version"] if doc else 0
+
+def pending(db) -> list:
+    """Migrations newer than the recorded schema version"""
+    version = current_version(db)
+    return [m for m in MIGRATIONS if m[0] > version]
+
+def migrate(db, log=print) -> int:
+    """Apply every pending migration in order; returns the resulting version"""
+    global _checked_version
+    version = current_version(db)
+    for number, description, fn in MIGRATIONS:
+        if number <= version:
+            continue
+        log(f"Applying migration {number}: {description}")
+        fn(db)
+        db[META_COLLECTION].update_one(
+            {"_id": SCHEMA_DOC_ID},
+            {"$set": {"version": number, "applied_at": datetime.utcnow()}},
+            upsert=True
+        )
+        version = number
+    _checked_version = version
+    return version
+
+def backfill(db):
+    """Re-run the idempotent data backfills, e.g. after changing MEMBER_ROLE_PRIORITY"""
+    _backfill_event_lookup_keys(db)
+    _backfill_role_priority(db)
+
+def check_schema(db, log=print) -> bool:
+    """Cheap startup check: one read per process, warns (once) when migrations are pending"""
+    global _checked_version
+    if _checked_version is None:
+        _checked_version = current_version(db)
+        if _checked_version < LATEST_VERSION:
+            log(f"Database schema at version {_checked_version}, latest is {LATEST_VERSION}; "
+                f"run `python migrate.py`")
+    return _checked_version >= LATEST_VERSION
+
+def explain_shape(db, collection: str, shape: dict) -> dict:
+    """explain(executionStats) of one declared query shape"""
+    if "pipeline" in shape:
+        command = {"aggregate": collection, "pipeline": shape["pipeline"], "cursor": {}}
+    else:
+        command = {"find": collection, "filter": shape["filter"], "sort": dict(shape["sort"])}
+        if "limit" in shape:
+            command["limit"] = shape["limit"]
+    return db.command({"explain": command, "verbosity": "executionStats"})
+
+def verify_query_shapes(db, log=print) -> list:
+    """Explain every declared query shape; returns the names of shapes that need a
+    collection scan or an in-memory sort (empty when every shape is index-backed)"""
+    from services.query_profiler import summarize_explain
+    failures = []
+    for collection, shapes in QUERY_SHAPES.items():
+        for shape in shapes:
+            name = f"{collection}: {shape['name']}"
+            try:
+                summary = summarize_explain(explain_shape(db, collection, shape))
+            except Exception as e:
+                log(f"  [FAIL] {name}: explain failed: {e}")
+                failures.append(name)
+                continue
+            problems = [label for label, flag in (("COLLSCAN", summary["collscan"]),
+                                                   ("in-memory SORT", summary["in_memory_sort"])) if flag]
+            log(f"  [{'FAIL' if problems else 'OK'}] {name}: {summary['plan']} "
+                f"(examined {summary['docs_examined']} docs/{summary['keys_examined']} keys, "
+                f"returned {summary['returned']}){' - ' + ', '.join(problems) if problems else ''}")
+            if problems:
+                failures.append(name)
+    return failures
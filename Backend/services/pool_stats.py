@@ -0,0 +1,42 @@
+import threading
+from pymongo.monitoring import ConnectionPoolListener
+
+class PoolStats(ConnectionPoolListener):
+    """Counts connection pool events for the current process"""
+
+    def __init__(self):
+        self.counts = {"created": 0, "closed": 0, "checked_out": 0, "checked_in": 0, "checkout_failed": 0}
+        self._lock = threading.Lock()
+
+    def _count(self, name):
+        with self._lock:
+            self.counts[name] += 1
+
+    def pool_created(self, event): pass
+    def pool_ready(self, event): pass
+    def pool_cleared(self, event): pass
+    def pool_closed(self, event): pass
+    def connection_check_out_started(self, event): pass
+    def connection_ready(self, event): pass
+
+    def connection_created(self, event):
+        self._count("created")
+
+    def connection_closed(self, event):
+        self._count("closed")
+
+    def connection_checked_out(self, event):
+        self._count("checked_out")
+
+    def connection_checked_in(self, event):
+        self._count("checked_in")
+
+    def connection_check_out_failed(self, event):
+        self._count("checkout_failed")
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counts = dict(self.counts)
+        counts["open"] = counts["created"] - counts["closed"]
+        counts["in_use"] = counts["checked_out"] - counts["checked_in"]
+        return counts
@@ -0,0 +1,14 @@
+from pymongo.monitoring import CommandListener
+from services.query_profiler import query_profiler
+
+class QueryCapture(CommandListener):
+    """Hands commands issued inside profiled model methods to the query profiler"""
+
+    def started(self, event):
+        query_profiler.command_started(event)
+
+    def succeeded(self, event):
+        query_profiler.command_finished(event, event.reply)
+
+    def failed(self, event):
+        query_profiler.command_finished(event)
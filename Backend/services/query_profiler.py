@@ -0,0 +1,201 @@
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from functools import wraps
+from bson import json_util
+
+# Commands whose plans explain() can report on; getMore time is added to the originating command
+EXPLAINABLE = ('find', 'aggregate', 'count', 'distinct')
+
+# Fields the driver adds to every command; explain rejects or ignores them
+DRIVER_FIELDS = ('lsid', '$db', '$clusterTime', '$readPreference', 'txnNumber',
+                 'autocommit', 'startTransaction', 'apiVersion', 'apiStrict', 'apiDeprecationErrors')
+
+def plan_stages(plan) -> list:
+    """Flatten a winning plan tree into stage names, root first (IXSCAN carries its index)"""
+    stages = []
+    while plan:
+        stage = plan.get('stage', '?')
+        if plan.get('indexName'):
+            stage += f"({plan['indexName']})"
+        stages.append(stage)
+        children = plan.get('inputStages') or ([plan['inputStage']] if 'inputStage' in plan else [])
+        for child in children[1:]:
+            stages.extend(plan_stages(child))
+        plan = children[0] if children else None
+    return stages
+
+def summarize_explain(explain: dict) -> dict:
+    """Winning plan, docs/keys examined vs returned and in-memory sorts from an explain() result"""
+    pipeline_stages = []
+    if 'stages' in explain:
+        # Aggregation: the first stage wraps the query plan, later ones run in memory
+        pipeline_stages = [next(iter(stage)) for stage in explain['stages'][1:]]
+        explain = explain['stages'][0].get('$cursor', {})
+    planner = explain.get('queryPlanner', {})
+    winning = planner.get('winningPlan', {})
+    winning = winning.get('queryPlan', winning)  # slot-based engine nests the plan one level down
+    stats = explain.get('executionStats', {})
+    stages = plan_stages(winning)
+    return {
+        "plan": ' > '.join(stages + pipeline_stages),
+        "docs_examined": stats.get('totalDocsExamined'),
+        "keys_examined": stats.get('totalKeysExamined'),
+        "returned": stats.get('nReturned'),
+        "collscan": 'COLLSCAN' in stages,
+        "in_memory_sort": any(s.split('(')[0] == 'SORT' for s in stages) or '$sort' in pipeline_stages
+    }
+
+def query_shape(entry: dict) -> tuple:
+    """Filter/sort/pipeline keys without values, so one shape is explained once per interval"""
+    command = entry["command"]
+    name = entry["command_name"]
+    if name == 'aggregate':
+        detail = tuple(next(iter(stage)) for stage in command.get('pipeline', []))
+    else:
+        detail = (tuple(sorted(command.get('filter') or command.get('query') or {})),
+                  tuple(command.get('sort') or {}))
+    return (entry["database"], name, command.get(name), detail)
+
+class QueryProfiler:
+    """Wraps model read methods and explains the Mongo commands of slow calls
+
+    A pymongo command listener (services/query_capture.py) feeds the commands
+    issued on the current thread while a wrapped method runs. When the call
+    takes longer than threshold_ms, each command is re-run as
+    explain(executionStats) and a one-line report is logged; the same query
+    shape is explained at most once per explain_interval seconds.
+    """
+
+    def __init__(self, threshold_ms: float = 100, explain_interval: float = 300, log=print, history: int = 50):
+        self.threshold_ms = threshold_ms
+        self.explain_interval = explain_interval
+        self.log = log
+        self.enabled = False
+        self.reports = deque(maxlen=history)
+        self._explained_at = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def configure(self, config):
+        self.enabled = config['QUERY_PROFILING']
+        self.threshold_ms = config['SLOW_QUERY_MS']
+        self.explain_interval = config['SLOW_QUERY_EXPLAIN_INTERVAL']
+
+    # --- command capture (called by the listener) ---------------------------
+
+    def command_started(self, event):
+        entries = getattr(self._local, 'entries', None)
+        if entries is None:
+            return
+        if event.command_name in EXPLAINABLE:
+            entry = {
+                "database": event.database_name,
+                "command_name": event.command_name,
+                "command": {k: v for k, v in event.command.items() if k not in DRIVER_FIELDS},
+                "duration_ms": 0.0
+            }
+            entries.append(entry)
+            self._local.pending[event.request_id] = entry
+        elif event.command_name == 'getMore':
+            entry = self._local.cursors.get(event.command.get('getMore'))
+            if entry:
+                self._local.pending[event.request_id] = entry
+
+    def command_finished(self, event, reply: dict = None):
+        pending = getattr(self._local, 'pending', None)
+        entry = pending.pop(event.request_id, None) if pending is not None else None
+        if entry is None:
+            return
+        entry["duration_ms"] += event.duration_micros / 1000
+        cursor_id = (reply or {}).get('cursor', {}).get('id')
+        if cursor_id:
+            self._local.cursors[cursor_id] = entry
+
+    # --- wrapping -------------------------------------------------------------
+
+    def wrap(self, label: str, fn, model):
+        """Time fn and explain its commands (on model.db) when it exceeds the threshold"""
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if getattr(self._local, 'entries', None) is not None:
+                return fn(*args, **kwargs)  # nested call, the outer wrapper captures
+            self._local.entries, self._local.pending, self._local.cursors = [], {}, {}
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                entries = self._local.entries
+                self._local.entries = self._local.pending = self._local.cursors = None
+                if elapsed_ms >= self.threshold_ms:
+                    for entry in entries:
+                        self.report(label, elapsed_ms, entry, model.db)
+        return wrapper
+
+    def profile(self, model, methods):
+        """Replace model's read methods with profiled wrappers (no-op unless enabled)"""
+        if not self.enabled:
+            return model
+        for name in methods:
+            label = f"{type(model).__name__}.{name}"
+            setattr(model, name, self.wrap(label, getattr(model, name), model))
+        return model
+
+    # --- reporting ------------------------------------------------------------
+
+    def _due(self, shape) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            last = self._explained_at.get(shape)
+            if last is not None and now - last < self.explain_interval:
+                return False
+            self._explained_at[shape] = now
+            return True
+
+    def report(self, label: str, elapsed_ms: float, entry: dict, db):
+        if not self._due(query_shape(entry)):
+            return
+        command = entry["command"]
+        name = entry["command_name"]
+        result = {
+            "method": label,
+            "elapsed_ms": round(elapsed_ms, 2),
+            "command_ms": round(entry["duration_ms"], 2),
+            "collection": command.get(name),
+            "command": name,
+            "filter": json_util.dumps(command.get('filter', command.get('query', command.get('pipeline'))))[:500],
+            "sort": json_util.dumps(command.get('sort')),
+            "at": datetime.utcnow().isoformat()
+        }
+        try:
+            explain = db.client[entry["database"]].command(
+                {"explain": command, "verbosity": "executionStats"}
+            )
+            result.update(summarize_explain(explain))
+        except Exception as e:
+            result["explain_error"] = str(e)
+        self.reports.append(result)
+        self.log(self.format(result))
+
+    @staticmethod
+    def format(result: dict) -> str:
+        line = (f"[slow query] {result['method']} {result['elapsed_ms']:.1f} ms "
+                f"({result['collection']}.{result['command']} {result['command_ms']:.1f} ms) "
+                f"filter={result['filter'][:200]} sort={result['sort']}")
+        if "explain_error" in result:
+            return line + f" explain failed: {result['explain_error']}"
+        line += (f" plan={result['plan']} examined={result['docs_examined']} docs/"
+                 f"{result['keys_examined']} keys returned={result['returned']}")
+        if result["collscan"]:
+            line += " COLLSCAN"
+        if result["in_memory_sort"]:
+            line += " in-memory SORT"
+        return line
+
+    def recent(self) -> list:
+        return list(self.reports)
+
+# Configured by create_app; the command listener reports to this instance
+query_profiler = QueryProfiler()
@@ -0,0 +1,45 @@
+"""
+JSON shapes of the public API, shared by the Flask and ASGI routes and the
+materialized read models (models/read_models.py).
+"""
+
+from services.metrics import metrics
+
+# Member types listed individually in the directory; core members are grouped by department
+DIRECTORY_TYPES = ("founder", "faculty", "super-core")
+
+# Lookup/sort keys derived from title and role when a document is written; kept out of the JSON
+# (month and updated_at are API fields, see API_DOCS.md "Data Types")
+INTERNAL_FIELDS = ('title_slug', 'rolePriority')
+
+@metrics.timed('serialize')
+def serialize_doc(doc):
+    """Convert MongoDB document to JSON-serializable dict (returns a copy, cached docs stay intact)"""
+    if doc is None:
+        return None
+    doc = dict(doc)
+    for field in INTERNAL_FIELDS:
+        doc.pop(field, None)
+    doc['_id'] = str(doc['_id'])
+    if 'date' in doc:
+        doc['date'] = doc['date'].isoformat()
+    if 'created_at' in doc:
+        doc['created_at'] = doc['created_at'].isoformat()
+    if 'updated_at' in doc:
+        doc['updated_at'] = doc['updated_at'].isoformat()
+    return doc
+
+def directory_members(directory):
+    """Flat list of every member in a Member.get_directory() result"""
+    members = [m for key in DIRECTORY_TYPES for m in directory[key]]
+    return members + [m for group in directory["departments"] for m in group["members"]]
+
+def serialize_directory(directory):
+    """JSON shape shared by /members/directory and /bootstrap"""
+    return {
+        "members": {key: [serialize_doc(m) for m in directory[key]] for key in DIRECTORY_TYPES},
+        "departments": [
+            {"department": group["_id"], "members": [serialize_doc(m) for m in group["members"]]}
+            for group in directory["departments"]
+        ]
+    }
@@ -0,0 +1,120 @@
+import gzip
+import hashlib
+import threading
+from datetime import datetime
+from flask import Response
+from services.cache import QueryCache
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# Suffix appended to the ETag of each compressed representation
+ENCODING_SUFFIXES = {'br': '-br', 'gzip': '-gz'}
+
+def supported_encodings() -> list:
+    """Content codings this process can produce, preferred first"""
+    return ['br', 'gzip'] if brotli else ['gzip']
+
+def negotiate_encoding(accept_encodings) -> str:
+    """Pick br/gzip from a parsed Accept-Encoding header, or None for identity"""
+    return accept_encodings.best_match(supported_encodings())
+
+def compress(body: bytes, encoding: str, levels: dict) -> bytes:
+    """Compress body with the given content coding"""
+    if encoding == 'br':
+        return brotli.compress(body, quality=levels.get('br', 11))
+    # mtime=0 keeps the output (and so its ETag) deterministic
+    return gzip.compress(body, compresslevel=levels.get('gzip', 9), mtime=0)
+
+def etag_for(key, version) -> str:
+    """Strong ETag derived from the snapshot key and content version, computable without a query"""
+    return hashlib.sha1(repr((key, version)).encode()).hexdigest()
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response carrying the validator the client already holds"""
+    response = Response(status=304)
+    response.set_etag(etag)
+    response.vary.add('Accept-Encoding')
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+class Snapshot:
+    """Pre-encoded JSON response body with precomputed headers"""
+    __slots__ = ('body', 'status', 'etag', 'last_modified', 'content_length', '_variants', '_lock')
+
+    def __init__(self, body: bytes, etag: str, status: int = 200, last_modified: datetime = None):
+        self.body = body
+        self.status = status
+        self.etag = etag
+        self.last_modified = last_modified
+        self.content_length = len(body)
+        self._variants = {}
+        self._lock = threading.Lock()
+
+    def variant(self, encoding: str, levels: dict) -> bytes:
+        """Compressed body for encoding, compressed once and kept with the snapshot"""
+        body = self._variants.get(encoding)
+        if body is None:
+            with self._lock:
+                body = self._variants.get(encoding)
+                if body is None:
+                    body = self._variants[encoding] = compress(self.body, encoding, levels)
+        return body
+
+    def to_response(self, encoding: str = None, min_size: int = 0, levels: dict = None) -> Response:
+        """Build a Response serving the stored bytes, compressed when encoding is given
+
+        Bodies smaller than min_size are always sent uncompressed.
+        """
+        body, etag = self.body, self.etag
+        if encoding and self.content_length >= min_size:
+            body = self.variant(encoding, levels or {})
+            etag += ENCODING_SUFFIXES[encoding]
+        else:
+            encoding = None
+        response = Response(body, status=self.status, mimetype='application/json')
+        response.headers['Content-Length'] = str(len(body))
+        response.vary.add('Accept-Encoding')
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        if self.status == 200:
+            response.set_etag(etag)
+            # Clients may keep the body but must revalidate, which is a cheap 304
+            response.headers['Cache-Control'] = 'no-cache'
+            if self.last_modified:
+                response.last_modified = self.last_modified
+        return response
+
+class SnapshotStore:
+    """Serialized responses keyed by endpoint, arguments and content version"""
+
+    def __init__(self, max_entries: int = 128, ttl_seconds: float = 3600):
+        # Keys embed the content version, so stale snapshots simply age out of the LRU
+        self._cache = QueryCache(max_entries, ttl_seconds)
+
+    def get_or_build(self, key, version, build, encode) -> Snapshot:
+        """Return snapshot for key at version, calling build() and encode(data) on a miss
+
+        build() returns (data, status, last_modified); encode turns data into the JSON body bytes.
+        """
+        def load():
+            data, status, last_modified = build()
+            return Snapshot(encode(data), etag_for(key, version), status, last_modified)
+        return self._cache.get_or_set((key, version), load)
+
+    async def aget_or_build(self, key, version, build, encode) -> Snapshot:
+        """get_or_build for an async build() (the ASGI tier)"""
+        async def load():
+            data, status, last_modified = await build()
+            return Snapshot(encode(data), etag_for(key, version), status, last_modified)
+        return await self._cache.aget_or_set((key, version), load)
+
+    def clear(self):
+        """Drop every stored snapshot"""
+        self._cache.invalidate()
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current size"""
+        return self._cache.stats()
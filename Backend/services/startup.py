@@ -0,0 +1,48 @@
+import sys
+import time
+from contextlib import contextmanager
+
+class StartupProfiler:
+    """Records wall time and newly imported modules for each startup phase"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = []
+
+    @contextmanager
+    def phase(self, name: str):
+        modules_before = len(sys.modules)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append({
+                "phase": name,
+                "ms": round((time.perf_counter() - start) * 1000, 2),
+                "new_modules": len(sys.modules) - modules_before
+            })
+
+    def mark(self, name: str):
+        """Record a point-in-time event (e.g. first request) relative to process start"""
+        self.phases.append({"phase": name, "at_ms": round((time.perf_counter() - self.started) * 1000, 2)})
+
+    def report(self) -> dict:
+        return {
+            "total_ms": round(sum(p.get("ms", 0) for p in self.phases), 2),
+            "modules_loaded": len(sys.modules),
+            "phases": list(self.phases)
+        }
+
+    def format(self) -> str:
+        lines = ["Startup report:"]
+        for p in self.phases:
+            if "ms" in p:
+                lines.append(f"  {p['phase']:<28} {p['ms']:>9.2f} ms  (+{p['new_modules']} modules)")
+            else:
+                lines.append(f"  {p['phase']:<28} at {p['at_ms']:>6.2f} ms")
+        report = self.report()
+        lines.append(f"  {'total':<28} {report['total_ms']:>9.2f} ms  ({report['modules_loaded']} modules loaded)")
+        return "\n".join(lines)
+
+# Created when app.py is first imported, so it also covers the top-level imports
+profiler = StartupProfiler()
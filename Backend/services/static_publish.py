@@ -0,0 +1,134 @@
+"""
+Static export of the public API for CDN / static hosting.
+
+Every public GET endpoint is rendered through the Flask app (so the bytes are
+exactly what /api serves) and written as a content-hashed JSON file, e.g.
+`api/members.3f9a1c0b7d2e.json`. `manifest.json` maps each API path to its
+current file; hashed files never change, so a CDN can cache them forever and
+only the small manifest needs revalidation. Unchanged responses keep their
+file name between publishes.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from models.member import MEMBER_TYPES
+
+MANIFEST_NAME = 'manifest.json'
+# Files of the previous manifest are kept one more publish, for clients that fetched it just before
+PREVIOUS_MANIFEST_NAME = 'manifest.previous.json'
+
+def public_paths(member_model, event_model) -> list:
+    """Every public API path (with the query variants the frontend uses) to export"""
+    paths = ['/api/bootstrap', '/api/members', '/api/members/by-department', '/api/members/directory',
+             '/api/events', '/api/codex/latest', '/api/codex/all']
+    paths += [f'/api/members?memberType={member_type}' for member_type in MEMBER_TYPES]
+    months = set()
+    for event in event_model.iter_all(fields=("event_type", "month", "date")):
+        paths.append(f"/api/events/{event['_id']}")
+        if event.get("event_type") == 'codex':
+            months.add(event.get("month") or event_model.month_key(event["date"]))
+    paths += [f'/api/codex/{month}' for month in sorted(months)]
+    return paths
+
+def file_name(path: str, body: bytes) -> str:
+    """api/<path>.<hash>.json for an API path (query strings folded into the name)"""
+    stem = path.lstrip('/').replace('?', '.').replace('=', '-').replace('&', '.')
+    return f"{stem}.{hashlib.sha256(body).hexdigest()[:12]}.json"
+
+class StaticPublisher:
+    """Renders the public API into out_dir; publish() runs synchronously, schedule() in the background"""
+
+    def __init__(self, app, out_dir: str, log=print):
+        self.app = app
+        self.out_dir = out_dir
+        self.log = log
+        self.last_result = None
+        self._lock = threading.Lock()
+        self._schedule_lock = threading.Lock()
+        self._pending = False
+        self._running = False
+
+    def render(self):
+        """Yield (path, body bytes) for every exportable endpoint answering 200"""
+        client = self.app.test_client()
+        for path in public_paths(self.app.member_model, self.app.event_model):
+            response = client.get(path)
+            if response.status_code == 200:
+                yield path, response.get_data()
+            else:
+                self.log(f"[publish] skipped {path}: HTTP {response.status_code}")
+
+    def publish(self) -> dict:
+        """Write changed files, swap in the new manifest and prune files no manifest references"""
+        with self._lock:
+            files = {}
+            written = 0
+            for path, body in self.render():
+                name = files[path] = file_name(path, body)
+                target = os.path.join(self.out_dir, name)
+                if not os.path.exists(target):
+                    self._write(target, body)
+                    written += 1
+            manifest = {"generated_at": datetime.utcnow().isoformat() + 'Z', "files": files}
+            manifest_path = os.path.join(self.out_dir, MANIFEST_NAME)
+            previous = self._read_manifest(manifest_path)
+            if previous:
+                self._write(os.path.join(self.out_dir, PREVIOUS_MANIFEST_NAME), json.dumps(previous).encode())
+            self._write(manifest_path, json.dumps(manifest, indent=2).encode())
+            removed = self._prune(set(files.values()) | set((previous or {}).get("files", {}).values()))
+            self.last_result = {"files": len(files), "written": written, "removed": removed,
+                                "generated_at": manifest["generated_at"]}
+            return self.last_result
+
+    def schedule(self):
+        """Publish in a background thread; writes arriving meanwhile trigger one more publish"""
+        with self._schedule_lock:
+            self._pending = True
+            if self._running:
+                return
+            self._running = True
+        threading.Thread(target=self._run, name='static-publish', daemon=True).start()
+
+    def _run(self):
+        while True:
+            with self._schedule_lock:
+                if not self._pending:
+                    self._running = False
+                    return
+                self._pending = False
+            try:
+                result = self.publish()
+                self.log(f"[publish] {result['written']} of {result['files']} files written to {self.out_dir}")
+            except Exception as e:
+                self.log(f"[publish] failed: {e}")
+
+    @staticmethod
+    def _write(target: str, body: bytes):
+        # Written beside the target and renamed, so a reader never sees a partial file
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        temp = f"{target}.tmp"
+        with open(temp, 'wb') as f:
+            f.write(body)
+        os.replace(temp, target)
+
+    @staticmethod
+    def _read_manifest(path: str):
+        try:
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _prune(self, keep: set) -> int:
+        removed = 0
+        api_dir = os.path.join(self.out_dir, 'api')
+        for root, _, names in os.walk(api_dir):
+            for name in names:
+                relative = os.path.relpath(os.path.join(root, name), self.out_dir).replace(os.sep, '/')
+                if relative not in keep:
+                    os.remove(os.path.join(root, name))
+                    removed += 1
+        return removed
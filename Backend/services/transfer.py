@@ -0,0 +1,186 @@
+"""
+Streaming import/export of members and events as JSONL or CSV.
+
+Files are read and written one record at a time: imports are parsed in
+chunks, every image URL in a chunk is validated together and the chunk is
+written with one bulk upsert; exports are generated from a Mongo cursor.
+Columns are the models' RECORD_FIELDS plus _id; in CSV, list/object fields
+(gallery, winners, ...) are JSON-encoded cells. Empty or missing columns leave
+the stored value of an existing document untouched.
+"""
+
+import csv
+import io
+import json
+from datetime import datetime
+from itertools import islice
+from bson import ObjectId, json_util
+from models import member, event
+
+FORMATS = ('jsonl', 'csv')
+
+# kind -> stored field -> create() argument
+RECORD_FIELDS = {
+    "members": member.RECORD_FIELDS,
+    "events": event.RECORD_FIELDS,
+}
+
+# Import errors reported back per run; the rest are only counted
+MAX_REPORTED_ERRORS = 100
+
+def format_for(filename: str, default: str = 'jsonl') -> str:
+    """jsonl/csv from a file name's extension"""
+    extension = filename.rsplit('.', 1)[-1].lower() if filename and '.' in filename else ''
+    if extension in ('jsonl', 'ndjson', 'json'):
+        return 'jsonl'
+    if extension == 'csv':
+        return 'csv'
+    return default
+
+def read_rows(stream, fmt: str):
+    """Yield (line_number, raw line or CSV row) from a text stream, one at a time"""
+    if fmt == 'csv':
+        # Data rows start on line 2, after the header
+        yield from enumerate(csv.DictReader(stream), 2)
+    else:
+        for line_number, line in enumerate(stream, 1):
+            if line.strip():
+                yield line_number, line
+
+def parse_row(row, fmt: str) -> dict:
+    """Raw JSONL line (Extended JSON) or CSV row to a record; raises ValueError if malformed"""
+    if fmt == 'csv':
+        return {field: _parse_cell(value) for field, value in row.items() if field}
+    record = json_util.loads(row)
+    if not isinstance(record, dict):
+        raise ValueError("Each line must be a JSON object")
+    return record
+
+def _parse_cell(value: str):
+    """CSV cell to Python: '' -> None, JSON lists/objects decoded, everything else as text"""
+    if value is None or value == '':
+        return None
+    if value[0] in '[{':
+        return json.loads(value)
+    return value
+
+def to_arguments(kind: str, record: dict) -> dict:
+    """Record (stored field names) to create() arguments, keeping _id for upsert matching"""
+    arguments = {arg: record.get(field) for field, arg in RECORD_FIELDS[kind].items()
+                 if record.get(field) is not None}
+    if record.get("_id"):
+        arguments["_id"] = str(record["_id"])
+    if kind == "events":
+        if isinstance(arguments.get("date"), str):
+            arguments["date"] = datetime.fromisoformat(arguments["date"])
+        if not isinstance(arguments.get("date"), datetime):
+            raise ValueError("date is required")
+        # A row matched on _id keeps its stored type; new rows default to general
+        if "_id" not in arguments:
+            arguments.setdefault("event_type", "general")
+    if kind == "members":
+        for required in ("name", "role", "member_type"):
+            if not arguments.get(required):
+                raise ValueError(f"{required} is required")
+    if "_id" in arguments and not ObjectId.is_valid(arguments["_id"]):
+        raise ValueError(f"Invalid _id {arguments['_id']}")
+    return arguments
+
+def image_urls(kind: str, arguments: dict):
+    """Yield (url, validator category) for every image URL in one record, as the admin forms check them
+
+    The main image is required for new records; a row matched on _id may leave it out to keep the stored one.
+    """
+    main = "image_url" if kind == "members" else "cover_image"
+    category = 'members' if kind == "members" else 'codex' if arguments.get("event_type") == 'codex' else 'events'
+    if "_id" not in arguments or arguments.get(main):
+        yield arguments.get(main), category
+    if kind == "members":
+        return
+    for url in arguments.get("event_photos") or []:
+        yield url, category
+    for winner in arguments.get("winners") or []:
+        yield winner.get("photo_url"), category
+    for codex_category in arguments.get("codex_categories") or []:
+        for winner in codex_category.get("winners") or []:
+            yield winner.get("photo_url"), 'codex'
+    for image in arguments.get("gallery") or []:
+        yield image.get("image_url"), 'events'
+
+def import_records(model, kind: str, stream, fmt: str, validator, chunk_size: int = 500) -> dict:
+    """Validate and bulk-upsert records from stream in chunks of chunk_size
+
+    Records with a parse error or an invalid image URL are skipped and reported.
+    Returns {"inserted", "updated", "skipped", "errors": [{"line", "error"}]}.
+    """
+    rows = read_rows(stream, fmt)
+    summary = {"inserted": 0, "updated": 0, "skipped": 0, "errors": []}
+
+    def skip(line_number, error):
+        summary["skipped"] += 1
+        if len(summary["errors"]) < MAX_REPORTED_ERRORS:
+            summary["errors"].append({"line": line_number, "error": error})
+
+    # One read-model rebuild and version bump for the whole import, not one per chunk
+    with model.batch():
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                return summary
+            parsed = []
+            for line_number, row in chunk:
+                try:
+                    parsed.append((line_number, to_arguments(kind, parse_row(row, fmt))))
+                except (ValueError, TypeError) as e:
+                    skip(line_number, str(e))
+            # One validate_many pass over every URL in the chunk
+            checks = [(index, url, category) for index, (_, arguments) in enumerate(parsed)
+                      for url, category in image_urls(kind, arguments)]
+            errors = {}
+            results = validator.validate_many((url, category) for _, url, category in checks)
+            for (index, url, _), (is_valid, message) in zip(checks, results):
+                if not is_valid:
+                    errors.setdefault(index, []).append(f"{url}: {message}")
+            valid = []
+            for index, (line_number, arguments) in enumerate(parsed):
+                if index in errors:
+                    skip(line_number, "; ".join(errors[index]))
+                else:
+                    valid.append(arguments)
+            if valid:
+                counts = model.bulk_upsert(valid)
+                summary["inserted"] += counts["inserted"]
+                summary["updated"] += counts["updated"]
+
+def export_records(docs, kind: str, fmt: str):
+    """Yield the export file for docs (any cursor/iterable) as text chunks, one record each"""
+    fields = ["_id"] + list(RECORD_FIELDS[kind])
+    if fmt == 'csv':
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(fields)
+        for doc in docs:
+            writer.writerow([_csv_cell(doc.get(field)) for field in fields])
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.getvalue():
+            yield buffer.getvalue()
+    else:
+        for doc in docs:
+            record = {field: doc.get(field) for field in fields if field in doc}
+            yield json_util.dumps(record, json_options=json_util.RELAXED_JSON_OPTIONS) + "\n"
+
+def _iso(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+def _csv_cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, default=_iso)
+    return str(_iso(value))
+
+def export_cursor(model, batch_size: int = 500):
+    """Every document of model in listing order, streamed from a Mongo cursor"""
+    return model.iter_all(batch_size=batch_size)
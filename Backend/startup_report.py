@@ -0,0 +1,67 @@
+"""
+Cold-start report: startup phase timings plus the slowest imports
+Run: python startup_report.py [--public] [--top 15] [--json startup.json]
+Save the JSON per release to track cold-start milliseconds over time.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+PROBE = "import json, app; from services.startup import profiler; print(json.dumps(profiler.report()))"
+
+def parse_importtime(stderr: str) -> list:
+    """Parse `python -X importtime` output into [{module, self_us, cumulative_us}]"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        rows.append({
+            "module": module.strip(),
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us)
+        })
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--public', action='store_true', help='measure PUBLIC_API_ONLY mode')
+    parser.add_argument('--top', type=int, default=15, help='number of slowest imports to show')
+    parser.add_argument('--json', metavar='PATH', help='write the full report as JSON')
+    args = parser.parse_args()
+
+    env = dict(os.environ, PUBLIC_API_ONLY='true' if args.public else 'false')
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', PROBE],
+        capture_output=True, text=True, env=env, cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    if result.returncode != 0:
+        print(result.stderr)
+        sys.exit(result.returncode)
+
+    phases = json.loads(result.stdout.strip().splitlines()[-1])
+    imports = parse_importtime(result.stderr)
+    # Only top-level packages, so nested imports are not double counted
+    top_level = sorted(
+        (row for row in imports if '.' not in row["module"]),
+        key=lambda row: row["cumulative_us"], reverse=True
+    )[:args.top]
+
+    print(f"Startup phases ({'public API only' if args.public else 'full app'}):")
+    for phase in phases["phases"]:
+        print(f"  {phase['phase']:<28} {phase.get('ms', 0):>9.2f} ms")
+    print(f"  {'total':<28} {phases['total_ms']:>9.2f} ms  ({phases['modules_loaded']} modules)")
+    print("\nSlowest top-level imports:")
+    for row in top_level:
+        print(f"  {row['module']:<28} {row['cumulative_us'] / 1000:>9.2f} ms")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({"public_api_only": args.public, "startup": phases, "imports": top_level}, f, indent=2)
+        print(f"\n[OK] Report written to {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+import asyncio
+import os
+import sys
+import pytest
+
+# Tests import the app modules as the entry points do, from Backend/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+@pytest.fixture
+def asgi_request(monkeypatch):
+    """send(db, url, headers=None, method='GET') -> httpx response of the ASGI tier serving db (mongomock)"""
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    httpx = pytest.importorskip("httpx")
+    from config import Config
+    from routes.api_async import create_async_app
+
+    # mongomock_motor's cursor returns the synchronous cursor from sort()/limit(); chain like Motor
+    def chained(name):
+        def method(self, *args, **kwargs):
+            getattr(self._AsyncCursor__cursor, name)(*args, **kwargs)
+            return self
+        return method
+    for name in ('sort', 'limit', 'skip'):
+        monkeypatch.setattr(mongomock_motor.AsyncCursor, name, chained(name), raising=False)
+
+    apps = {}
+
+    def send(db, url, headers=None, method='GET'):
+        if id(db) not in apps:
+            client = mongomock_motor.AsyncMongoMockClient(mock_mongo_client=db.client)
+            config = {key: getattr(Config, key) for key in dir(Config) if key.isupper()}
+            apps[id(db)] = create_async_app(config, db=client[db.name], sync_db=db)
+        app = apps[id(db)]
+
+        async def request():
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://test') as client_:
+                return await client_.request(method, url, headers=headers or {})
+        return asyncio.run(request())
+    return send
@@ -0,0 +1,101 @@
+from datetime import datetime
+import pytest
+from services import migrations
+
+mongomock = pytest.importorskip("mongomock")
+
+IMAGE = "https://acsespicscloud.vercel.app/members/x.jpg"
+
+@pytest.fixture
+def app():
+    """Public app on a migrated in-memory database"""
+    from app import create_app
+    app = create_app(public_api_only=True)
+    db = mongomock.MongoClient().acses_test
+    app.db = app.member_model.db = app.event_model.db = db
+    migrations.migrate(db, log=lambda message: None)
+    return app
+
+def test_write_invalidates_cached_list(app):
+    member_model = app.member_model
+    member_model.create("Ada", IMAGE, "Tech", "core", "Tech")
+    client = app.test_client()
+    # view= skips the read model, so the list comes from the query cache
+    assert [m["name"] for m in client.get('/api/members?view=summary').get_json()] == ["Ada"]
+    assert member_model.cache.stats()["entries"] == 1
+
+    member_model.create("Grace", IMAGE, "Tech", "core", "Tech")
+    assert member_model.cache.stats()["entries"] == 0
+    assert [m["name"] for m in client.get('/api/members?view=summary').get_json()] == ["Grace", "Ada"]
+
+def test_matching_if_none_match_is_not_modified(app):
+    app.member_model.create("Ada", IMAGE, "Tech", "core", "Tech")
+    client = app.test_client()
+    response = client.get('/api/members')
+    etag, modified = response.headers['ETag'], response.headers['Last-Modified']
+    not_modified = client.get('/api/members', headers={'If-None-Match': etag})
+    assert not_modified.status_code == 304 and not_modified.data == b''
+    assert not_modified.headers['ETag'] == etag
+    assert client.get('/api/members', headers={'If-Modified-Since': modified}).status_code == 304
+
+    # A write changes the content version, and so the ETag
+    app.member_model.create("Grace", IMAGE, "Tech", "core", "Tech")
+    response = client.get('/api/members', headers={'If-None-Match': etag})
+    assert response.status_code == 200 and response.headers['ETag'] != etag
+
+@pytest.mark.parametrize("encoding, suffix", [("gzip", "-gz"), ("br", "-br")])
+def test_compressed_variants_have_their_own_etag(app, encoding, suffix):
+    decompress = pytest.importorskip("gzip" if encoding == "gzip" else "brotli").decompress
+    for i in range(10):
+        app.member_model.create(f"Member {i}", IMAGE, "Tech", "core", "Tech")
+    client = app.test_client()
+    identity = client.get('/api/members')
+    response = client.get('/api/members', headers={'Accept-Encoding': encoding})
+    assert response.headers['Content-Encoding'] == encoding
+    assert decompress(response.data) == identity.data
+    etag = response.headers['ETag']
+    assert response.get_etag()[0] == identity.get_etag()[0] + suffix
+
+    not_modified = client.get('/api/members', headers={'Accept-Encoding': encoding, 'If-None-Match': etag})
+    assert not_modified.status_code == 304 and not_modified.headers['ETag'] == etag
+    # The compressed variant's validator does not match the identity body
+    assert client.get('/api/members', headers={'If-None-Match': etag}).status_code == 200
+
+def test_keyset_pages_split_members_with_equal_created_at(app):
+    created = datetime(2025, 1, 1)
+    app.db.members.insert_many([{"name": f"Member {i}", "imageUrl": IMAGE, "role": "Tech", "memberType": "core",
+                                 "department": "Tech", "createdAt": created} for i in range(5)])
+    client = app.test_client()
+    names, cursor = [], None
+    while True:
+        page = client.get('/api/members?limit=2' + (f'&after={cursor}' if cursor else '')).get_json()
+        assert len(page["items"]) <= 2
+        names += [m["name"] for m in page["items"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    # view= lists straight from the collection (the inserts above bypassed the read model)
+    assert names == [m["name"] for m in client.get('/api/members?view=summary').get_json()]
+    assert sorted(names) == [f"Member {i}" for i in range(5)]
+
+@pytest.mark.parametrize("url", ['/api/members?limit=2&after=garbage', '/api/events?after=bm90IGpzb24',
+                                 '/api/codex/all?limit=1&after=WzFd'])
+def test_malformed_cursor_is_a_bad_request(app, url):
+    response = app.test_client().get(url)
+    assert response.status_code == 400
+    assert response.get_json()["error"].startswith("Invalid cursor")
+
+def test_view_and_fields_project_list_items(app):
+    app.member_model.create("Ada", IMAGE, "Tech", "core", "Tech", linkedin="https://linkedin.com/in/ada")
+    app.event_model.create("Hack", "A long description", datetime(2024, 12, 5), "general",
+                           "https://acsespicscloud.vercel.app/events/x.jpg")
+    client = app.test_client()
+    summary = client.get('/api/members?view=summary').get_json()[0]
+    assert {"name", "imageUrl", "role", "memberType", "department"} <= set(summary) and "linkedin" not in summary
+    member = client.get('/api/members?fields=name,role').get_json()[0]
+    assert member["name"] == "Ada" and member["role"] == "Tech" and "imageUrl" not in member
+    event = client.get('/api/events?view=summary&limit=5').get_json()["items"][0]
+    assert event["title"] == "Hack" and "description" not in event
+
+    assert client.get('/api/members?view=bogus').status_code == 400
+    assert client.get('/api/events?fields=title,password').get_json() == {"error": "Unknown fields: password"}
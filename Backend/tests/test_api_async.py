@@ -0,0 +1,46 @@
+import gzip
+import pytest
+from services import migrations
+
+mongomock = pytest.importorskip("mongomock")
+
+URLS = ['/api/members', '/api/members?memberType=super-core', '/api/members?memberType=core&department=Tech&limit=2',
+        '/api/members?view=summary', '/api/members/by-department', '/api/members/directory', '/api/events',
+        '/api/events?limit=2', '/api/events?fields=title,date', '/api/codex/all', '/api/codex/latest',
+        '/api/codex/nope', '/api/events/bad', '/api/bootstrap', '/api/members?fields=bogus',
+        '/api/events?limit=1&after=garbage', '/api/members?stream=1']
+
+@pytest.fixture
+def app():
+    """Public app on a migrated in-memory database holding the small benchmark dataset"""
+    from app import create_app
+    from benchmarks.datasets import seed
+    app = create_app(public_api_only=True)
+    db = mongomock.MongoClient().acses_test
+    app.db = app.member_model.db = app.event_model.db = db
+    migrations.migrate(db, log=lambda message: None)
+    seed(db, 'small')
+    return app
+
+@pytest.mark.parametrize("headers", [{'Accept-Encoding': 'identity'}, {'Accept-Encoding': 'gzip'}])
+def test_asgi_responses_match_wsgi_byte_for_byte(app, asgi_request, headers):
+    client = app.test_client()
+    month = client.get('/api/codex/latest').get_json()['month']
+    event_id = client.get('/api/events?limit=1').get_json()['items'][0]['_id']
+    cursor = client.get('/api/events?limit=1').get_json()['next_cursor']
+    for url in URLS + [f'/api/codex/{month}', f'/api/events/{event_id}', f'/api/events?limit=1&after={cursor}']:
+        expected, response = client.get(url, headers=headers), asgi_request(app.db, url, headers)
+        assert (response.status_code, response.headers.get('ETag')) == \
+            (expected.status_code, expected.headers.get('ETag')), url
+        # httpx decodes Content-Encoding; Flask's test client does not
+        body = expected.data
+        if expected.headers.get('Content-Encoding') == 'gzip':
+            body = gzip.decompress(body)
+        assert response.content == body, url
+
+def test_preflight_is_answered_for_api_routes_only(app, asgi_request):
+    headers = {'Origin': 'http://localhost:5173', 'Access-Control-Request-Method': 'GET'}
+    preflight = asgi_request(app.db, '/api/members', headers, method='OPTIONS')
+    assert preflight.status_code == 200
+    assert preflight.headers['Access-Control-Allow-Origin'] == 'http://localhost:5173'
+    assert asgi_request(app.db, '/api/nothing', headers, method='OPTIONS').status_code == 404
@@ -0,0 +1,24 @@
+import threading
+import time
+from app import DeferredDispatcher
+
+def test_deferred_app_is_built_once_for_concurrent_first_requests():
+    builds = []
+
+    def deferred_app(environ, start_response):
+        start_response('200 OK', [])
+        return [b'admin']
+
+    def factory():
+        builds.append(1)
+        time.sleep(0.05)
+        return deferred_app
+
+    dispatcher = DeferredDispatcher(None, factory, ('/admin',))
+    threads = [threading.Thread(target=dispatcher, args=({'PATH_INFO': '/admin/login'}, lambda *args: None))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(builds) == 1
@@ -0,0 +1,24 @@
+import pytest
+from models.bulk import replace_collection
+
+mongomock = pytest.importorskip("mongomock")
+
+def test_replace_collection_swaps_in_the_new_documents():
+    db = mongomock.MongoClient().acses_test
+    db.members.insert_one({"name": "Old"})
+    assert replace_collection(db, "members", ({"name": n} for n in "AB"), 1, [[("name", 1)]]) == 2
+    assert sorted(m["name"] for m in db.members.find()) == ["A", "B"]
+    assert db.list_collection_names() == ["members"]
+
+def test_failed_load_leaves_the_live_collection_and_no_staging_behind():
+    db = mongomock.MongoClient().acses_test
+    db.members.insert_one({"name": "Old"})
+
+    def docs():
+        yield {"name": "A"}
+        raise RuntimeError("source went away")
+
+    with pytest.raises(RuntimeError):
+        replace_collection(db, "members", docs(), 1, [])
+    assert [m["name"] for m in db.members.find()] == ["Old"]
+    assert db.list_collection_names() == ["members"]
@@ -0,0 +1,53 @@
+import asyncio
+import threading
+from services.cache import QueryCache
+
+def test_load_running_across_an_invalidation_is_not_cached():
+    cache = QueryCache()
+    rows = ["old"]
+    started, written = threading.Event(), threading.Event()
+
+    def load():
+        value = list(rows)
+        started.set()
+        written.wait(5)
+        return value
+
+    reader = threading.Thread(target=lambda: cache.get_or_set("members", load))
+    reader.start()
+    started.wait(5)
+    # A write lands while the read above is in flight
+    rows[:] = ["new"]
+    cache.invalidate()
+    written.set()
+    reader.join(5)
+    assert cache.get("members") is None
+    assert cache.get_or_set("members", lambda: list(rows)) == ["new"]
+
+def test_async_load_running_across_an_invalidation_is_not_cached_or_shared():
+    cache = QueryCache()
+    rows = ["old"]
+
+    async def main():
+        started, written = asyncio.Event(), asyncio.Event()
+
+        async def stale_load():
+            value = list(rows)
+            started.set()
+            await written.wait()
+            return value
+
+        async def load():
+            return list(rows)
+
+        in_flight = asyncio.ensure_future(cache.aget_or_set("members", stale_load))
+        await started.wait()
+        rows[:] = ["new"]
+        cache.invalidate()
+        # A read after the write does not wait for the load that started before it
+        assert await asyncio.wait_for(cache.aget_or_set("members", load), 5) == ["new"]
+        written.set()
+        assert await in_flight == ["old"]
+        assert cache.get("members") == ["new"]
+
+    asyncio.run(main())
@@ -0,0 +1,25 @@
+from datetime import datetime
+import pytest
+
+mongomock = pytest.importorskip("mongomock")
+
+@pytest.fixture
+def event_model():
+    from models.event import Event
+    return Event(mongomock.MongoClient().acses_test)
+
+def test_upsert_by_id_keeps_the_stored_event_type_and_codex_categories(event_model):
+    event_id = event_model.create("CodeX March", "d", datetime(2025, 3, 7), "codex",
+                                  "https://acsespicscloud.vercel.app/events/x.jpg", codex_categories=["Web"])
+    counts = event_model.bulk_upsert([{"_id": event_id, "description": "Results are out",
+                                       "codex_categories": ["Web", "AI"]}])
+    assert counts == {"inserted": 0, "updated": 1}
+    event = event_model.collection.find_one()
+    assert event["event_type"] == "codex" and event["codex_categories"] == ["Web", "AI"]
+    assert event["description"] == "Results are out" and event["title"] == "CodeX March"
+
+def test_upsert_inserts_with_the_default_event_type(event_model):
+    event_model.bulk_upsert([{"title": "Hack", "description": "d", "date": datetime(2024, 12, 5),
+                              "cover_image": "https://acsespicscloud.vercel.app/events/x.jpg"}])
+    event = event_model.collection.find_one()
+    assert event["event_type"] == "general" and "codex_categories" not in event
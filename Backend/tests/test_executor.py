@@ -0,0 +1,50 @@
+import threading
+import pytest
+from services.executor import query_executor
+
+mongomock = pytest.importorskip("mongomock")
+
+@pytest.fixture
+def admin_client():
+    """Full app (admin blueprints included) on an in-memory database, logged in"""
+    from app import create_app
+    app = create_app(public_api_only=False)
+    db = mongomock.MongoClient().acses_test
+    app.db = app.member_model.db = app.event_model.db = db
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['admin_logged_in'] = True
+    return client
+
+@pytest.fixture
+def small_pool():
+    """Two workers: fewer than one dashboard's nested fan-out would need if gathers blocked on the pool"""
+    workers = query_executor.max_workers
+    query_executor.shutdown()
+    query_executor.max_workers = 2
+    yield
+    query_executor.shutdown()
+    query_executor.max_workers = workers
+
+def run_concurrently(*calls, timeout: float = 10) -> list:
+    """Run each call on its own thread; fails if any is still blocked after timeout"""
+    results = [None] * len(calls)
+
+    def run(index, call):
+        results[index] = call()
+
+    threads = [threading.Thread(target=run, args=item, daemon=True) for item in enumerate(calls)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout)
+    assert not any(thread.is_alive() for thread in threads), "calls hung on the query executor"
+    return results
+
+def test_gather_inside_pool_runs_inline(small_pool):
+    inner = lambda: query_executor.gather(*(lambda i=i: i for i in range(4)))
+    assert run_concurrently(lambda: query_executor.gather(inner, inner, inner)) == [[[0, 1, 2, 3]] * 3]
+
+def test_concurrent_dashboard_requests_do_not_deadlock(admin_client, small_pool):
+    load = lambda: admin_client.get('/admin/').status_code
+    assert run_concurrently(load, load) == [200, 200]
@@ -0,0 +1,49 @@
+from datetime import datetime
+import pytest
+
+mongomock = pytest.importorskip("mongomock")
+
+@pytest.fixture
+def app():
+    """Public app on an in-memory database that `python migrate.py` has not run on"""
+    from app import create_app
+    app = create_app(public_api_only=True)
+    app.db = app.member_model.db = app.event_model.db = mongomock.MongoClient().acses_test
+    return app
+
+def insert_super_core(db):
+    # Stored before rolePriority existed: the Chairperson is the oldest
+    for day, role in enumerate(["Chairperson", "Tech Head", "Secretary"], start=1):
+        db.members.insert_one({"name": role, "role": role, "memberType": "super-core", "department": None,
+                               "imageUrl": "https://acsespicscloud.vercel.app/members/x.jpg",
+                               "createdAt": datetime(2025, 1, day)})
+
+def test_members_without_role_priority_are_in_role_order(app):
+    insert_super_core(app.db)
+    client = app.test_client()
+    roles = ["Chairperson", "Secretary", "Tech Head"]
+    assert [m["role"] for m in client.get('/api/members?memberType=super-core').get_json()] == roles
+    assert [m["role"] for m in client.get('/api/members/directory').get_json()["members"]["super-core"]] == roles
+
+def test_read_model_of_members_without_role_priority_is_in_role_order(app):
+    from services import migrations
+    insert_super_core(app.db)
+    migrations.rebuild_read_models(app.db, names=("members",))
+    assert app.member_model.get_read_model() is not None
+    members = app.test_client().get('/api/members?memberType=super-core').get_json()
+    assert [m["role"] for m in members] == ["Chairperson", "Secretary", "Tech Head"]
+
+def test_async_members_without_role_priority_are_in_role_order(app, asgi_request):
+    insert_super_core(app.db)
+    members = asgi_request(app.db, '/api/members?memberType=super-core').json()
+    assert [m["role"] for m in members] == ["Chairperson", "Secretary", "Tech Head"]
+
+def test_role_priority_is_not_part_of_the_json(app):
+    from services import migrations
+    app.member_model.create("Ada", "https://acsespicscloud.vercel.app/members/a.jpg", "Chairperson", "super-core")
+    client = app.test_client()
+    live = client.get('/api/members?view=summary').get_json()
+    migrations.migrate(app.db, log=lambda message: None)
+    # Served from the read model
+    listed = client.get('/api/members?memberType=super-core').get_json()
+    assert live and listed and not any("rolePriority" in m for m in live + listed)
@@ -0,0 +1,67 @@
+import io
+from datetime import datetime
+import pytest
+from services import migrations
+from services.cache import new_version
+from services.content_sync import content_watcher
+
+mongomock = pytest.importorskip("mongomock")
+
+@pytest.fixture
+def app():
+    """Public app on an in-memory database whose (empty) read models are already built"""
+    from app import create_app
+    app = create_app(public_api_only=True)
+    db = mongomock.MongoClient().acses_test
+    app.db = app.member_model.db = app.event_model.db = db
+    migrations.migrate(db, log=lambda message: None)
+    return app
+
+def test_seeded_dataset_is_served(app):
+    from benchmarks.datasets import seed
+    seed(app.db, 'small')
+    client = app.test_client()
+    assert len(client.get('/api/members').get_json()) == 100
+    latest = client.get('/api/codex/latest')
+    assert latest.status_code == 200
+    assert client.get(f"/api/codex/{latest.get_json()['month']}").status_code == 200
+
+def test_read_model_behind_the_content_version_is_not_served(app):
+    # A write outside the models, recorded the way the content watcher records its change event
+    app.db.events.insert_one({"title": "CodeX March", "date": datetime(2025, 3, 7), "month": "2025-03",
+                              "event_type": "codex", "created_at": datetime(2025, 3, 7)})
+    content_watcher.publish(app.db, 'events', new_version())
+    client = app.test_client()
+    assert client.get('/api/codex/latest').get_json()['title'] == "CodeX March"
+    assert [e['title'] for e in client.get('/api/codex/all').get_json()] == ["CodeX March"]
+
+def test_writes_move_documents_between_buckets(app):
+    member_model, event_model = app.member_model, app.event_model
+    member_id = member_model.create("Zed", "https://acsespicscloud.vercel.app/members/z.jpg", "Tech", "core", "Tech")
+    member_model.update(member_id, department="Marketing")
+    event_id = event_model.create("Hack", "d", datetime(2024, 12, 5), "general",
+                                  "https://acsespicscloud.vercel.app/events/x.jpg")
+    event_model.update(event_id, date=datetime(2024, 1, 9), event_type="codex")
+    assert sorted(doc["_id"] for doc in app.db.read_models.find({"key": {"$exists": True}})) == \
+        ["codex_index:2024-01", "directory:core:Marketing"]
+    client = app.test_client()
+    assert client.get('/api/members/by-department').get_json()[0]["department"] == "Marketing"
+    assert client.get('/api/events').get_json() == []
+    assert client.get('/api/codex/2024-01').get_json()["title"] == "Hack"
+    assert member_model.get_read_model() and event_model.get_read_model('codex_index')
+
+def test_import_rebuilds_read_models_once(app, monkeypatch):
+    from services.transfer import import_records
+
+    class AcceptAll:
+        def validate_many(self, items):
+            return [(True, "") for _ in items]
+
+    rebuilds = []
+    rebuild = app.member_model.rebuild_read_models
+    monkeypatch.setattr(app.member_model, 'rebuild_read_models', lambda *args: rebuilds.append(args) or rebuild(*args))
+    rows = "".join(f'{{"name": "M{i}", "imageUrl": "https://acsespicscloud.vercel.app/members/{i}.jpg", '
+                   f'"role": "Tech", "memberType": "core", "department": "Tech"}}\n' for i in range(25))
+    summary = import_records(app.member_model, 'members', io.StringIO(rows), 'jsonl', AcceptAll(), chunk_size=10)
+    assert summary["inserted"] == 25 and rebuilds == [(None,)]
+    assert len(app.test_client().get('/api/members').get_json()) == 25
@@ -3,9 +3,9 @@ WSGI entry point for production deployment
 Use with gunicorn: gunicorn -w 4 wsgi:app
 """
 
-from app import create_app
-
-app = create_app()
+# Reuse the app built at import time in app.py; calling create_app() again
+# would construct a second set of models and index checks per worker
+from app import app
 
 if __name__ == "__main__":
     app.run()
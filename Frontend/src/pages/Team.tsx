@@ -11,16 +11,12 @@ export default function Team() {
   const [loading, setLoading] = useState(true);
 
   useEffect(() => {
-    Promise.all([
-      api.getMembers('founder'),
-      api.getMembers('faculty'),
-      api.getMembers('super-core'),
-      api.getMembersByDepartment()
-    ])
-      .then(([founder, faculty, superCore, depts]) => {
-        setFounderMember(founder[0] || null);
-        setFacultyMembers(faculty);
-        setSuperCoreMembers(superCore);
+    // One request for every member list on the page
+    api.getBootstrap()
+      .then(({ members, departments: depts }) => {
+        setFounderMember(members['founder'][0] || null);
+        setFacultyMembers(members['faculty']);
+        setSuperCoreMembers(members['super-core']);
         const deptOrder = ['Tech', 'Creatives', 'Events', 'Operations', 'Public Relations', 'Marketing'];
         const sortedDepts = depts.sort((a, b) => deptOrder.indexOf(a.department) - deptOrder.indexOf(b.department));
         setCoreDepts(sortedDepts);
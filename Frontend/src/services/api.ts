@@ -53,8 +53,22 @@ export type CodeXEvent = Event & {
   codex_categories: CodeXCategory[];
 };
 
+export type Bootstrap = {
+  members: Record<string, Member[]>;  // founder, faculty, super-core in display order
+  departments: Array<{department: string, members: Member[]}>;
+  events: Event[];  // most recent general events
+  latest_codex: CodeXEvent | null;
+};
+
 // API Functions
 export const api = {
+  // Everything the landing pages need in one request
+  async getBootstrap(): Promise<Bootstrap> {
+    const response = await fetch(`${API_BASE_URL}/bootstrap`);
+    if (!response.ok) throw new Error('Failed to fetch bootstrap data');
+    return response.json();
+  },
+
   // Members
   async getMembers(memberType?: string, department?: string): Promise<Member[]> {
     let url = `${API_BASE_URL}/members`;